@@ -1,13 +1,32 @@
+from bisect import bisect_right
+from datetime import datetime
+from decimal import Decimal
 from math import ceil
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional
+import csv
+import io
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import asc, desc
 
 from app.db.session import get_db
-from app.models.book import Book
+from app.models.book import Book, Category, book_categories
 from app.models.user import User
-from app.schemas.book import BookCreate, BookUpdate, BookResponse, BookListResponse
+from app.schemas.book import (
+    BookCreate, BookUpdate, BookResponse, BookListResponse, BookImportResponse, BookBatchResponse,
+    AutocompleteSuggestion
+)
+from app.services.search import search_index
+from app.services.pagination import encode_cursor, decode_cursor, keyset_filter
+from app.services.count_cache import book_count_cache, make_count_key
+from app.services.taxonomy import sync_book_taxonomy
+from app.services.book_cache import get_book, get_books, invalidate_book
+from app.services.catalog import get_listing_versions, bump_catalog_version
+from app.core.etag import make_etag, etag_matches, not_modified, set_etag
+from app.services.book_import import BookImporter, read_csv, read_ndjson
+from app.services.facets import get_facets
+from app.services.autocomplete import autocomplete_index
+from app.core.config import settings
 from app.api import deps
 
 router = APIRouter()
@@ -23,39 +42,159 @@ def create_book(
         raise HTTPException(status_code=400, detail="이미 등록된 ISBN입니다.")
     
     new_book = Book(**book.model_dump())
+    sync_book_taxonomy(db, new_book)
     db.add(new_book)
+    bump_catalog_version(db)
     db.commit()
     db.refresh(new_book)
+    search_index.add(new_book)
+    autocomplete_index.add(new_book)
+    book_count_cache.invalidate()
     return new_book
 
+# 1-1. 도서 대량 등록 (관리자만 가능) - CSV / NDJSON 파일 업로드
+@router.post("/import", response_model=BookImportResponse)
+def import_books(
+    file: UploadFile = File(..., description="CSV(헤더 포함) 또는 NDJSON 파일"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="파일 형식 (생략 시 확장자로 판단)"),
+    mode: str = Query("insert", pattern="^(insert|upsert)$", description="insert: 기존 ISBN은 오류, upsert: 기존 ISBN은 수정"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.check_admin)
+):
+    if format is None:
+        filename = (file.filename or "").lower()
+        if filename.endswith(".csv"):
+            format = "csv"
+        elif filename.endswith((".ndjson", ".jsonl")):
+            format = "ndjson"
+        else:
+            raise HTTPException(status_code=400, detail="파일 형식을 알 수 없습니다. format=csv|ndjson을 지정하세요.")
+
+    # 업로드 파일을 한 줄씩 읽음 (전체를 메모리에 올리지 않음)
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    records = read_csv(lines) if format == "csv" else read_ndjson(lines)
+    try:
+        return BookImporter(db, upsert_existing=(mode == "upsert")).run(records)
+    except (UnicodeDecodeError, csv.Error) as e:
+        # 이미 commit된 chunk는 그대로 남음
+        raise HTTPException(status_code=400, detail=f"파일을 읽을 수 없습니다: {e}")
+
+# 커서에 담긴 정렬 값을 컬럼 타입으로 되돌리는 함수 (JSON에는 문자열/숫자로 저장됨)
+CURSOR_VALUE_PARSERS = {
+    "price": Decimal,
+    "title": str,
+    "created_at": datetime.fromisoformat,
+    "id": int,
+    "rating_avg": Decimal,
+    "rating_count": int,
+}
+
+def _read_cursor(cursor: str, sort_field: str, sort_dir: str):
+    """커서를 풀어서 (마지막 정렬 값, 마지막 id) 반환. 정렬 조건이 다르면 400"""
+    try:
+        payload = decode_cursor(cursor)
+        if payload.get("s") != sort_field or payload.get("d") != sort_dir:
+            raise ValueError("정렬 조건이 커서와 다릅니다.")
+        parse = float if sort_field == "relevance" else CURSOR_VALUE_PARSERS[sort_field]
+        return parse(payload["v"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError, ArithmeticError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+def _sorted_hit_rows(db: Session, hit_ids: List[int], sort_field: str, sort_column, descending: bool,
+                     keyset, offset: int, limit: int) -> List[Book]:
+    """
+    검색 결과 id를 SEARCH_ID_BATCH_SIZE개씩 나눠 묶음마다 정렬 상위 offset+limit개만 읽고 병합.
+    검색 결과가 아무리 많아도 한 문장의 IN 목록 길이와 읽는 행 수가 제한됨 (보통은 묶음 하나)
+    """
+    order = (desc(sort_column), desc(Book.id)) if descending else (asc(sort_column), asc(Book.id))
+    batch = settings.SEARCH_ID_BATCH_SIZE
+    rows: List[Book] = []
+    for start in range(0, len(hit_ids), batch):
+        query = db.query(Book).filter(Book.id.in_(hit_ids[start:start + batch]))
+        if keyset is not None:
+            query = query.filter(keyset)
+        rows.extend(query.order_by(*order).limit(offset + limit).all())
+    rows.sort(key=lambda book: (getattr(book, sort_field), book.id), reverse=descending)
+    return rows[offset:offset + limit]
+
+def _book_page(books: List[Book], page: int, size: int, total_elements: Optional[int], sort: str,
+               sort_field: str, descending: bool, facet_data) -> dict:
+    """size+1개까지 읽은 행으로 목록 응답 생성 (넘치는 한 건이 있으면 다음 페이지 커서)"""
+    next_cursor = None
+    if len(books) > size:
+        books = books[:size]
+        last = books[-1]
+        next_cursor = encode_cursor({
+            "s": sort_field,
+            "d": "desc" if descending else "asc",
+            "v": getattr(last, sort_field),
+            "id": last.id
+        })
+    
+    # 4. 응답 생성 (규격 맞춤)
+    return {
+        "content": books,
+        "page": page,
+        "size": size,
+        "totalElements": total_elements,
+        "totalPages": ceil(total_elements / size) if total_elements is not None else None,
+        "sort": sort, # 요청받은 정렬 문자열 그대로 반환
+        "nextCursor": next_cursor,
+        "facets": facet_data
+    }
+
 # 2. 도서 목록 조회 (누구나 가능)
 @router.get("/", response_model=BookListResponse)
 def read_books(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     page: int = Query(1, ge=1, description="페이지 번호"),
     size: int = Query(10, ge=1, le=100, description="페이지 크기"),
     # [수정] 정렬 규격: field,ASC|DESC
-    sort: str = Query("created_at,desc", description="정렬: field,asc|desc (예: price,asc)"),
+    sort: str = Query("created_at,desc", description="정렬: field,asc|desc (예: price,asc, rating_avg,desc, 검색 시 relevance,desc)"),
     # [수정] 검색 필터 1: 통합 검색
     keyword: Optional[str] = Query(None, description="검색어 (제목, 저자)"),
     # [추가] 검색 필터 2: 카테고리 (최소 2개 조건 만족용)
-    category: Optional[str] = Query(None, description="카테고리 필터")
+    category: Optional[str] = Query(None, description="카테고리 필터"),
+    # [추가] 커서 페이지네이션: 이전 응답의 nextCursor를 넘기면 page 대신 커서 다음부터 조회
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 nextCursor)"),
+    # [추가] 전체 개수 계산 방식: estimate(캐시 사용), exact(매번 COUNT), none(생략)
+    count: str = Query("estimate", pattern="^(estimate|exact|none)$", description="전체 개수: estimate|exact|none"),
+    # [추가] 검색 패싯: 카테고리별 / 가격 구간별 개수 (검색어 조건 기준, 선택한 카테고리와 무관)
+    facets: bool = Query(False, description="카테고리/가격 구간별 개수 포함 여부")
 ):
+    # 0. 조건부 요청: 카탈로그/도서 통계 버전 + 쿼리 파라미터가 같으면 목록도 같으므로 조회 없이 304
+    catalog_version, stats_version = get_listing_versions(db)
+    etag = make_etag("books", catalog_version, stats_version, sorted(request.query_params.multi_items()))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     query = db.query(Book)
     
-    # 1. 필터링 (Where)
+    # 1. 필터링 (Where) - LIKE 전체 스캔 대신 역색인에서 후보 id를 가져옴
+    # 검색어가 있으면 카테고리도 색인에서 걸러서, DB에는 필요한 페이지(또는 제한된 묶음)의 id만 넘김
+    keyword = keyword if search_index.has_terms(keyword) else None
+    category = category.strip() if category and category.strip() else None
+    hits = None
     if keyword:
-        search = f"%{keyword}%"
-        query = query.filter(
-            or_(
-                Book.title.like(search),
-                Book.authors.like(search)
-            )
+        search_index.ensure_loaded(db)
+        hits = search_index.search(keyword, category)
+    elif category:
+        # 카테고리는 연결 테이블의 (category_id, book_id) 인덱스를 타는 조인으로 필터 (정확히 일치)
+        query = query.join(book_categories, book_categories.c.book_id == Book.id)\
+            .join(Category, Category.id == book_categories.c.category_id)\
+            .filter(Category.name == category)
+
+    facet_data = None
+    if facets:
+        # 패싯은 선택한 카테고리와 무관하게 검색어 조건 기준
+        facet_data = get_facets(
+            db, catalog_version, make_count_key(keyword, None)[0],
+            [book_id for book_id, _ in search_index.search(keyword)] if keyword else None
         )
     
-    if category:
-        query = query.filter(Book.categories.like(f"%{category}%"))
-    
     # 2. 정렬 (Sorting) - "price,desc" 파싱
     try:
         sort_field, sort_dir = sort.split(",")
@@ -66,44 +205,138 @@ def read_books(
         sort_field = "created_at"
         sort_dir = "desc"
 
+    # 관련도 정렬: 색인 점수 순서대로 id를 잘라서 해당 페이지만 조회
+    if sort_field == "relevance" and keyword:
+        total_elements = len(hits) if count != "none" else None
+        if cursor:
+            # hits는 (-score, -id) 오름차순이므로 커서 위치를 이진 탐색
+            last_score, last_id = _read_cursor(cursor, sort_field, sort_dir)
+            keys = [(-score, -book_id) for book_id, score in hits]
+            offset = bisect_right(keys, (-last_score, -last_id))
+        else:
+            offset = (page - 1) * size
+        page_hits = hits[offset:offset + size]
+        page_ids = [book_id for book_id, _ in page_hits]
+        books_by_id = {b.id: b for b in db.query(Book).filter(Book.id.in_(page_ids)).all()}
+        next_cursor = None
+        if page_hits and offset + size < len(hits):
+            last_id, last_score = page_hits[-1]
+            next_cursor = encode_cursor({"s": sort_field, "d": sort_dir, "v": last_score, "id": last_id})
+        return {
+            "content": [books_by_id[i] for i in page_ids if i in books_by_id],
+            "page": page,
+            "size": size,
+            "totalElements": total_elements,
+            "totalPages": ceil(total_elements / size) if total_elements is not None else None,
+            "sort": sort,
+            "nextCursor": next_cursor,
+            "facets": facet_data
+        }
+
     # DB 컬럼 매핑 (보안상 허용된 컬럼만 정렬 가능하게 함)
     allowed_sort_fields = {
         "price": Book.price,
         "title": Book.title,
         "created_at": Book.created_at,
-        "id": Book.id
+        "id": Book.id,
+        # 리뷰 작성/수정/삭제 시 갱신되는 집계 컬럼 ((값, id) 인덱스로 정렬)
+        "rating_avg": Book.rating_avg,
+        "rating_count": Book.rating_count
     }
     
-    target_column = allowed_sort_fields.get(sort_field, Book.created_at)
+    if sort_field not in allowed_sort_fields:
+        sort_field = "created_at"
+    target_column = allowed_sort_fields[sort_field]
+    descending = sort_dir != "asc"
     
-    if sort_dir == "asc":
-        query = query.order_by(asc(target_column))
+    if hits is not None:
+        # 검색어 + 컬럼 정렬: 결과 개수는 색인에서 바로 알 수 있고, 행은 묶음별 상위 N개만 읽어서 병합
+        total_elements = len(hits) if count != "none" else None
+        keyset = None
+        if cursor:
+            last_value, last_id = _read_cursor(cursor, sort_field, "desc" if descending else "asc")
+            keyset = keyset_filter(
+                target_column, Book.id, last_value, last_id, descending, db.get_bind().dialect.name
+            )
+        books = _sorted_hit_rows(
+            db, [book_id for book_id, _ in hits], sort_field, target_column, descending,
+            keyset, 0 if cursor else (page - 1) * size, size + 1
+        )
+        return _book_page(books, page, size, total_elements, sort, sort_field, descending, facet_data)
+
+    # 같은 값끼리의 순서를 고정하기 위해 id를 보조 정렬키로 사용 (커서가 (값, id)를 가리킬 수 있도록)
+    if descending:
+        query = query.order_by(desc(target_column), desc(Book.id))
     else:
-        query = query.order_by(desc(target_column))
+        query = query.order_by(asc(target_column), asc(Book.id))
         
     # 3. 페이지네이션 (Pagination)
-    total_elements = query.count()
-    total_pages = ceil(total_elements / size)
-    
-    offset = (page - 1) * size
-    books = query.offset(offset).limit(size).all()
+    if count == "none":
+        total_elements = None
+    elif count == "exact":
+        total_elements = book_count_cache.refresh(make_count_key(keyword, category), query.count)
+    else:
+        # 필터별 캐시 (도서 변경 시 무효화, TTL 경과 시 재계산)
+        total_elements = book_count_cache.get_or_compute(make_count_key(keyword, category), query.count)
     
-    # 4. 응답 생성 (규격 맞춤)
+    if cursor:
+        # 커서 모드: OFFSET 없이 (정렬 값, id) 다음 행부터 인덱스 탐색
+        last_value, last_id = _read_cursor(cursor, sort_field, "desc" if descending else "asc")
+        query = query.filter(
+            keyset_filter(target_column, Book.id, last_value, last_id, descending, db.get_bind().dialect.name)
+        )
+    else:
+        query = query.offset((page - 1) * size)
+    # 한 건 더 읽어서 다음 페이지가 있는지 확인
+    books = query.limit(size + 1).all()
+    return _book_page(books, page, size, total_elements, sort, sort_field, descending, facet_data)
+
+# 2-1. 검색어 자동완성 (제목/저자) - DB를 거치지 않고 메모리 색인에서 응답
+@router.get("/autocomplete", response_model=List[AutocompleteSuggestion])
+def autocomplete_books(
+    q: str = Query(..., min_length=1, max_length=100, description="입력 중인 검색어"),
+    limit: int = Query(10, ge=1, le=50, description="최대 제안 개수"),
+    db: Session = Depends(get_db)
+):
+    autocomplete_index.ensure_loaded(db)
+    return [{"text": text, "type": kind} for kind, text in autocomplete_index.suggest(q, limit)]
+
+# 2-2. 여러 권 한 번에 조회 (장바구니/찜/추천 화면용) - /{book_id}보다 먼저 등록해야 함
+@router.get("/batch", response_model=BookBatchResponse)
+def read_books_batch(
+    ids: str = Query(..., description="도서 id 목록 (콤마로 구분, 최대 100개)"),
+    db: Session = Depends(get_db)
+):
+    try:
+        # 중복은 처음 나온 위치만 남기고 요청 순서 유지
+        book_ids = list(dict.fromkeys(int(x) for x in ids.split(",") if x.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids는 콤마로 구분된 숫자여야 합니다.")
+    if not book_ids:
+        raise HTTPException(status_code=400, detail="ids가 비어 있습니다.")
+    if len(book_ids) > 100:
+        raise HTTPException(status_code=400, detail="한 번에 최대 100개까지 조회할 수 있습니다.")
+
+    # 캐시에 있는 도서는 그대로, 나머지는 IN 쿼리 한 번으로 조회
+    books = get_books(db, book_ids)
     return {
-        "content": books,
-        "page": page,
-        "size": size,
-        "totalElements": total_elements,
-        "totalPages": total_pages,
-        "sort": sort # 요청받은 정렬 문자열 그대로 반환
+        "content": [books[i] for i in book_ids if i in books],
+        "missingIds": [i for i in book_ids if i not in books]
     }
 
 # 3. 도서 상세 조회
 @router.get("/{book_id}", response_model=BookResponse)
-def read_book_detail(book_id: int, db: Session = Depends(get_db)):
-    book = db.query(Book).filter(Book.id == book_id).first()
+def read_book_detail(book_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    # 자주 조회되는 도서는 캐시에서 바로 응답 (수정/삭제 시 무효화)
+    book = get_book(db, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="책을 찾을 수 없습니다.")
+
+    # 조건부 요청: 도서 값(id, updated_at 포함)이 그대로면 304
+    etag = make_etag("book", *book.values())
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return book
 
 # 4. 도서 수정 (관리자만 가능)
@@ -121,9 +354,16 @@ def update_book(
     update_data = book_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(book, key, value)
+    if "authors" in update_data or "categories" in update_data:
+        sync_book_taxonomy(db, book)
+    bump_catalog_version(db)
         
     db.commit()
     db.refresh(book)
+    search_index.add(book)
+    autocomplete_index.add(book)
+    book_count_cache.invalidate()
+    invalidate_book(book_id)
     return book
 
 # 5. 도서 삭제 (관리자만 가능)
@@ -138,5 +378,10 @@ def delete_book(
         raise HTTPException(status_code=404, detail="책을 찾을 수 없습니다.")
         
     db.delete(book)
+    bump_catalog_version(db)
     db.commit()
+    search_index.remove(book_id)
+    autocomplete_index.remove(book_id)
+    book_count_cache.invalidate()
+    invalidate_book(book_id)
     return None
\ No newline at end of file
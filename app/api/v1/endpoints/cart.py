@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func
+from typing import Dict, List, Tuple
 
 from app.db.session import get_db
 from app.models.cart import CartItem
 from app.models.book import Book
 from app.models.user import User
-from app.schemas.cart import CartItemCreate, CartItemUpdate, CartItemResponse, CartListResponse
+from app.schemas.cart import CartBulkRequest, CartItemCreate, CartItemUpdate, CartItemResponse, CartListResponse
+from app.db.upsert import upsert
+from app.services.book_cache import get_book, snapshot
 from app.api import deps  # 로그인 체크용
 
 router = APIRouter()
@@ -18,34 +21,43 @@ def add_to_cart(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user) # 로그인 필수
 ):
-    # 책이 진짜 있는지 확인
-    book = db.query(Book).filter(Book.id == cart_in.book_id).first()
+    # 책이 진짜 있는지 확인 (캐시 우선)
+    book = get_book(db, cart_in.book_id)
     if not book:
         raise HTTPException(status_code=404, detail="존재하지 않는 책입니다.")
 
-    # 이미 장바구니에 담긴 책인지 확인
-    existing_item = db.query(CartItem).filter(
+    # 없으면 INSERT, 이미 담긴 책이면 수량만 더함 - (user_id, book_id) 유니크 제약을 이용한 한 문장
+    # (SELECT 후 INSERT/UPDATE 하면 쿼리가 늘고, 동시에 담으면 같은 책이 두 줄로 들어갈 수 있음)
+    upsert(
+        db, CartItem.__table__,
+        [{"user_id": current_user.id, "book_id": cart_in.book_id, "quantity": cart_in.quantity}],
+        conflict_columns=["user_id", "book_id"],
+        update_columns=[],
+        extra_updates={"updated_at": func.now()},
+        increment_columns=["quantity"],
+    )
+    item = db.query(CartItem.id, CartItem.quantity).filter(
         CartItem.user_id == current_user.id,
         CartItem.book_id == cart_in.book_id
-    ).first()
+    ).one()
+    db.commit()
+    # 응답의 책 정보는 캐시된 스냅샷 사용 (item.book 지연 로딩 방지)
+    return {"id": item.id, "quantity": item.quantity, "book": book}
 
-    if existing_item:
-        # 이미 있으면 수량만 추가
-        existing_item.quantity += cart_in.quantity
-        db.commit()
-        db.refresh(existing_item)
-        return existing_item
-    else:
-        # 없으면 새로 생성
-        new_item = CartItem(
-            user_id=current_user.id,
-            book_id=cart_in.book_id,
-            quantity=cart_in.quantity
-        )
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-        return new_item
+def _cart_response(db: Session, user_id: int):
+    """장바구니 + 책 정보를 조인 쿼리 한 번으로 가져오고, 총 금액은 읽은 행에서 계산"""
+    # (품목마다 item.book 지연 로딩 방지. 총 금액은 이미 읽은 가격/수량으로 더하므로 별도 SUM 쿼리나
+    #  MySQL 8 이상이 필요한 윈도 함수가 필요 없음)
+    rows = db.query(CartItem.id, CartItem.quantity, Book)\
+        .join(Book, Book.id == CartItem.book_id)\
+        .filter(CartItem.user_id == user_id)\
+        .order_by(CartItem.id)\
+        .all()
+    
+    # 책 정보는 dict로 복사 (commit 후 만료된 객체를 응답 직렬화 때 책마다 다시 조회하지 않도록)
+    items = [{"id": row.id, "quantity": row.quantity, "book": snapshot(row.Book)} for row in rows]
+    total_price = sum(row.Book.price * row.quantity for row in rows)
+    return {"items": items, "total_price": total_price}
 
 # 2. 내 장바구니 조회 (GET)
 @router.get("/", response_model=CartListResponse)
@@ -53,13 +65,62 @@ def read_my_cart(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    # 내 장바구니 목록 가져오기
-    items = db.query(CartItem).filter(CartItem.user_id == current_user.id).all()
+    return _cart_response(db, current_user.id)
+
+# 2-1. 장바구니 일괄 변경 (POST) - 요청 한 번, commit 한 번
+@router.post("/bulk", response_model=CartListResponse)
+def bulk_update_cart(
+    bulk_in: CartBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    # 1. 책 id를 IN 쿼리 한 번으로 확인 (하나라도 없으면 아무것도 바꾸지 않음)
+    book_ids = {op.book_id for op in bulk_in.operations}
+    found = {row.id for row in db.query(Book.id).filter(Book.id.in_(book_ids))}
+    missing = sorted(book_ids - found)
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail={"message": "존재하지 않는 책이 있습니다.", "details": {"missingIds": missing}}
+        )
     
-    # 총 금액 계산 (책 가격 * 수량)
-    total_price = sum(item.book.price * item.quantity for item in items)
+    # 2. 같은 책에 대한 작업을 순서대로 합쳐서 책마다 최종 작업 하나로 만듦
+    #    ("add", n): 기존 수량 + n / ("set", n): n으로 변경 / ("remove", 0): 삭제
+    final: Dict[int, Tuple[str, int]] = {}
+    for op in bulk_in.operations:
+        prev_kind, prev_qty = final.get(op.book_id, ("add", 0))
+        if op.op == "remove" or (op.op == "set" and op.quantity == 0):
+            final[op.book_id] = ("remove", 0)
+        elif op.op == "set":
+            final[op.book_id] = ("set", op.quantity)
+        elif prev_kind == "remove":
+            # 삭제 후 담기 = 해당 수량으로 설정
+            final[op.book_id] = ("set", op.quantity)
+        else:
+            final[op.book_id] = (prev_kind, prev_qty + op.quantity)
     
-    return {"items": items, "total_price": total_price}
+    def rows_of(kind: str):
+        return [
+            {"user_id": current_user.id, "book_id": book_id, "quantity": qty}
+            for book_id, (k, qty) in sorted(final.items()) if k == kind and qty > 0
+        ]
+    
+    # 3. 종류별로 다중 행 문장 하나씩 (add: 수량 더하기 upsert / set: 덮어쓰기 upsert / remove: DELETE IN)
+    upsert(db, CartItem.__table__, rows_of("add"), ["user_id", "book_id"], [],
+           extra_updates={"updated_at": func.now()}, increment_columns=["quantity"])
+    upsert(db, CartItem.__table__, rows_of("set"), ["user_id", "book_id"], ["quantity"],
+           extra_updates={"updated_at": func.now()})
+    removed = [book_id for book_id, (kind, _) in final.items() if kind == "remove"]
+    if removed:
+        db.query(CartItem).filter(
+            CartItem.user_id == current_user.id,
+            CartItem.book_id.in_(removed)
+        ).delete(synchronize_session=False)
+    
+    # 4. 변경 결과 장바구니를 같은 트랜잭션에서 읽고 한 번에 commit
+    response = _cart_response(db, current_user.id)
+    db.commit()
+    return response
 
 # 3. 수량 변경 (PATCH)
 @router.patch("/{item_id}", response_model=CartItemResponse)
@@ -1,51 +1,87 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import Integer, delete, insert, literal, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.favorite import Favorite
 from app.models.book import Book
 from app.models.user import User
-from app.schemas.book import BookResponse # 책 정보를 보여주기 위해 재사용
+from app.schemas.favorite import FavoriteToggleResponse, FavoriteListResponse
+from app.services.pagination import encode_cursor, decode_cursor, keyset_filter
 from app.api import deps
 
 router = APIRouter()
 
 # 1. 좋아요 누르기/취소 (Toggle 방식)
-@router.post("/books/{book_id}/favorites")
+# 미리 조회하지 않고 DELETE -> (지운 행이 없으면) INSERT 두 문장으로 처리
+# - 찜이 있었으면 DELETE 한 문장으로 끝 (좋아요 취소)
+# - 없었으면 books에서 고른 행을 INSERT ... SELECT (도서가 없으면 0행 -> 404)
+# - 연속 터치로 두 요청이 동시에 INSERT 하면 uq_user_book_favorite 위반이 난 쪽은
+#   이미 찜된 상태이므로 그대로 "좋아요 등록"으로 응답
+@router.post("/books/{book_id}/favorites", response_model=FavoriteToggleResponse)
 def toggle_favorite(
     book_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    book = db.query(Book).filter(Book.id == book_id).first()
-    if not book:
-        raise HTTPException(status_code=404, detail="책을 찾을 수 없습니다.")
-
-    # 이미 찜했는지 확인
-    existing_fav = db.query(Favorite).filter(
-        Favorite.user_id == current_user.id,
-        Favorite.book_id == book_id
-    ).first()
-
-    if existing_fav:
-        # 있으면 삭제 (좋아요 취소)
-        db.delete(existing_fav)
+    # rollback 후 current_user가 만료되어 다시 조회되지 않도록 id를 먼저 꺼내 둠
+    user_id = current_user.id
+    deleted = db.execute(
+        delete(Favorite).where(Favorite.user_id == user_id, Favorite.book_id == book_id)
+    ).rowcount
+    if deleted:
         db.commit()
         return {"message": "좋아요 취소", "liked": False}
-    else:
-        # 없으면 추가 (좋아요)
-        new_fav = Favorite(user_id=current_user.id, book_id=book_id)
-        db.add(new_fav)
+
+    # 0행 DELETE가 잡은 갭 잠금(MySQL)을 먼저 풀어서 동시 INSERT끼리 교착되지 않게 함
+    db.rollback()
+    try:
+        inserted = db.execute(
+            insert(Favorite).from_select(
+                ["user_id", "book_id"],
+                select(literal(user_id, Integer), Book.id).where(Book.id == book_id)
+            )
+        ).rowcount
         db.commit()
+    except IntegrityError:
+        # 동시에 들어온 다른 요청이 먼저 찜함
+        db.rollback()
         return {"message": "좋아요 등록", "liked": True}
 
-# 2. 내가 찜한 목록 보기
-@router.get("/favorites", response_model=List[BookResponse])
+    if not inserted:
+        raise HTTPException(status_code=404, detail="책을 찾을 수 없습니다.")
+    return {"message": "좋아요 등록", "liked": True}
+
+# 2. 내가 찜한 목록 보기 (찜한 순서 최신순 커서 페이지네이션)
+@router.get("/favorites", response_model=FavoriteListResponse)
 def read_my_favorites(
+    size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    # Favorite 테이블을 통해 Book 정보를 조인해서 가져옴
-    favorites = db.query(Favorite).filter(Favorite.user_id == current_user.id).all()
-    # Favorite 객체 안에 relationship으로 연결된 book을 리스트로 반환
-    return [fav.book for fav in favorites]
\ No newline at end of file
+    # 찜과 도서를 조인해서 한 번에 읽음 (찜마다 도서를 따로 조회하지 않음)
+    query = db.query(Favorite.id, Favorite.created_at, Book)\
+        .join(Book, Book.id == Favorite.book_id)\
+        .filter(Favorite.user_id == current_user.id)
+    if cursor:
+        try:
+            payload = decode_cursor(cursor)
+            last_created_at, last_id = datetime.fromisoformat(payload["v"]), int(payload["id"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+        query = query.filter(
+            keyset_filter(Favorite.created_at, Favorite.id, last_created_at, last_id, True, db.get_bind().dialect.name)
+        )
+
+    # size+1개를 읽어 다음 페이지 존재 여부 확인 (COUNT 쿼리 없음)
+    rows = query.order_by(Favorite.created_at.desc(), Favorite.id.desc()).limit(size + 1).all()
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor({"s": "created_at", "d": "desc", "v": last.created_at, "id": last.id})
+
+    return {"content": [row.Book for row in rows], "size": size, "nextCursor": next_cursor}
@@ -1,16 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import insert, update
+from typing import Dict, Optional
 
 from app.db.session import get_db
 from app.models.order import Order, OrderItem, OrderStatus
 from app.models.cart import CartItem
+from app.models.book import Book
 from app.models.user import User
-from app.schemas.order import OrderCreate, OrderResponse
+from app.schemas.order import OrderCreate, OrderListResponse, OrderResponse
+from app.services.book_cache import invalidate_book, snapshot
+from app.services.catalog import bump_book_stats_version
+from app.services.pagination import date_range_filter, decode_cursor, encode_cursor, keyset_filter
+from app.services.stock import StockShortage, release_stock, reserve_stock
+from app.services.jobs import job_queue
+from app.services.order_jobs import enqueue_order_event
 from app.api import deps
 
 router = APIRouter()
 
+# 주문 응답에 필요한 품목/도서를 IN 쿼리로 미리 로딩 (주문 수와 상관없이 쿼리 2개 추가)
+ORDER_LOAD_OPTIONS = selectinload(Order.items).selectinload(OrderItem.book)
+
 # 1. 주문 생성 (장바구니에 있는 걸 주문하기)
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 def create_order(
@@ -18,16 +30,41 @@ def create_order(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    # 1. 내 장바구니 가져오기
-    cart_items = db.query(CartItem).filter(CartItem.user_id == current_user.id).all()
+    # 1. 내 장바구니 + 책 정보를 조인 쿼리 한 번으로 가져오기 (품목마다 item.book 지연 로딩 방지)
+    cart_lines = db.query(CartItem.book_id, CartItem.quantity, Book)\
+        .join(Book, Book.id == CartItem.book_id)\
+        .filter(CartItem.user_id == current_user.id)\
+        .order_by(CartItem.id)\
+        .all()
     
-    if not cart_items:
+    if not cart_lines:
         raise HTTPException(status_code=400, detail="장바구니가 비어있습니다.")
     
-    # 2. 총 금액 계산
-    total_price = sum(item.book.price * item.quantity for item in cart_items)
+    # 가격이 정해지지 않은 도서(관리자가 price를 비운 경우)는 주문 금액을 계산할 수 없으므로 거절
+    unpriced = sorted({line.book_id for line in cart_lines if line.Book.price is None})
+    if unpriced:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "가격이 정해지지 않은 상품이 있습니다.", "details": {"unpricedBookIds": unpriced}}
+        )
+    
+    # 2. 재고 예약 - 조건부 UPDATE 한 문장으로 모든 품목 차감 (부족하면 전체 취소)
+    quantities: Dict[int, int] = {}
+    for line in cart_lines:
+        quantities[line.book_id] = quantities.get(line.book_id, 0) + line.quantity
+    try:
+        reserve_stock(db, quantities)
+    except StockShortage as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "재고가 부족한 상품이 있습니다.", "details": {"shortages": e.shortages}}
+        )
+    
+    # 총 금액 계산 (한 번만)
+    total_price = sum(line.Book.price * line.quantity for line in cart_lines)
     
-    # 3. 주문서(Order) 만들기
+    # 3. 주문서(Order) 만들기 - commit 없이 flush로 id만 받아옴
     new_order = Order(
         user_id=current_user.id,
         total_price=total_price,
@@ -37,34 +74,91 @@ def create_order(
         shipping_address=order_in.shipping_address
     )
     db.add(new_order)
-    db.commit()
-    db.refresh(new_order) # ID 생성됨
-    
-    # 4. 주문 상세(OrderItem) 옮기기
-    for item in cart_items:
-        order_item = OrderItem(
-            order_id=new_order.id,
-            book_id=item.book_id,
-            quantity=item.quantity,
-            price_at_purchase=item.book.price # 구매 당시 가격 저장
-        )
-        db.add(order_item)
+    db.flush()
+    
+    # 4. 주문 상세(OrderItem)는 다중 행 INSERT 한 번으로 저장
+    order_items = [
+        {
+            "order_id": new_order.id,
+            "book_id": line.book_id,
+            "quantity": line.quantity,
+            "price_at_purchase": line.Book.price  # 구매 당시 가격 저장
+        }
+        for line in cart_lines
+    ]
+    db.execute(insert(OrderItem), order_items)
     
-    # 5. 장바구니 비우기
-    db.query(CartItem).filter(CartItem.user_id == current_user.id).delete()
+    # 5. 장바구니 비우기 (같은 트랜잭션)
+    db.query(CartItem).filter(CartItem.user_id == current_user.id).delete(synchronize_session=False)
     
+    # 재고가 바뀌었으므로 도서 목록 ETag도 갱신 (목록 응답에 stock이 포함됨, 패싯 캐시는 유지)
+    bump_book_stats_version(db)
+    
+    # 6. 알림 등 후처리는 작업 큐에 등록만 하고 워커가 처리 (응답 시간과 분리)
+    enqueue_order_event(db, new_order.id, "created")
+    
+    # 응답용 책 정보는 commit 전에 복사 (commit 후에는 객체가 만료되어 책마다 다시 조회됨)
+    # reserve_stock은 세션의 Book 객체를 갱신하지 않으므로(synchronize_session=False) 차감한 수량을 직접 반영
+    books = []
+    for line in cart_lines:
+        book = snapshot(line.Book)
+        book["stock_quantity"] -= quantities[line.book_id]
+        books.append(book)
+    
+    # 재고 차감 / 주문 생성 / 품목 저장 / 장바구니 비우기 / 작업 등록을 한 번에 commit (중간에 실패하면 모두 취소)
     db.commit()
-    db.refresh(new_order)
-    return new_order
+    job_queue.notify()
+    for book_id in quantities:
+        invalidate_book(book_id)
+    
+    # 응답은 이미 읽어 둔 책 정보로 구성 (order.items / item.book 재조회 방지)
+    return {
+        "id": new_order.id,
+        "status": new_order.status,
+        "total_price": new_order.total_price,
+        "recipient_name": new_order.recipient_name,
+        "shipping_address": new_order.shipping_address,
+        "created_at": new_order.created_at,
+        "items": [dict(item, book=book) for item, book in zip(order_items, books)]
+    }
 
-# 2. 내 주문 목록 조회
-@router.get("/", response_model=List[OrderResponse])
+# 2. 내 주문 목록 조회 (최신순 커서 페이지네이션)
+@router.get("/", response_model=OrderListResponse)
 def read_my_orders(
+    size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    order_status: Optional[OrderStatus] = Query(None, alias="status", description="주문 상태 필터"),
+    from_date: Optional[date] = Query(None, alias="from", description="주문일 시작 (포함, YYYY-MM-DD)"),
+    to_date: Optional[date] = Query(None, alias="to", description="주문일 끝 (포함, YYYY-MM-DD)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    orders = db.query(Order).filter(Order.user_id == current_user.id).all()
-    return orders
+    dialect_name = db.get_bind().dialect.name
+    query = db.query(Order).filter(Order.user_id == current_user.id)
+    if order_status:
+        query = query.filter(Order.status == order_status)
+    query = query.filter(*date_range_filter(Order.created_at, from_date, to_date, dialect_name))
+    if cursor:
+        try:
+            payload = decode_cursor(cursor)
+            last_created_at, last_id = datetime.fromisoformat(payload["v"]), int(payload["id"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+        query = query.filter(keyset_filter(Order.created_at, Order.id, last_created_at, last_id, True, dialect_name))
+    
+    # size+1개를 읽어 다음 페이지 존재 여부 확인 (COUNT 쿼리 없음)
+    orders = query.options(ORDER_LOAD_OPTIONS)\
+        .order_by(Order.created_at.desc(), Order.id.desc())\
+        .limit(size + 1)\
+        .all()
+    
+    next_cursor = None
+    if len(orders) > size:
+        orders = orders[:size]
+        last = orders[-1]
+        next_cursor = encode_cursor({"s": "created_at", "d": "desc", "v": last.created_at, "id": last.id})
+    
+    return {"content": orders, "size": size, "nextCursor": next_cursor}
 
 # 3. 주문 상세 조회
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -73,7 +167,7 @@ def read_order_detail(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    order = db.query(Order).filter(
+    order = db.query(Order).options(ORDER_LOAD_OPTIONS).filter(
         Order.id == order_id,
         Order.user_id == current_user.id
     ).first()
@@ -94,10 +188,25 @@ def cancel_order(
     if not order:
         raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다.")
         
-    if order.status != OrderStatus.CREATED:
+    # 상태 변경을 조건부 UPDATE로 처리해 동시에 취소 요청이 와도 재고는 한 번만 복구
+    canceled = db.execute(
+        update(Order)
+        .where(Order.id == order.id, Order.status == OrderStatus.CREATED)
+        .values(status=OrderStatus.CANCELED)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not canceled:
          raise HTTPException(status_code=400, detail="이미 처리가 진행된 주문은 취소할 수 없습니다.")
-         
-    order.status = OrderStatus.CANCELED
+    
+    quantities: Dict[int, int] = {}
+    for item in order.items:
+        quantities[item.book_id] = quantities.get(item.book_id, 0) + item.quantity
+    release_stock(db, quantities)
+    bump_book_stats_version(db)
+    enqueue_order_event(db, order.id, "canceled")
     db.commit()
+    job_queue.notify()
+    for book_id in quantities:
+        invalidate_book(book_id)
     db.refresh(order)
     return order
\ No newline at end of file
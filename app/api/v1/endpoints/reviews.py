@@ -1,11 +1,17 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session, contains_eager
 from app.db.session import get_db
 from app.models.review import Review
 from app.models.book import Book
 from app.models.user import User
-from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse
+from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse, ReviewListResponse
+from app.services.book_cache import get_book, invalidate_book
+from app.services.ratings import apply_rating
+from app.services.catalog import bump_book_stats_version
+from app.services.pagination import encode_cursor, decode_cursor, keyset_filter
 from app.api import deps
 
 router = APIRouter()
@@ -18,9 +24,8 @@ def create_review(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    # 책 존재 여부 확인
-    book = db.query(Book).filter(Book.id == book_id).first()
-    if not book:
+    # 책 존재 여부 확인 (캐시 우선)
+    if not get_book(db, book_id):
         raise HTTPException(status_code=404, detail="책을 찾을 수 없습니다.")
 
     new_review = Review(
@@ -30,15 +35,67 @@ def create_review(
         content=review_in.content
     )
     db.add(new_review)
+    # 도서의 평점 집계도 같은 트랜잭션에서 증감 (목록 응답/정렬에 쓰이므로 도서 통계 버전도 갱신, 패싯 캐시는 유지)
+    apply_rating(db, book_id, review_in.rating, 1)
+    bump_book_stats_version(db)
     db.commit()
+    invalidate_book(book_id)
     db.refresh(new_review)
     return new_review
 
-# 2. 해당 책의 리뷰 목록 조회
-@router.get("/books/{book_id}/reviews", response_model=List[ReviewResponse])
-def read_reviews(book_id: int, db: Session = Depends(get_db)):
-    reviews = db.query(Review).filter(Review.book_id == book_id).all()
-    return reviews
+# 2. 해당 책의 리뷰 목록 조회 (최신순 / 평점순 커서 페이지네이션)
+# 정렬 기준별 (정렬 컬럼, 커서 값 변환 함수) - 같은 값끼리는 id 내림차순
+REVIEW_SORTS = {
+    "newest": (Review.created_at, datetime.fromisoformat),
+    "rating": (Review.rating, int),
+}
+
+@router.get("/books/{book_id}/reviews", response_model=ReviewListResponse)
+def read_reviews(
+    book_id: int,
+    sort: Literal["newest", "rating"] = Query("newest", description="정렬: newest(최신순) | rating(평점 높은순)"),
+    size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    db: Session = Depends(get_db)
+):
+    sort_column, parse = REVIEW_SORTS[sort]
+    # 작성자 이름은 조인으로 같은 쿼리에서 읽음 (리뷰마다 users 조회 방지)
+    query = db.query(Review)\
+        .join(Review.user)\
+        .options(contains_eager(Review.user))\
+        .filter(Review.book_id == book_id)
+    if cursor:
+        try:
+            payload = decode_cursor(cursor)
+            if payload.get("s") != sort:
+                raise ValueError("정렬 조건이 커서와 다릅니다.")
+            last_value, last_id = parse(payload["v"]), int(payload["id"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+        query = query.filter(
+            keyset_filter(sort_column, Review.id, last_value, last_id, True, db.get_bind().dialect.name)
+        )
+
+    # size+1개를 읽어 다음 페이지 존재 여부 확인 (COUNT 쿼리 없음)
+    reviews = query.order_by(sort_column.desc(), Review.id.desc()).limit(size + 1).all()
+    next_cursor = None
+    if len(reviews) > size:
+        reviews = reviews[:size]
+        last = reviews[-1]
+        next_cursor = encode_cursor({"s": sort, "d": "desc", "v": getattr(last, sort_column.key), "id": last.id})
+
+    # 평점 분포는 첫 페이지에서만 GROUP BY 한 번으로 계산 (다음 페이지 요청에서는 생략)
+    histogram = None
+    if not cursor:
+        counts = dict(
+            db.query(Review.rating, func.count(Review.id))
+            .filter(Review.book_id == book_id)
+            .group_by(Review.rating)
+            .all()
+        )
+        histogram = [{"rating": rating, "count": counts.get(rating, 0)} for rating in range(1, 6)]
+
+    return {"content": reviews, "size": size, "nextCursor": next_cursor, "ratingHistogram": histogram}
 
 # 3. 리뷰 수정 (본인만)
 @router.patch("/reviews/{review_id}", response_model=ReviewResponse)
@@ -48,18 +105,26 @@ def update_review(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    review = db.query(Review).filter(Review.id == review_id).first()
+    # 이전 평점을 읽고 증감하는 사이 같은 리뷰가 동시에 수정되면 rating_sum이 어긋나므로 리뷰 행을 잠가서 읽음
+    # (리뷰 한 건은 작성자만 수정하므로 잠금 경합은 거의 없음)
+    review = db.query(Review).filter(Review.id == review_id).with_for_update().first()
     if not review:
         raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
     if review.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="본인의 리뷰만 수정할 수 있습니다.")
 
-    if review_in.rating:
+    rating_changed = bool(review_in.rating) and review_in.rating != review.rating
+    if rating_changed:
+        # 리뷰 수는 그대로, 합계만 (새 평점 - 이전 평점)만큼
+        apply_rating(db, review.book_id, review_in.rating - review.rating, 0)
+        bump_book_stats_version(db)
         review.rating = review_in.rating
     if review_in.content:
         review.content = review_in.content
         
     db.commit()
+    if rating_changed:
+        invalidate_book(review.book_id)
     db.refresh(review)
     return review
 
@@ -70,7 +135,8 @@ def delete_review(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    review = db.query(Review).filter(Review.id == review_id).first()
+    # 동시에 두 번 삭제되어 평점이 두 번 빠지지 않도록 수정과 같이 리뷰 행을 잠가서 읽음
+    review = db.query(Review).filter(Review.id == review_id).with_for_update().first()
     if not review:
         raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
     
@@ -78,6 +144,10 @@ def delete_review(
     if current_user.role != "ROLE_ADMIN" and review.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="권한이 없습니다.")
         
+    book_id = review.book_id
+    apply_rating(db, book_id, -review.rating, -1)
+    bump_book_stats_version(db)
     db.delete(review)
     db.commit()
+    invalidate_book(book_id)
     return None
\ No newline at end of file
@@ -1,64 +1,120 @@
 # app/api/v1/endpoints/stats.py
-from typing import List
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
 from app.db.session import get_db
-from app.models.order import Order, OrderItem
-from app.models.book import Book
 from app.models.user import User
 from app.api import deps
-from app.schemas.stats import DailySalesResponse, TopSellerResponse # 스키마 임포트
+from app.schemas.stats import (  # 스키마 임포트
+    DailySalesResponse, TopSellerResponse, CacheStatsResponse, ResultCacheStatsResponse, JobQueueStatsResponse,
+    RevenueAnalyticsResponse
+)
+from app.core.cache import SingleFlightCache
+from app.core.config import settings
+from app.services.book_cache import book_cache
+from app.services.jobs import job_queue
+from app.services.daily_sales import read_daily_sales
+from app.services.top_sellers import top_sellers
+from app.services.export import MEDIA_TYPES, stream_export
+from app.services.analytics import get_revenue_analytics
 
 router = APIRouter()
 
-# 1. 일별 매출 통계
+# 집계 결과 캐시: 여러 관리자가 대시보드를 동시에 열어도 같은 조건의 집계는 한 번만 실행
+# (집계 테이블이 바뀌어도 TTL 동안은 이전 결과를 보여줌)
+stats_cache = SingleFlightCache(settings.STATS_CACHE_MAX_ENTRIES, settings.STATS_CACHE_TTL_SECONDS)
+
+# 1. 일별 매출 통계 (daily_sales 집계 테이블에서 기간만 읽음, 취소 주문 제외)
 @router.get("/daily", response_model=List[DailySalesResponse])
 def get_daily_sales(
+    from_date: Optional[date] = Query(None, alias="from", description="시작일 (포함, YYYY-MM-DD)"),
+    to_date: Optional[date] = Query(None, alias="to", description="종료일 (포함, YYYY-MM-DD)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.check_admin)
 ):
-    # 날짜별 그룹핑 쿼리
-    results = db.query(
-        func.date(Order.created_at).label("date"),
-        func.sum(Order.total_price).label("total_sales"),
-        func.count(Order.id).label("order_count")
-    ).group_by(func.date(Order.created_at)).all()
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=400, detail="시작일이 종료일보다 늦습니다.")
     
-    # [수정된 부분] SQLAlchemy Row 객체를 Pydantic 스키마에 맞는 dict로 변환
-    response_data = []
-    for r in results:
-        response_data.append({
-            "date": str(r.date) if r.date else "",
-            # Decimal 타입이 나올 수 있으므로 float으로 변환, 없으면 0
-            "total_sales": float(r.total_sales) if r.total_sales else 0.0,
-            "order_count": int(r.order_count)
-        })
+    def compute():
+        return [
+            {
+                "date": r.sales_date.isoformat(),
+                # Decimal 타입이 나올 수 있으므로 float으로 변환
+                "total_sales": float(r.total_sales),
+                "order_count": int(r.order_count)
+            }
+            for r in read_daily_sales(db, from_date, to_date)
+        ]
     
-    return response_data
+    return stats_cache.get_or_compute(("daily", from_date, to_date), compute)
 
-# 2. 많이 팔린 책 순위
+# 2. 많이 팔린 책 순위 (미리 집계된 판매 수량에서 상위 K개, 취소 주문 제외)
 @router.get("/top-sellers", response_model=List[TopSellerResponse])
 def get_top_sellers(
-    limit: int = 5,
+    limit: int = Query(5, ge=1, description="순위 개수"),
+    window: Literal["7d", "30d", "all"] = Query("all", description="기간: 최근 7일 / 30일 / 전체"),
+    category: Optional[str] = Query(None, description="카테고리 필터"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.check_admin)
+):
+    if limit > top_sellers.size:
+        raise HTTPException(status_code=400, detail=f"limit은 {top_sellers.size} 이하여야 합니다.")
+    category = category.strip() if category and category.strip() else None
+    # 순위판이 자체 캐시(상위 K개, 판매량 변경 시 다시 읽음)를 가지므로 stats_cache로 한 번 더 감싸지 않음
+    # (감싸면 mark_changed()로 인한 갱신이 TTL 동안 응답에 반영되지 않음)
+    return top_sellers.top(db, window, category, limit)
+
+# 2-1. 매출 분석 리포트 (카테고리별 매출, 객단가 분포, 장바구니 크기, 주간 성장률)
+@router.get("/analytics", response_model=RevenueAnalyticsResponse)
+def get_analytics(
+    from_date: Optional[date] = Query(None, alias="from", description="시작일 (포함, YYYY-MM-DD)"),
+    to_date: Optional[date] = Query(None, alias="to", description="종료일 (포함, YYYY-MM-DD)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.check_admin)
+):
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=400, detail="시작일이 종료일보다 늦습니다.")
+    return get_revenue_analytics(db, from_date, to_date)
+
+# 3. 도서 캐시 적중률 (hit/miss 카운터)
+@router.get("/cache", response_model=CacheStatsResponse)
+def get_book_cache_stats(
+    current_user: User = Depends(deps.check_admin)
+):
+    return book_cache.stats()
+
+# 3-1. 통계 결과 캐시 적중률 (hit/miss/coalesced 카운터)
+@router.get("/result-cache", response_model=ResultCacheStatsResponse)
+def get_stats_cache_stats(
+    current_user: User = Depends(deps.check_admin)
+):
+    return stats_cache.stats()
+
+# 4. 주문 후처리 작업 큐 상태 (큐 깊이, 대기/실행 시간)
+@router.get("/jobs", response_model=JobQueueStatsResponse)
+def get_job_queue_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.check_admin)
 ):
-    results = db.query(
-        Book.title,
-        func.sum(OrderItem.quantity).label("total_sold")
-    ).join(Book, OrderItem.book_id == Book.id)\
-     .group_by(Book.id)\
-     .order_by(desc("total_sold"))\
-     .limit(limit).all()
-     
-    # [수정된 부분] 명시적 형변환
-    response_data = []
-    for r in results:
-        response_data.append({
-            "title": r.title,
-            # sum 결과가 None일 경우 대비
-            "total_sold": int(r.total_sold) if r.total_sold else 0
-        })
+    return job_queue.stats(db)
 
-    return response_data
\ No newline at end of file
+# 5. 주문 / 주문 품목 / 일별 매출 내보내기 (CSV 또는 NDJSON, 스트리밍)
+@router.get("/export/{dataset}")
+def export_dataset(
+    dataset: Literal["orders", "order-items", "daily-sales"],
+    format: Literal["csv", "ndjson"] = Query("csv", description="파일 형식"),
+    from_date: Optional[date] = Query(None, alias="from", description="시작일 (포함, YYYY-MM-DD)"),
+    to_date: Optional[date] = Query(None, alias="to", description="종료일 (포함, YYYY-MM-DD)"),
+    current_user: User = Depends(deps.check_admin)
+):
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=400, detail="시작일이 종료일보다 늦습니다.")
+    
+    filename = f"{dataset}.{format}"
+    return StreamingResponse(
+        stream_export(dataset, format, from_date, to_date),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,161 @@
+# app/core/cache.py
+"""
+프로세스 내 공용 캐시 자료구조.
+
+LRUCache: 최대 개수(LRU 제거)와 TTL(만료 시간)을 모두 가진 스레드 안전한 캐시.
+조회 결과마다 hit/miss 카운터를 올려서 stats()로 적중률을 확인할 수 있습니다.
+
+SingleFlightCache: LRUCache + 요청 합치기(single-flight).
+캐시가 비어 있을 때 같은 키로 동시에 들어온 요청 중 하나만 계산하고, 나머지는 그 결과를 기다려서 받습니다.
+(무거운 집계 쿼리가 동시에 여러 번 실행되는 것을 방지)
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        # key -> (값, 만료 시각). 최근에 사용한 항목이 뒤쪽
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        # 무효화될 때마다 증가. 로딩 도중 무효화된 값은 저장하지 않기 위해 사용
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """generation을 넘기면, 그 이후 무효화가 있었을 때는 저장하지 않음"""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (value, time.monotonic() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """read-through: 캐시에 없으면 loader()로 읽어서 저장 (None은 저장하지 않음)"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self.generation()
+        value = loader()
+        if value is not None:
+            self.set(key, value, generation)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class _Flight:
+    """진행 중인 계산 하나 (기다리는 쪽은 done.wait() 후 value/error 확인)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlightCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._lock = threading.Lock()
+        self._cache = LRUCache(max_entries, ttl_seconds)
+        # 계산 중인 키 -> _Flight
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.hits = 0
+        self.misses = 0       # 직접 계산한 횟수
+        self.coalesced = 0    # 다른 요청의 계산 결과를 기다려서 받은 횟수
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """캐시에 있으면 그대로, 없으면 키마다 한 번만 compute() 실행 (실패하면 기다리던 요청도 같은 예외)"""
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            if flight.value is not None:
+                self._cache.set(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        cache_stats = self._cache.stats()
+        with self._lock:
+            total = self.hits + self.misses + self.coalesced
+            return {
+                "size": cache_stats["size"],
+                "max_entries": cache_stats["max_entries"],
+                "ttl_seconds": cache_stats["ttl_seconds"],
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+                # 직접 계산하지 않고 응답한 비율 (hit + 합쳐진 요청)
+                "hit_ratio": round((self.hits + self.coalesced) / total, 4) if total else 0.0,
+            }
@@ -1,3 +1,4 @@
+from typing import List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -12,6 +13,58 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # 도서 목록 totalElements 캐시 유지 시간 (초) - 다른 프로세스에서 쓴 변경도 이 시간 안에 반영됨
+    BOOK_COUNT_CACHE_TTL_SECONDS: int = 60
+
+    # 도서 단건 캐시 (상세 조회/장바구니/리뷰/좋아요에서 사용)
+    BOOK_CACHE_MAX_ENTRIES: int = 1024
+    BOOK_CACHE_TTL_SECONDS: int = 300
+
+    # 도서 대량 등록: 한 번에 INSERT/commit 할 행 수, 응답에 상세히 보여줄 최대 오류 수
+    BOOK_IMPORT_CHUNK_SIZE: int = 1000
+    BOOK_IMPORT_MAX_ERRORS: int = 1000
+
+    # 검색 패싯: 가격 구간 경계값 (원), 결과 캐시 유지 시간 (초)
+    BOOK_PRICE_FACET_BOUNDARIES: List[int] = [10000, 20000, 30000, 40000, 50000]
+    BOOK_FACET_CACHE_TTL_SECONDS: int = 300
+
+    # 검색 결과 id를 DB에 넘길 때 한 문장의 IN 목록 최대 길이 (넘으면 나눠서 조회 후 병합)
+    SEARCH_ID_BATCH_SIZE: int = 500
+
+    # Idempotency-Key 재시도 응답 유지 시간 (초), 처리 중인 채로 이 시간이 지난 선점은 만료 (프로세스 중단 대비),
+    # 만료된 행 전체 정리 주기 (프로세스별, 초)
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_IN_FLIGHT_TIMEOUT_SECONDS: int = 300
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 3600
+
+    # 주문 후처리 작업 큐: 워커 수(0이면 시작 안 함), 빈 큐 폴링 주기, 최대 시도 횟수,
+    # 재시도 대기(초, 시도마다 2배, 최대값까지), 이 시간 넘게 RUNNING인 작업은 다시 실행 (가장 긴 작업보다 길게)
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 2.0
+    JOB_RETRY_MAX_SECONDS: float = 300.0
+    JOB_STALE_SECONDS: int = 600
+    # RUNNING에 멈춘 작업 확인 주기 (초, 워커 루프에서 프로세스별로 이 주기마다 한 번)
+    JOB_STALE_CHECK_SECONDS: float = 60.0
+
+    # 판매 순위: 기간/카테고리별로 메모리에 들고 있는 상위 K개, 최대 유지 시간(다른 프로세스의 변경 반영 주기),
+    # 이 프로세스에서 판매량이 바뀌었을 때 다시 읽는 최소 간격 (초)
+    TOP_SELLERS_SIZE: int = 100
+    TOP_SELLERS_REFRESH_SECONDS: int = 60
+    TOP_SELLERS_MIN_REFRESH_SECONDS: int = 5
+
+    # 통계 API 결과 캐시 (같은 조건의 동시 요청은 한 번만 계산)
+    STATS_CACHE_TTL_SECONDS: int = 30
+    STATS_CACHE_MAX_ENTRIES: int = 256
+
+    # 내보내기: DB에서 한 번에 받아오는 행 수 (서버 측 커서 묶음 크기)
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # 매출 분석: 기간별 결과 캐시 유지 시간 (초), 객단가 분포 구간 경계값 (원)
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300
+    ANALYTICS_ORDER_VALUE_BOUNDARIES: List[int] = [10000, 20000, 30000, 50000, 100000]
+
     class Config:
         env_file = ".env"
 
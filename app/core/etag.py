@@ -0,0 +1,44 @@
+# app/core/etag.py
+"""
+ETag / If-None-Match 처리 도우미.
+
+같은 내용이면 항상 같은 ETag가 나오도록 응답을 구성하는 값들(id, 수정 시각, 카탈로그 버전,
+쿼리 파라미터 등)의 해시로 만듭니다. 응답 본문을 직렬화하지 않고도 계산할 수 있어서,
+304 Not Modified 응답은 직렬화 비용도 전송량도 들지 않습니다.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """값들로부터 강한(strong) ETag 문자열 생성 (따옴표 포함)"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 (여러 값, "*", W/ 접두어 지원 - 약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """304 응답 (본문 없이 ETag만)"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """200 응답에 ETag 헤더 설정 (no-cache: 저장은 하되 쓸 때마다 ETag로 재검증)"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
@@ -0,0 +1,208 @@
+# app/core/idempotency.py
+"""
+POST 요청 재시도 처리 (Idempotency-Key 헤더).
+
+모바일 클라이언트는 응답 시간 초과 시 같은 요청을 다시 보냅니다.
+(사용자, Idempotency-Key)별로 첫 번째 성공 응답(상태 코드, 헤더, 본문)을 idempotency_keys 테이블에
+저장해 두었다가 재시도에는 엔드포인트를 실행하지 않고 저장된 응답을 그대로 돌려줍니다. (주문 중복 생성 방지)
+프로세스 메모리가 아닌 DB에 저장하므로 재시도가 다른 워커로 가거나 서버가 재시작해도 유지됩니다.
+
+- 엔드포인트 실행 전에 (user_id, idempotency_key) 유니크 행을 INSERT 해서 키를 선점
+  (동시에 들어온 같은 키 요청은 유니크 위반으로 한쪽만 실행)
+- 같은 키로 경로나 본문이 다른 요청이 오면 422 (키 재사용 실수)
+- 첫 요청이 아직 처리 중이면 409 (동시에 두 번 처리되지 않도록)
+- 실패 응답(2xx 이외)은 저장하지 않음 -> 선점을 지워서 같은 키로 다시 시도 가능
+- 저장된 응답은 TTL이 지나면 제거, 처리 중인 채로 오래된 선점(프로세스 중단)도 제거
+"""
+import json
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+from jose import JWTError, jwt
+from sqlalchemy import and_, delete, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.idempotency import IdempotencyKey, IdempotencyStatus
+
+# 재시도 보호 대상 POST 경로 (끝의 / 는 제거한 뒤 비교)
+IDEMPOTENT_PATHS = [
+    re.compile(r"^/api/v1/orders$"),
+    re.compile(r"^/api/v1/cart$"),
+    re.compile(r"^/api/v1/cart/bulk$"),
+    re.compile(r"^/api/v1/books/\d+/reviews$"),
+]
+
+MAX_KEY_LENGTH = 255
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: str  # 경로 + 요청 본문 해시
+    status_code: int
+    body: bytes
+    headers: List[Tuple[str, str]]  # 첫 응답의 헤더 (재사용 시 그대로 돌려줌)
+
+
+def normalize_path(path: str) -> str:
+    return path.rstrip("/") or "/"
+
+
+def is_idempotent_path(path: str) -> bool:
+    path = normalize_path(path)
+    return any(pattern.match(path) for pattern in IDEMPOTENT_PATHS)
+
+
+def _utcnow() -> datetime:
+    """idempotency_keys 테이블에 기록하는 시각 (timezone 없는 UTC)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def token_subject(authorization: Optional[str]) -> Optional[str]:
+    """Authorization: Bearer 토큰의 sub (검증 실패 시 None -> 인증 오류는 엔드포인트가 처리)"""
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    sub = payload.get("sub")
+    return str(sub) if sub is not None else None
+
+
+class IdempotencyStore:
+    """
+    idempotency_keys 테이블 기반 저장소. 모든 메서드는 자체 세션으로 바로 commit 합니다.
+    (미들웨어는 엔드포인트의 세션 바깥에서 동작하므로, 키 선점이 엔드포인트 롤백과 무관하게 남아야 함)
+    """
+    # begin()의 결과
+    NEW = "new"              # 처음 보는 키 -> 처리 후 complete()/abort() 호출
+    REPLAY = "replay"        # 저장된 응답을 그대로 반환
+    MISMATCH = "mismatch"    # 같은 키, 다른 요청 (경로 또는 본문)
+    IN_FLIGHT = "in_flight"  # 같은 키의 첫 요청이 아직 처리 중
+
+    def __init__(self, session_factory, ttl_seconds: float, in_flight_timeout_seconds: float,
+                 purge_interval_seconds: float):
+        self._session_factory = session_factory
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._in_flight_timeout = timedelta(seconds=in_flight_timeout_seconds)
+        self._purge_interval = purge_interval_seconds
+        self._purge_lock = threading.Lock()
+        self._last_purge = 0.0
+
+    def _expired(self, now: datetime):
+        """유지 시간이 지난 행 + 처리 중인 채로 너무 오래된 선점 (프로세스가 죽어서 끝나지 못한 요청)"""
+        return or_(
+            IdempotencyKey.created_at < now - self._ttl,
+            and_(
+                IdempotencyKey.status == IdempotencyStatus.IN_FLIGHT,
+                IdempotencyKey.created_at < now - self._in_flight_timeout,
+            ),
+        )
+
+    def begin(self, user_id: int, key: str, fingerprint: str) -> Tuple[str, Optional[StoredResponse]]:
+        """INSERT로 키를 선점. 이미 있으면(유니크 위반) 기존 행을 보고 재사용/거절을 결정"""
+        self._maybe_purge()
+        now = _utcnow()
+        db = self._session_factory()
+        try:
+            # 같은 키의 만료된 행은 먼저 지워서 다시 쓸 수 있게 함
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.idempotency_key == key, self._expired(now)
+            ))
+            try:
+                db.execute(insert(IdempotencyKey).values(
+                    user_id=user_id,
+                    idempotency_key=key,
+                    request_hash=fingerprint,
+                    status=IdempotencyStatus.IN_FLIGHT,
+                    created_at=now,
+                ))
+                db.commit()
+                return self.NEW, None
+            except IntegrityError:
+                db.rollback()
+
+            row = db.query(IdempotencyKey).filter(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.idempotency_key == key
+            ).first()
+            if row is None:
+                # 그 사이 첫 요청이 실패해서 선점이 풀림 -> 클라이언트가 다시 시도하면 처리됨
+                return self.IN_FLIGHT, None
+            if row.request_hash != fingerprint:
+                return self.MISMATCH, None
+            if row.status == IdempotencyStatus.IN_FLIGHT:
+                return self.IN_FLIGHT, None
+            return self.REPLAY, StoredResponse(
+                fingerprint=row.request_hash,
+                status_code=row.response_status,
+                body=row.response_body,
+                headers=[tuple(header) for header in json.loads(row.response_headers)],
+            )
+        finally:
+            db.close()
+
+    def complete(self, user_id: int, key: str, response: StoredResponse) -> None:
+        db = self._session_factory()
+        try:
+            db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.idempotency_key == key,
+                    IdempotencyKey.status == IdempotencyStatus.IN_FLIGHT,
+                )
+                .values(
+                    status=IdempotencyStatus.DONE,
+                    response_status=response.status_code,
+                    response_headers=json.dumps(response.headers, separators=(",", ":")),
+                    response_body=response.body,
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def abort(self, user_id: int, key: str) -> None:
+        """실패한 요청의 선점을 풀어서 같은 키로 다시 시도할 수 있게 함"""
+        db = self._session_factory()
+        try:
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.idempotency_key == key,
+                IdempotencyKey.status == IdempotencyStatus.IN_FLIGHT,
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        """만료된 행 삭제. 삭제한 행 수 반환"""
+        db = self._session_factory()
+        try:
+            deleted = db.execute(delete(IdempotencyKey).where(self._expired(_utcnow()))).rowcount
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def _maybe_purge(self) -> None:
+        # 프로세스마다 purge_interval에 한 번만 전체 정리 (요청마다 테이블 전체를 지우러 가지 않도록)
+        with self._purge_lock:
+            now = time.monotonic()
+            if self._last_purge and now - self._last_purge < self._purge_interval:
+                return
+            self._last_purge = now
+        self.purge_expired()
+
+
+# 앱 전체에서 공유하는 저장소
+idempotency_store = IdempotencyStore(
+    SessionLocal,
+    settings.IDEMPOTENCY_TTL_SECONDS,
+    settings.IDEMPOTENCY_IN_FLIGHT_TIMEOUT_SECONDS,
+    settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+)
@@ -1,6 +1,9 @@
 # 모든 모델을 이곳에 모아서 Alembic이나 초기화 스크립트가 찾기 쉽게 합니다.
 from app.db.session import Base
 from app.models.user import User
-from app.models.book import Book
+from app.models.book import Book, Author, Category
+from app.models.catalog import CatalogVersion
 from app.models.cart import CartItem
-from app.models.order import Order, OrderItem
\ No newline at end of file
+from app.models.order import Order, OrderItem
+from app.models.job import Job
+from app.models.sales import DailySales, BookSales, BookSalesDaily
\ No newline at end of file
@@ -0,0 +1,77 @@
+# app/db/upsert.py
+"""
+DB 종류(MySQL / SQLite)에 맞는 INSERT ... 충돌 시 처리 구문을 만들어 주는 도우미.
+
+"SELECT로 있는지 확인 -> 없으면 INSERT" 방식은 쿼리가 두 번 나가고,
+동시에 두 요청이 들어오면 둘 다 INSERT를 시도해 유니크 제약 위반이 납니다.
+한 문장으로 처리하면 왕복이 줄고 경쟁 상황에서도 안전합니다.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_INSERTS = {
+    "mysql": mysql.insert,
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def dialect_insert(db: Session, table: Table):
+    """현재 세션이 연결된 DB에 맞는 insert() 구문 (on_conflict / on_duplicate_key 지원)"""
+    dialect_name = db.get_bind().dialect.name
+    try:
+        return _INSERTS[dialect_name](table)
+    except KeyError:
+        raise NotImplementedError(f"지원하지 않는 DB입니다: {dialect_name}")
+
+
+def insert_ignore(db: Session, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """
+    rows를 한 번에 INSERT 하되, 유니크/PK가 겹치는 행은 건너뜀.
+    MySQL의 INSERT IGNORE는 다른 오류(값 잘림 등)까지 경고로 삼키므로
+    ON DUPLICATE KEY UPDATE로 기존 행의 컬럼을 자기 자신으로 다시 넣는 방식(no-op)을 사용합니다.
+    (VALUES(col)을 넣으면 겹친 기존 행이 새 값으로 바뀌므로 사용하지 않음)
+    """
+    if not rows:
+        return
+    stmt = dialect_insert(db, table).values(rows)
+    if db.get_bind().dialect.name == "mysql":
+        first_column = next(iter(rows[0]))
+        stmt = stmt.on_duplicate_key_update({first_column: table.c[first_column]})
+    else:
+        stmt = stmt.on_conflict_do_nothing()
+    db.execute(stmt)
+
+
+def upsert(
+    db: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    conflict_columns: List[str],
+    update_columns: List[str],
+    extra_updates: Optional[Dict[str, Any]] = None,
+    increment_columns: Optional[List[str]] = None,
+) -> None:
+    """
+    rows를 한 번에 INSERT 하되, conflict_columns(유니크 키)가 겹치는 행은 update_columns 값으로 UPDATE.
+    increment_columns는 덮어쓰지 않고 기존 값에 더함 (예: 장바구니 수량, 집계 카운터).
+    ON CONFLICT / ON DUPLICATE KEY 분기에서는 컬럼의 onupdate가 실행되지 않으므로
+    updated_at 같은 값은 extra_updates로 직접 넘깁니다.
+    """
+    if not rows:
+        return
+    stmt = dialect_insert(db, table).values(rows)
+    # MySQL은 VALUES(col) / 그 외는 excluded.col 로 "넣으려던 값"을 참조
+    new_values = stmt.inserted if db.get_bind().dialect.name == "mysql" else stmt.excluded
+    values = {column: new_values[column] for column in update_columns}
+    for column in increment_columns or []:
+        values[column] = table.c[column] + new_values[column]
+    values.update(extra_updates or {})
+    if db.get_bind().dialect.name == "mysql":
+        stmt = stmt.on_duplicate_key_update(values)
+    else:
+        stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=values)
+    db.execute(stmt)
@@ -1,22 +1,74 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, DECIMAL
+from sqlalchemy import Column, Integer, String, Text, DateTime, DECIMAL, ForeignKey, Table, Index
 from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
 from app.db.session import Base
 
+# 도서-저자 / 도서-카테고리 N:M 연결 테이블
+# (book_id, x_id)가 PK라서 도서 기준 조회는 PK로, 저자/카테고리 기준 조회는 역방향 인덱스로 처리
+book_authors = Table(
+    "book_authors",
+    Base.metadata,
+    Column("book_id", Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True),
+    Column("author_id", Integer, ForeignKey("authors.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_book_authors_author_book", "author_id", "book_id"),
+)
+
+book_categories = Table(
+    "book_categories",
+    Base.metadata,
+    Column("book_id", Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True),
+    Column("category_id", Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_book_categories_category_book", "category_id", "book_id"),
+)
+
+class Author(Base):
+    __tablename__ = "authors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, nullable=False, index=True) # 저자 이름
+
+class Category(Base):
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, nullable=False, index=True) # 카테고리 이름
+
 class Book(Base):
     __tablename__ = "books"
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True) # 제목
-    # 저자와 카테고리는 여러 개일 수 있으므로 쉼표(,)로 구분된 문자열이나 JSON으로 저장
+    # 저자와 카테고리는 여러 개일 수 있으므로 쉼표(,)로 구분된 문자열로도 저장 (응답 표시용)
+    # 검색/필터는 아래 author_list / category_list 연결 테이블을 사용
     authors = Column(Text)       # 예: "홍길동,김철수"
     categories = Column(Text)    # 예: "IT,컴퓨터"
     
     publisher = Column(String(100))        # 출판사
     publication_date = Column(String(20))  # 출판일
     isbn = Column(String(20), unique=True, index=True) # ISBN (고유번호)
-    price = Column(DECIMAL(10, 2))         # 가격
+    price = Column(DECIMAL(10, 2), nullable=False)  # 가격 (정렬/커서 비교에 NULL이 끼지 않도록 필수)
     description = Column(Text)             # 상세 설명
     stock_quantity = Column(Integer, default=0) # 재고 수량
+
+    # 리뷰 평점 집계 (리뷰 작성/수정/삭제 시 app/services/ratings.py가 같은 트랜잭션에서 갱신)
+    # 평균은 합계/개수로 다시 계산하므로 갱신이 반복되어도 반올림 오차가 쌓이지 않음
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")     # 평점 합계
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")   # 리뷰 수
+    rating_avg = Column(DECIMAL(3, 2), nullable=False, default=0, server_default="0") # 평균 평점 (리뷰가 없으면 0)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # 정규화된 저자/카테고리 (authors, categories 문자열과 app/services/taxonomy.py가 동기화)
+    author_list = relationship("Author", secondary=book_authors)
+    category_list = relationship("Category", secondary=book_categories)
+
+    # 목록 정렬 키마다 (정렬 값, id) 인덱스 - 커서 다음 페이지를 정렬 없이 인덱스 탐색으로 읽음
+    # (제목은 위의 title 인덱스가 PK를 포함하므로 (title, id) 순서로 읽힘)
+    # 평점순 / 리뷰 많은순도 같은 방식 (리뷰 조인 + 집계 없음)
+    __table_args__ = (
+        Index("ix_books_created_at_id", "created_at", "id"),
+        Index("ix_books_price_id", "price", "id"),
+        Index("ix_books_rating_avg_id", "rating_avg", "id"),
+        Index("ix_books_rating_count_id", "rating_count", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -20,6 +20,11 @@ class CartItem(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # 같은 책은 한 줄로만 담김 (담기는 이 제약을 이용한 upsert 한 문장으로 처리, user_id 조회 인덱스 겸용)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'book_id', name='uq_user_book_cart'),
+    )
+
     # 관계 설정 (DB에서 책 정보를 바로 가져오기 위함)
     book = relationship("Book")
     user = relationship("User")
\ No newline at end of file
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer
+from app.db.session import Base
+
+# 도서 카탈로그 버전. 도서가 등록/수정/삭제될 때마다 같은 트랜잭션에서 1씩 증가
+# id=1: 카탈로그 (도서 쓰기), id=2: 도서 통계 (재고/평점 집계) - app/services/catalog.py 참고
+# 목록 조회 ETag에 사용하므로 프로세스가 여러 개여도, 재시작해도 같은 값을 봄
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -12,9 +12,11 @@ class Favorite(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    # 한 사람이 같은 책을 두 번 찜할 수 없도록 유니크 제약
+    # 한 사람이 같은 책을 두 번 찜할 수 없도록 유니크 제약 (좋아요 토글이 이 제약에 기대어 동작)
+    # 찜 목록은 (user_id, created_at, id) 인덱스로 최신순 커서 조회
     __table_args__ = (
         UniqueConstraint('user_id', 'book_id', name='uq_user_book_favorite'),
+        Index('ix_favorites_user_created', 'user_id', 'created_at', 'id'),
     )
 
-    book = relationship("Book")
\ No newline at end of file
+    book = relationship("Book")
@@ -0,0 +1,33 @@
+import enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index, LargeBinary, UniqueConstraint
+from app.db.session import Base
+
+# 요청 처리 상태
+class IdempotencyStatus(str, enum.Enum):
+    IN_FLIGHT = "IN_FLIGHT"  # 첫 요청이 처리 중 (키 선점)
+    DONE = "DONE"            # 성공 응답 저장 완료 -> 재시도에 그대로 반환
+
+# Idempotency-Key 재시도 응답 저장소 (DB 테이블 기반 - 워커/프로세스가 여러 개이거나 재시작해도 유지)
+# 엔드포인트 실행 전에 (user_id, idempotency_key) 행을 INSERT 해서 키를 선점하므로
+# 같은 키의 요청이 동시에 여러 워커로 들어와도 하나만 처리됨
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "idempotency_key", name="uq_idempotency_user_key"),
+        # 유지 시간이 지난 행 정리용
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)            # 토큰의 sub (사용자 id)
+    idempotency_key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)    # 경로 + 요청 본문 SHA-256
+    status = Column(Enum(IdempotencyStatus), nullable=False, default=IdempotencyStatus.IN_FLIGHT)
+
+    # 저장된 성공 응답 (DONE일 때만 채워짐)
+    response_status = Column(Integer)
+    response_headers = Column(Text)                      # JSON [[이름, 값], ...] (같은 이름 여러 개 유지)
+    response_body = Column(LargeBinary(length=16 * 1024 * 1024 - 1))  # MySQL에서는 MEDIUMBLOB
+
+    # 시각은 애플리케이션에서 UTC로 기록
+    created_at = Column(DateTime, nullable=False)
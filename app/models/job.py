@@ -0,0 +1,33 @@
+import enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index
+from app.db.session import Base
+
+# 작업 상태
+class JobStatus(str, enum.Enum):
+    PENDING = "PENDING"  # 실행 대기 (재시도 대기 포함)
+    RUNNING = "RUNNING"  # 워커가 가져가서 실행 중
+    DONE = "DONE"        # 완료
+    FAILED = "FAILED"    # 최대 시도 횟수 초과
+
+# 주문 후처리 작업 큐 (DB 테이블 기반 - 외부 메시지 큐 없이 동작)
+# 주문과 같은 트랜잭션에서 INSERT 되므로, 주문이 commit 되면 작업도 반드시 남음
+class Job(Base):
+    __tablename__ = "jobs"
+    # 워커가 "실행 가능한 가장 오래된 대기 작업"을 찾는 조회용
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)   # 작업 종류 (예: "order.notify")
+    payload = Column(Text, nullable=False)      # JSON 문자열
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
+
+    attempts = Column(Integer, nullable=False, default=0)  # 지금까지 실행한 횟수
+    last_error = Column(Text)                              # 마지막 실패 사유
+
+    # 시각은 모두 애플리케이션에서 UTC로 기록 (재시도 예약 시각 계산과 맞추기 위해)
+    run_at = Column(DateTime, nullable=False)   # 이 시각 이후에 실행 (재시도 시 뒤로 미룸)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
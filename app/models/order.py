@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, DECIMAL, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, DECIMAL, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -14,6 +14,10 @@ class OrderStatus(str, enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    # 내 주문 내역 (user_id 조건 + created_at, id 역순 커서)을 인덱스 범위 탐색 한 번으로 처리
+    __table_args__ = (
+        Index("ix_orders_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -17,4 +17,16 @@ class Review(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user = relationship("User")
-    book = relationship("Book")
\ No newline at end of file
+    book = relationship("Book")
+
+    # 도서별 리뷰 목록 커서 조회 - 최신순 (book_id, created_at, id) / 평점순 (book_id, rating, id)
+    # 평점 분포(GROUP BY rating)도 두 번째 인덱스만 읽어서 계산
+    __table_args__ = (
+        Index("ix_reviews_book_created", "book_id", "created_at", "id"),
+        Index("ix_reviews_book_rating", "book_id", "rating", "id"),
+    )
+
+    @property
+    def user_name(self):
+        """작성자 이름 (목록 조회는 contains_eager로 같은 쿼리에서 채움)"""
+        return self.user.name if self.user else None
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, Date, DateTime, DECIMAL, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+# 일별 매출 집계 (주문 생성/취소 시 작업 큐에서 증감, scripts/rebuild_daily_sales.py로 재계산)
+# 통계 API는 orders 전체를 GROUP BY 하지 않고 이 테이블의 날짜 범위만 읽음
+class DailySales(Base):
+    __tablename__ = "daily_sales"
+
+    sales_date = Column(Date, primary_key=True)                            # 주문일 (orders.created_at 기준)
+    total_sales = Column(DECIMAL(14, 2), nullable=False, default=0)        # 취소되지 않은 주문 금액 합계
+    order_count = Column(Integer, nullable=False, default=0)               # 취소되지 않은 주문 수
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+# 도서별 누적 판매 수량 (전체 기간 판매 순위용, 주문 생성/취소 시 작업 큐에서 증감)
+class BookSales(Base):
+    __tablename__ = "book_sales"
+    # 판매량 내림차순 상위 K개를 인덱스 앞부분만 읽어서 가져오기 위함
+    __table_args__ = (
+        Index("ix_book_sales_total_sold", "total_sold", "book_id"),
+    )
+
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    total_sold = Column(Integer, nullable=False, default=0)
+
+# 도서별 일별 판매 수량 (최근 7일/30일 판매 순위용)
+class BookSalesDaily(Base):
+    __tablename__ = "book_sales_daily"
+    # 기간 조건(sales_date)으로 범위 탐색 후 book_id별 합계 - 인덱스만으로 처리
+    __table_args__ = (
+        Index("ix_book_sales_daily_date_book", "sales_date", "book_id", "quantity"),
+    )
+
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    sales_date = Column(Date, primary_key=True)  # 주문일 (orders.created_at 기준)
+    quantity = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import date, datetime
 
@@ -25,11 +25,19 @@ class BookUpdate(BaseModel):
     categories: Optional[str] = None
     publisher: Optional[str] = None
     publication_date: Optional[str] = None
-    price: Optional[float] = None
+    price: Optional[float] = Field(None, ge=0)
     description: Optional[str] = None
     stock_quantity: Optional[int] = None
     # ISBN은 수정 불가로 설정
 
+    @field_validator("price")
+    @classmethod
+    def price_not_null(cls, value):
+        # 생략은 허용하지만 null로 지우는 것은 불가 (가격 없는 도서는 주문/정렬할 수 없음)
+        if value is None:
+            raise ValueError("가격은 비울 수 없습니다.")
+        return value
+
 # 응답 (Response)
 class BookResponse(BaseModel):
     id: int
@@ -39,19 +47,62 @@ class BookResponse(BaseModel):
     publisher: Optional[str] = None
     publication_date: Optional[date] = None
     price: int
-    stock: int
+    stock: int = Field(..., validation_alias="stock_quantity")  # DB 컬럼명은 stock_quantity
     categories: Optional[str] = None
+    rating_avg: float = 0.0      # 평균 평점 (리뷰가 없으면 0)
+    rating_count: int = 0        # 리뷰 수
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None  # 수정 이력이 없으면 NULL
 
     class Config:
         from_attributes = True
 
+# 검색 패싯 (카테고리별 / 가격 구간별 개수)
+class CategoryFacet(BaseModel):
+    name: str
+    count: int
+
+class PriceBucketFacet(BaseModel):
+    min: int
+    max: Optional[int] = None    # 마지막 구간은 상한 없음
+    count: int
+
+class BookFacets(BaseModel):
+    categories: List[CategoryFacet]
+    priceBuckets: List[PriceBucketFacet]
+
 # 목록 조회 응답 (List)
 class BookListResponse(BaseModel):
     content: List[BookResponse]  # books -> content
     page: int                    # current_page -> page
     size: int
-    totalElements: int           # total_count -> totalElements
-    totalPages: int              # total_pages -> totalPages
-    sort: str                    # 정렬 정보 추가
\ No newline at end of file
+    totalElements: Optional[int] # total_count -> totalElements (count=none이면 null)
+    totalPages: Optional[int]    # total_pages -> totalPages
+    sort: str                    # 정렬 정보 추가
+    nextCursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 null)
+    facets: Optional[BookFacets] = None  # facets=true일 때만 (검색어 조건 기준)
+
+# 자동완성 제안
+class AutocompleteSuggestion(BaseModel):
+    text: str                    # 제안 문자열 (제목 또는 저자 이름)
+    type: str                    # "title" | "author"
+
+# 여러 권 한 번에 조회 응답
+class BookBatchResponse(BaseModel):
+    content: List[BookResponse]  # 요청한 id 순서대로 (없는 id는 제외)
+    missingIds: List[int]        # 존재하지 않는 id
+
+# 대량 등록 - 실패한 행 정보
+class BookImportError(BaseModel):
+    row: int                     # 데이터 행 번호 (헤더 제외, 1부터)
+    isbn: Optional[str] = None
+    message: str
+
+# 대량 등록 결과
+class BookImportResponse(BaseModel):
+    total: int                   # 읽은 행 수
+    inserted: int
+    updated: int
+    failed: int
+    errors: List[BookImportError]
+    errorsTruncated: bool        # 오류가 너무 많아 일부만 담았는지
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Literal
 from app.schemas.book import BookResponse  # 책 정보를 보여주기 위해 가져옴
 
 # 장바구니 담기 요청
@@ -7,6 +7,17 @@ class CartItemCreate(BaseModel):
     book_id: int
     quantity: int = 1
 
+# 장바구니 일괄 변경의 작업 하나
+# add: 수량만큼 더함 / set: 수량으로 바꿈 (0이면 삭제) / remove: 삭제 (quantity 무시)
+class CartBulkOperation(BaseModel):
+    op: Literal["add", "set", "remove"]
+    book_id: int
+    quantity: int = Field(1, ge=0)
+
+# 장바구니 일괄 변경 요청 (위시리스트 전체 담기, 재주문 등)
+class CartBulkRequest(BaseModel):
+    operations: List[CartBulkOperation] = Field(..., min_length=1, max_length=100)
+
 # 수량 수정 요청
 class CartItemUpdate(BaseModel):
     quantity: int
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.book import BookResponse
+
+# 좋아요 토글 결과
+class FavoriteToggleResponse(BaseModel):
+    message: str
+    liked: bool                  # 요청 처리 후 찜 상태
+
+# 찜 목록 응답 (찜한 순서 최신순, 커서 페이지네이션)
+class FavoriteListResponse(BaseModel):
+    content: List[BookResponse]
+    size: int
+    nextCursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 null)
@@ -30,4 +30,10 @@ class OrderResponse(BaseModel):
     items: List[OrderItemResponse] # 하위 품목들
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# 주문 내역 목록 응답 (커서 페이지네이션)
+class OrderListResponse(BaseModel):
+    content: List[OrderResponse]
+    size: int
+    nextCursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 null)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ReviewCreate(BaseModel):
     rating: int = Field(..., ge=1, le=5, description="평점 (1~5)")
@@ -17,7 +17,19 @@ class ReviewResponse(BaseModel):
     rating: int
     content: str
     created_at: datetime
-    # 작성자 이름도 보여주면 좋음 (선택사항)
+    user_name: Optional[str] = None  # 작성자 이름
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# 평점별 리뷰 수
+class RatingBucket(BaseModel):
+    rating: int                  # 1~5
+    count: int
+
+# 리뷰 목록 응답 (커서 페이지네이션)
+class ReviewListResponse(BaseModel):
+    content: List[ReviewResponse]
+    size: int
+    nextCursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 null)
+    ratingHistogram: Optional[List[RatingBucket]] = None  # 첫 페이지(커서 없음)에서만, 1~5점 모두 포함
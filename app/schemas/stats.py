@@ -1,6 +1,6 @@
 # app/schemas/stats.py
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date
 
 class DailySalesResponse(BaseModel):
@@ -9,5 +9,71 @@ class DailySalesResponse(BaseModel):
     order_count: int
 
 class TopSellerResponse(BaseModel):
+    book_id: int
     title: str
-    total_sold: int
\ No newline at end of file
+    total_sold: int
+
+class CacheStatsResponse(BaseModel):
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
+
+class ResultCacheStatsResponse(BaseModel):
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int        # 직접 계산한 횟수
+    coalesced: int     # 진행 중인 같은 계산을 기다려서 받은 횟수
+    in_flight: int
+    hit_ratio: float
+
+class LatencyStats(BaseModel):
+    count: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+class JobQueueStatsResponse(BaseModel):
+    workers: int
+    depth: Dict[str, int]          # 상태별 작업 수 (PENDING이 큐 깊이)
+    oldest_pending_seconds: float  # 가장 오래 기다린 대기 작업의 경과 시간
+    succeeded: int
+    retried: int
+    failed: int
+    wait_time: LatencyStats        # 등록 -> 실행 시작
+    run_time: LatencyStats         # 실행 시작 -> 종료
+
+class AnalyticsSummary(BaseModel):
+    order_count: int
+    revenue: float
+    avg_order_value: float
+
+class CategoryRevenue(BaseModel):
+    category: str
+    revenue: float
+    quantity: int
+
+class OrderValueBucket(BaseModel):
+    min: int
+    max: Optional[int] = None  # 마지막 구간은 상한 없음
+    count: int
+
+class WeeklyRevenue(BaseModel):
+    week_start: str                # 주 시작일 (월요일)
+    revenue: float
+    order_count: int
+    growth: Optional[float] = None # 전주 대비 증감률 (0.1 = 10% 증가)
+
+class RevenueAnalyticsResponse(BaseModel):
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+    summary: AnalyticsSummary
+    revenue_by_category: List[CategoryRevenue]
+    order_value_distribution: List[OrderValueBucket]
+    order_value_percentiles: Dict[str, float]  # p50, p75, p90, p99
+    basket_size: Dict[str, float]              # 주문당 총 수량: mean, p50, p75, p90, p99
+    weekly: List[WeeklyRevenue]
@@ -0,0 +1,174 @@
+# app/services/autocomplete.py
+"""
+도서 제목/저자 자동완성용 인메모리 접두어(prefix) 색인.
+
+검색창은 키를 누를 때마다 요청을 보내므로 DB를 거치지 않고 메모리에서 바로 답합니다.
+
+- 정렬된 키 목록에서 이진 탐색(bisect)으로 접두어 범위를 찾고, 앞에서부터 limit개만 읽습니다.
+  (O(log n + limit) - 색인 크기와 거의 무관)
+- 키는 두 종류입니다.
+  1) 전체 문자열: "파이" -> "파이썬 입문"
+  2) 단어 시작 위치부터의 문자열: "입문" -> "파이썬 입문"
+  1)을 먼저 채우고, 모자라면 2)로 채웁니다.
+- 같은 제목/저자가 여러 도서에 있으면 제안은 하나만 나오고, 마지막 도서가 삭제될 때 빠집니다.
+
+색인은 첫 요청 시 DB에서 한 번 적재되고, 이후에는 도서 등록/수정/삭제가 직접 갱신합니다.
+(search.py의 역색인과 같은 방식)
+"""
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.services.taxonomy import split_names
+
+# (종류, 표시 문자열) 예: ("title", "파이썬 입문"), ("author", "홍길동")
+Suggestion = Tuple[str, str]
+
+
+def normalize(text: str) -> str:
+    """대소문자/연속 공백 차이를 무시하기 위한 정규화"""
+    return " ".join(text.casefold().split())
+
+
+def _word_start_keys(norm: str) -> List[str]:
+    """첫 단어를 제외한 각 단어 시작 위치부터의 부분 문자열"""
+    keys = []
+    for pos, char in enumerate(norm):
+        if char == " " and pos + 1 < len(norm):
+            keys.append(norm[pos + 1:])
+    return keys
+
+
+class AutocompleteIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        # 정렬된 (키, 종류, 표시 문자열) 목록 - 전체 문자열 키 / 단어 시작 키
+        self._full_keys: List[Tuple[str, str, str]] = []
+        self._word_keys: List[Tuple[str, str, str]] = []
+        # 같은 제안을 가진 도서 수 (0이 되면 키 제거)
+        self._refcount: Dict[Suggestion, int] = {}
+        # 삭제/수정 시 기존 제안을 지우기 위한 역참조
+        self._doc_suggestions: Dict[int, Set[Suggestion]] = {}
+
+    # ---------- 적재 / 동기화 ----------
+
+    def ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load(db)
+
+    def reload(self, db: Session) -> None:
+        with self._lock:
+            self._full_keys.clear()
+            self._word_keys.clear()
+            self._refcount.clear()
+            self._doc_suggestions.clear()
+            self._loaded = False
+            self._load(db)
+
+    def _load(self, db: Session) -> None:
+        # 한 건씩 insort 하지 않고 모아서 한 번에 정렬
+        for row in db.query(Book.id, Book.title, Book.authors).yield_per(1000):
+            suggestions = self._suggestions_of(row.title, row.authors)
+            self._doc_suggestions[row.id] = suggestions
+            for suggestion in suggestions:
+                count = self._refcount.get(suggestion, 0)
+                self._refcount[suggestion] = count + 1
+                if count == 0:
+                    full_key, word_keys = self._keys_of(suggestion)
+                    self._full_keys.append(full_key)
+                    self._word_keys.extend(word_keys)
+        self._full_keys.sort()
+        self._word_keys.sort()
+        self._loaded = True
+
+    def add(self, book) -> None:
+        """도서 등록/수정 시 호출 (id, title, authors 속성만 사용, 기존 항목은 교체)"""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._unindex(book.id)
+            suggestions = self._suggestions_of(book.title, book.authors)
+            self._doc_suggestions[book.id] = suggestions
+            for suggestion in suggestions:
+                count = self._refcount.get(suggestion, 0)
+                self._refcount[suggestion] = count + 1
+                if count == 0:
+                    full_key, word_keys = self._keys_of(suggestion)
+                    insort(self._full_keys, full_key)
+                    for key in word_keys:
+                        insort(self._word_keys, key)
+
+    def remove(self, book_id: int) -> None:
+        """도서 삭제 시 호출"""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._unindex(book_id)
+
+    def _unindex(self, book_id: int) -> None:
+        for suggestion in self._doc_suggestions.pop(book_id, ()):
+            count = self._refcount.get(suggestion, 0) - 1
+            if count > 0:
+                self._refcount[suggestion] = count
+                continue
+            self._refcount.pop(suggestion, None)
+            full_key, word_keys = self._keys_of(suggestion)
+            self._discard(self._full_keys, full_key)
+            for key in word_keys:
+                self._discard(self._word_keys, key)
+
+    @staticmethod
+    def _discard(keys: List[Tuple[str, str, str]], key: Tuple[str, str, str]) -> None:
+        pos = bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            del keys[pos]
+
+    @staticmethod
+    def _suggestions_of(title: Optional[str], authors: Optional[str]) -> Set[Suggestion]:
+        suggestions = set()
+        if title and title.strip():
+            suggestions.add(("title", " ".join(title.split())))
+        for name in split_names(authors):
+            suggestions.add(("author", name))
+        return suggestions
+
+    @staticmethod
+    def _keys_of(suggestion: Suggestion):
+        kind, text = suggestion
+        norm = normalize(text)
+        return (norm, kind, text), [(key, kind, text) for key in _word_start_keys(norm)]
+
+    # ---------- 조회 ----------
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """prefix로 시작하는 제안을 최대 limit개 (전체 문자열 일치 우선, 그다음 단어 시작 일치)"""
+        norm = normalize(prefix)
+        if not norm:
+            return []
+        with self._lock:
+            results: List[Suggestion] = []
+            seen: Set[Suggestion] = set()
+            for keys in (self._full_keys, self._word_keys):
+                pos = bisect_left(keys, (norm,))
+                while pos < len(keys) and len(results) < limit:
+                    key, kind, text = keys[pos]
+                    if not key.startswith(norm):
+                        break
+                    if (kind, text) not in seen:
+                        seen.add((kind, text))
+                        results.append((kind, text))
+                    pos += 1
+                if len(results) >= limit:
+                    break
+            return results
+
+
+# 앱 전체에서 공유하는 색인 인스턴스
+autocomplete_index = AutocompleteIndex()
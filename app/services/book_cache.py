@@ -0,0 +1,66 @@
+# app/services/book_cache.py
+"""
+도서 단건 read-through 캐시.
+
+상세 조회, 장바구니 담기, 리뷰 작성, 좋아요는 매번 같은 Book 행을 id로 다시 읽습니다.
+자주 보는 도서(hot set)는 작으므로, 컬럼 값 스냅샷(dict)을 LRU + TTL 캐시에 두고
+DB 왕복 없이 응답합니다.
+
+- ORM 객체는 세션이 끝나면 쓸 수 없으므로 컬럼 값만 복사해서 저장합니다.
+- 도서 수정/삭제 API가 해당 id를 무효화합니다.
+  다른 프로세스에서의 변경은 TTL(BOOK_CACHE_TTL_SECONDS)이 지나면 반영됩니다.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.book import Book
+
+book_cache = LRUCache(
+    max_entries=settings.BOOK_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.BOOK_CACHE_TTL_SECONDS,
+)
+
+_COLUMNS = [column.key for column in Book.__table__.columns]
+
+
+def snapshot(book: Book) -> Dict[str, Any]:
+    """Book 객체 -> 컬럼 값 dict (BookResponse로 그대로 검증 가능)"""
+    return {key: getattr(book, key) for key in _COLUMNS}
+
+
+def get_book(db: Session, book_id: int) -> Optional[Dict[str, Any]]:
+    """캐시에서 도서 스냅샷을 찾고, 없으면 DB에서 읽어 저장. 없는 도서면 None"""
+    def load():
+        book = db.query(Book).filter(Book.id == book_id).first()
+        return snapshot(book) if book else None
+
+    cached = book_cache.get_or_load(book_id, load)
+    # 호출한 쪽에서 값을 바꿔도 캐시가 오염되지 않도록 복사본 반환
+    return dict(cached) if cached is not None else None
+
+
+def get_books(db: Session, book_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """여러 도서를 한 번에: 캐시에 없는 것만 IN 쿼리 한 번으로 읽어서 저장. {id: 스냅샷} (없는 id는 빠짐)"""
+    result: Dict[int, Dict[str, Any]] = {}
+    missing = []
+    for book_id in book_ids:
+        cached = book_cache.get(book_id)
+        if cached is not None:
+            result[book_id] = dict(cached)
+        else:
+            missing.append(book_id)
+    if missing:
+        generation = book_cache.generation()
+        for book in db.query(Book).filter(Book.id.in_(missing)).all():
+            data = snapshot(book)
+            book_cache.set(book.id, data, generation)
+            result[book.id] = dict(data)
+    return result
+
+
+def invalidate_book(book_id: int) -> None:
+    """도서 수정/삭제 시 호출"""
+    book_cache.invalidate(book_id)
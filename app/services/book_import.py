@@ -0,0 +1,200 @@
+# app/services/book_import.py
+"""
+도서 대량 등록 (CSV / NDJSON).
+
+업로드 파일을 한 줄씩 읽으면서 chunk_size 행마다 다음을 처리합니다.
+1. BookCreate로 행 검증 (실패한 행은 오류 목록에 기록하고 건너뜀)
+2. 파일 안에서 중복된 ISBN은 처음 나온 행만 사용
+3. 이미 등록된 ISBN을 IN 쿼리 한 번으로 확인
+   - insert 모드: 오류로 기록
+   - upsert 모드: 한 문장의 INSERT ... ON CONFLICT/ON DUPLICATE KEY UPDATE로 갱신
+     (행에 실제로 있는 필드만 갱신 - 생략한 필드가 기본값으로 덮이지 않도록)
+4. 다중 행 INSERT 한 번 -> 저자/카테고리 연결 -> 검색 색인/캐시 갱신 -> commit
+
+파일 전체를 메모리에 올리지 않으므로 행 수와 상관없이 메모리 사용량이 일정합니다.
+"""
+import csv
+import json
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.upsert import upsert
+from app.models.book import Book
+from app.schemas.book import BookCreate
+from app.services.book_cache import invalidate_book
+from app.services.catalog import bump_catalog_version
+from app.services.count_cache import book_count_cache
+from app.services.search import search_index
+from app.services.autocomplete import autocomplete_index
+from app.services.taxonomy import link_books
+
+# 업로드 파일의 각 레코드: (행 번호, dict) 또는 (행 번호, 파싱 오류 메시지)
+Record = Tuple[int, Any]
+
+# 검증을 통과한 행: (행 번호, BookCreate 값 전체, 행에 실제로 있던 필드 이름)
+ValidRow = Tuple[int, Dict[str, Any], FrozenSet[str]]
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Record]:
+    """첫 줄은 헤더. 빈 값은 생략된 것으로 취급 (선택 필드 기본값 적용)"""
+    for row_no, row in enumerate(csv.DictReader(lines), start=1):
+        yield row_no, {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[Record]:
+    """한 줄에 JSON 객체 하나. 빈 줄은 건너뜀"""
+    row_no = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            obj = json.loads(line)
+        except ValueError as e:
+            yield row_no, f"JSON 형식 오류: {e}"
+            continue
+        if not isinstance(obj, dict):
+            yield row_no, "JSON 객체가 아닙니다."
+            continue
+        yield row_no, obj
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(x) for x in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+class BookImporter:
+    def __init__(self, db: Session, upsert_existing: bool, chunk_size: Optional[int] = None):
+        self.db = db
+        self.upsert_existing = upsert_existing
+        self.chunk_size = chunk_size or settings.BOOK_IMPORT_CHUNK_SIZE
+        self.total = 0
+        self.inserted = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        # 파일 전체에서 이미 처리한 ISBN (파일 내 중복 검출용)
+        self._seen_isbns = set()
+
+    def _error(self, row_no: int, isbn: Optional[str], message: str) -> None:
+        self.failed += 1
+        # 오류가 아주 많은 파일에서도 응답이 끝없이 커지지 않도록 앞부분만 상세히 보고
+        if len(self.errors) < settings.BOOK_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row_no, "isbn": isbn, "message": message})
+
+    def run(self, records: Iterable[Record]) -> Dict[str, Any]:
+        chunk: List[ValidRow] = []
+        for row_no, record in records:
+            self.total += 1
+            if isinstance(record, str):
+                self._error(row_no, None, record)
+                continue
+            try:
+                parsed = BookCreate.model_validate(record)
+            except ValidationError as e:
+                isbn = record.get("isbn")
+                self._error(row_no, str(isbn) if isbn is not None else None, _format_validation_error(e))
+                continue
+            book = parsed.model_dump()
+            if book["isbn"] in self._seen_isbns:
+                self._error(row_no, book["isbn"], "파일 안에 같은 ISBN이 이미 있습니다.")
+                continue
+            self._seen_isbns.add(book["isbn"])
+            chunk.append((row_no, book, frozenset(parsed.model_fields_set)))
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+        self._flush(chunk)
+        return self.report()
+
+    def _flush(self, chunk: List[ValidRow]) -> None:
+        if not chunk:
+            return
+        db = self.db
+        isbns = [book["isbn"] for _, book, _ in chunk]
+        existing = {
+            row.isbn: row.id
+            for row in db.query(Book.id, Book.isbn).filter(Book.isbn.in_(isbns))
+        }
+
+        if self.upsert_existing:
+            rows = [book for _, book, _ in chunk]
+            # 기존 도서는 행에 있던 필드만 갱신 (갱신할 필드 조합별로 한 문장씩, 보통은 1개)
+            groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            for _, book, fields in chunk:
+                update_columns = tuple(key for key in book if key in fields and key != "isbn")
+                groups.setdefault(update_columns, []).append(book)
+            for update_columns, group in groups.items():
+                upsert(db, Book.__table__, group, ["isbn"], list(update_columns), {"updated_at": func.now()})
+            self.updated += len(existing)
+            self.inserted += len(rows) - len(existing)
+        else:
+            pending = []
+            for row_no, book, _ in chunk:
+                if book["isbn"] in existing:
+                    self._error(row_no, book["isbn"], "이미 등록된 ISBN입니다.")
+                else:
+                    pending.append((row_no, book))
+            pending = self._insert_new(pending)
+            if not pending:
+                return
+            rows = [book for _, book in pending]
+            self.inserted += len(rows)
+
+        # 새 id를 알기 위해 한 번 더 조회 (MySQL은 다중 행 INSERT ... RETURNING 미지원)
+        written = (
+            db.query(Book.id, Book.title, Book.authors, Book.categories)
+            .filter(Book.isbn.in_([book["isbn"] for book in rows]))
+            .all()
+        )
+        link_books(db, written)
+        bump_catalog_version(db)
+        db.commit()
+
+        for row in written:
+            search_index.add(row)
+            autocomplete_index.add(row)
+        for book_id in existing.values():
+            invalidate_book(book_id)
+        book_count_cache.invalidate()
+
+    def _insert_new(self, pending: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        다중 행 INSERT 한 번. 확인 직후 다른 요청이 같은 ISBN을 넣어 충돌하면
+        chunk를 롤백하고 그 ISBN들을 오류로 기록한 뒤 나머지만 다시 넣음. 실제로 넣은 행 반환
+        """
+        db = self.db
+        while pending:
+            try:
+                db.execute(insert(Book.__table__).values([book for _, book in pending]))
+                return pending
+            except IntegrityError:
+                db.rollback()
+                taken = {
+                    isbn for (isbn,) in
+                    db.query(Book.isbn).filter(Book.isbn.in_([book["isbn"] for _, book in pending]))
+                }
+                if not taken:
+                    raise
+                for row_no, book in pending:
+                    if book["isbn"] in taken:
+                        self._error(row_no, book["isbn"], "이미 등록된 ISBN입니다.")
+                pending = [(row_no, book) for row_no, book in pending if book["isbn"] not in taken]
+        return pending
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errorsTruncated": self.failed > len(self.errors),
+        }
@@ -0,0 +1,59 @@
+# app/services/catalog.py
+"""
+카탈로그 버전 관리.
+
+목록 응답은 여러 도서를 담고 있어서 개별 updated_at으로는 변경 여부를 알 수 없습니다.
+대신 도서 쓰기마다 catalog_version 행을 1 올려 두고, 목록 ETag에 이 버전을 넣습니다.
+버전 확인은 PK 조회 한 번이라 목록 쿼리/COUNT/직렬화보다 훨씬 쌉니다.
+
+버전은 두 행으로 나눕니다.
+- 카탈로그 버전 (id=1): 도서 등록/수정/삭제/가져오기. 목록 ETag + 패싯 캐시 키
+- 도서 통계 버전 (id=2): 주문/취소의 재고 변경, 리뷰의 평점 집계 변경. 목록 ETag만 사용
+  (패싯은 재고/평점과 무관하므로 주문이나 리뷰가 들어와도 패싯 캐시는 그대로 유지)
+"""
+from typing import Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insert_ignore
+from app.models.catalog import CatalogVersion
+
+CATALOG_ROW_ID = 1
+BOOK_STATS_ROW_ID = 2
+
+
+def get_listing_versions(db: Session) -> Tuple[int, int]:
+    """목록 ETag용 (카탈로그 버전, 도서 통계 버전) - 한 번의 조회로 두 행을 읽음"""
+    versions = dict(
+        db.query(CatalogVersion.id, CatalogVersion.version)
+        .filter(CatalogVersion.id.in_([CATALOG_ROW_ID, BOOK_STATS_ROW_ID]))
+        .all()
+    )
+    return versions.get(CATALOG_ROW_ID, 0), versions.get(BOOK_STATS_ROW_ID, 0)
+
+
+def _bump(db: Session, row_id: int) -> None:
+    result = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == row_id)
+        .values(version=CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        # 첫 쓰기: 행이 없으면 만들고 (동시에 만들어졌으면 무시) 다시 증가
+        insert_ignore(db, CatalogVersion.__table__, [{"id": row_id, "version": 0}])
+        db.execute(
+            update(CatalogVersion)
+            .where(CatalogVersion.id == row_id)
+            .values(version=CatalogVersion.version + 1)
+        )
+
+
+def bump_catalog_version(db: Session) -> None:
+    """도서 쓰기와 같은 트랜잭션 안에서 호출 (commit은 호출한 쪽에서)"""
+    _bump(db, CATALOG_ROW_ID)
+
+
+def bump_book_stats_version(db: Session) -> None:
+    """재고/평점 집계 변경과 같은 트랜잭션 안에서 호출 (commit은 호출한 쪽에서). 패싯 캐시는 유지"""
+    _bump(db, BOOK_STATS_ROW_ID)
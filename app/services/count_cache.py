@@ -0,0 +1,84 @@
+# app/services/count_cache.py
+"""
+도서 목록 totalElements 캐시.
+
+목록 조회마다 전체 필터 결과에 COUNT(*)를 돌리면 페이지 쿼리만큼 DB 작업이 더 듭니다.
+정규화된 필터(검색어, 카테고리)를 키로 개수를 저장해 두고,
+도서 등록/수정/삭제 시 전체를 무효화합니다.
+
+무효화는 같은 프로세스 안의 쓰기만 알 수 있으므로, 다른 프로세스의 변경은
+TTL(BOOK_COUNT_CACHE_TTL_SECONDS)이 지나면 반영됩니다.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.services.search import tokenize
+
+CountKey = Tuple[str, str]
+
+
+def make_count_key(keyword: Optional[str], category: Optional[str]) -> CountKey:
+    """같은 결과를 내는 필터가 같은 키를 갖도록 정규화 (검색어는 토큰 순서/대소문자, 카테고리는 앞뒤 공백 무시)"""
+    return (" ".join(sorted(set(tokenize(keyword)))), (category or "").strip())
+
+
+class CountCache:
+    def __init__(self, ttl_seconds: int, max_entries: int = 1024):
+        self._lock = threading.Lock()
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        # key -> (개수, 만료 시각)
+        self._entries: Dict[CountKey, Tuple[int, float]] = {}
+        # 무효화될 때마다 증가. 계산 도중 무효화되면 오래된 값을 저장하지 않기 위해 사용
+        self._generation = 0
+
+    def get(self, key: CountKey) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            count, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return count
+
+    def get_or_compute(self, key: CountKey, compute: Callable[[], int]) -> int:
+        """캐시에 있으면 그대로, 없으면 compute()로 계산해서 저장"""
+        count = self.get(key)
+        if count is not None:
+            return count
+        with self._lock:
+            generation = self._generation
+        count = compute()
+        self._store(key, count, generation)
+        return count
+
+    def refresh(self, key: CountKey, compute: Callable[[], int]) -> int:
+        """캐시를 무시하고 새로 계산한 값으로 갱신"""
+        with self._lock:
+            generation = self._generation
+        count = compute()
+        self._store(key, count, generation)
+        return count
+
+    def _store(self, key: CountKey, count: int, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                # 가장 먼저 들어온 항목부터 제거 (dict는 삽입 순서 유지)
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (count, time.monotonic() + self._ttl)
+
+    def invalidate(self) -> None:
+        """도서 등록/수정/삭제 시 호출"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+# 앱 전체에서 공유하는 캐시 인스턴스
+book_count_cache = CountCache(ttl_seconds=settings.BOOK_COUNT_CACHE_TTL_SECONDS)
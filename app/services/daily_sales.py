@@ -0,0 +1,97 @@
+# app/services/daily_sales.py
+"""
+일별 매출 집계 (daily_sales) 유지.
+
+- 주문 생성/취소 시 작업 큐 핸들러가 해당 날짜 행에 금액/건수를 더하거나 뺍니다.
+  (upsert 한 문장. 체크아웃 트랜잭션에서 하면 그날 모든 주문이 같은 행 잠금을 기다리므로 큐에서 처리)
+- rebuild_daily_sales()는 orders에서 기간 전체를 다시 집계합니다. (최초 적재/불일치 복구)
+  재계산에 포함된 주문의 대기 중 집계 작업은 같은 트랜잭션에서 완료 처리해 두 번 더해지지 않게 합니다.
+- 날짜는 orders.created_at이 저장된 값 그대로의 날짜 (기존 GROUP BY date(created_at)과 같음)
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.order import Order, OrderStatus
+from app.models.sales import DailySales
+from app.services.jobs import mark_jobs_done, pending_jobs
+from app.services.pagination import date_range_filter
+
+# 주문 생성/취소 시 등록되는 집계 작업 종류 (app/services/order_jobs.py)
+DAILY_SALES_JOB = "sales.daily"
+
+
+def _as_date(value) -> date:
+    # SQLite의 date()는 문자열을 돌려줌
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def apply_order(db: Session, order_id: int, sign: int) -> None:
+    """주문 하나를 집계에 반영 (sign=1: 생성, sign=-1: 취소). commit은 호출한 쪽에서"""
+    order = db.query(Order.created_at, Order.total_price).filter(Order.id == order_id).first()
+    if order is None:
+        return
+    upsert(
+        db, DailySales.__table__,
+        [{"sales_date": order.created_at.date(), "total_sales": order.total_price * sign, "order_count": sign}],
+        conflict_columns=["sales_date"],
+        update_columns=[],
+        extra_updates={"updated_at": func.now()},
+        increment_columns=["total_sales", "order_count"],
+    )
+
+
+def rebuild_daily_sales(db: Session, from_date: Optional[date] = None, to_date: Optional[date] = None) -> int:
+    """
+    기간(없으면 전체)의 집계를 orders에서 다시 계산해 덮어씀. 만든 행 수 반환.
+    집계 행을 먼저 지워 쓰기 잠금을 잡은 뒤, 대기 중 작업과 주문을 같은 시점 기준으로 읽고
+    재계산에 포함된 주문의 대기 작업을 같은 트랜잭션에서 완료 처리합니다.
+    (그 이후에 들어온 주문은 재계산에 없고 작업도 남아 있으므로 워커가 정상적으로 반영)
+    """
+    delete_query = db.query(DailySales)
+    if from_date:
+        delete_query = delete_query.filter(DailySales.sales_date >= from_date)
+    if to_date:
+        delete_query = delete_query.filter(DailySales.sales_date <= to_date)
+    delete_query.delete(synchronize_session=False)
+
+    jobs = pending_jobs(db, DAILY_SALES_JOB)
+    in_range = date_range_filter(Order.created_at, from_date, to_date, db.get_bind().dialect.name)
+    sales_date = func.date(Order.created_at)
+    rows = db.execute(
+        select(sales_date, func.sum(Order.total_price), func.count(Order.id))
+        .where(Order.status != OrderStatus.CANCELED, *in_range)
+        .group_by(sales_date)
+    ).all()
+    if rows:
+        db.execute(insert(DailySales), [
+            {"sales_date": _as_date(day), "total_sales": total, "order_count": count}
+            for day, total, count in rows
+        ])
+
+    # 기간 밖 주문의 작업은 이번 재계산과 무관하므로 그대로 둠
+    order_ids = list({payload["order_id"] for _, payload in jobs})
+    covered = set(order_ids)
+    if in_range:
+        covered = set()
+        for start in range(0, len(order_ids), 500):
+            covered.update(
+                order_id for (order_id,) in
+                db.query(Order.id).filter(Order.id.in_(order_ids[start:start + 500]), *in_range)
+            )
+    mark_jobs_done(db, [job_id for job_id, payload in jobs if payload["order_id"] in covered])
+    db.commit()
+    return len(rows)
+
+
+def read_daily_sales(db: Session, from_date: Optional[date] = None, to_date: Optional[date] = None) -> List[DailySales]:
+    """기간 내 집계 행 (날짜 오름차순, 주문이 모두 취소된 날은 제외)"""
+    query = db.query(DailySales).filter(DailySales.order_count > 0)
+    if from_date:
+        query = query.filter(DailySales.sales_date >= from_date)
+    if to_date:
+        query = query.filter(DailySales.sales_date <= to_date)
+    return query.order_by(DailySales.sales_date).all()
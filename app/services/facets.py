@@ -0,0 +1,86 @@
+# app/services/facets.py
+"""
+도서 검색 패싯(facet): 카테고리별 개수 + 가격 구간별 개수.
+
+검색 화면 옆의 "IT (12) / 소설 (3)" 같은 숫자를 위해 카테고리마다 목록 조회를 반복하지 않고,
+현재 검색어 조건에서 두 집계를 UNION ALL로 묶어 쿼리 한 번에 계산합니다.
+(카테고리 집계는 (category_id, book_id) 인덱스, 가격 집계는 books 테이블을 사용)
+검색 결과가 SEARCH_ID_BATCH_SIZE개를 넘으면 id를 나눠서 집계한 뒤 더합니다. (개수는 서로 겹치지 않는 묶음끼리 합산 가능)
+
+결과는 (카탈로그 버전, 검색어) 키로 캐시합니다. 도서가 바뀌면 카탈로그 버전이 올라가므로
+별도의 무효화 없이 다른 프로세스에서의 변경도 바로 반영됩니다.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import String, case, cast, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.book import Book, Category, book_categories
+
+facet_cache = LRUCache(max_entries=256, ttl_seconds=settings.BOOK_FACET_CACHE_TTL_SECONDS)
+
+
+def _price_buckets(bounds: List[int]) -> List[Dict[str, Optional[int]]]:
+    """경계값 [a, b, c] -> [0, a), [a, b), [b, c), [c, 무한)"""
+    edges = [0] + list(bounds)
+    buckets = [{"min": lo, "max": hi} for lo, hi in zip(edges, edges[1:])]
+    buckets.append({"min": edges[-1], "max": None})
+    return buckets
+
+
+def compute_facets(db: Session, book_ids: Optional[List[int]]) -> Dict[str, Any]:
+    """book_ids가 None이면 전체 도서, 아니면 해당 도서들에 대한 패싯 (id 묶음마다 쿼리 한 번)"""
+    bounds = sorted(settings.BOOK_PRICE_FACET_BOUNDARIES)
+    price_bucket = case(
+        *[(Book.price < bound, index) for index, bound in enumerate(bounds)],
+        else_=len(bounds),
+    )
+
+    category_q = (
+        select(literal("category").label("kind"), Category.name.label("key"), func.count().label("cnt"))
+        .select_from(book_categories)
+        .join(Category, Category.id == book_categories.c.category_id)
+        .group_by(Category.name)
+    )
+    price_q = (
+        select(literal("price").label("kind"), cast(price_bucket, String).label("key"), func.count().label("cnt"))
+        .select_from(Book)
+        .where(Book.price.is_not(None))
+        .group_by(price_bucket)
+    )
+    if book_ids is None:
+        statements = [union_all(category_q, price_q)]
+    else:
+        batch = settings.SEARCH_ID_BATCH_SIZE
+        statements = [
+            union_all(
+                category_q.where(book_categories.c.book_id.in_(book_ids[start:start + batch])),
+                price_q.where(Book.id.in_(book_ids[start:start + batch])),
+            )
+            for start in range(0, len(book_ids), batch)
+        ]
+
+    category_counts: Dict[str, int] = {}
+    buckets = _price_buckets(bounds)
+    for bucket in buckets:
+        bucket["count"] = 0
+    for statement in statements:
+        for row in db.execute(statement):
+            if row.kind == "category":
+                category_counts[row.key] = category_counts.get(row.key, 0) + int(row.cnt)
+            else:
+                buckets[int(row.key)]["count"] += int(row.cnt)
+
+    categories = [{"name": name, "count": count} for name, count in category_counts.items()]
+    categories.sort(key=lambda c: (-c["count"], c["name"]))
+    return {"categories": categories, "priceBuckets": buckets}
+
+
+def get_facets(db: Session, catalog_version: int, keyword_key: str, book_ids: Optional[List[int]]) -> Dict[str, Any]:
+    """(카탈로그 버전, 정규화된 검색어) 단위로 캐시된 패싯"""
+    return facet_cache.get_or_load(
+        (catalog_version, keyword_key),
+        lambda: compute_facets(db, book_ids),
+    )
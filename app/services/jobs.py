@@ -0,0 +1,311 @@
+# app/services/jobs.py
+"""
+DB 테이블 기반 작업 큐 + 워커 풀.
+
+주문 API는 주문을 저장하면서 같은 트랜잭션에 후처리 작업(jobs 행)만 남기고 바로 응답합니다.
+알림, 통계 집계 같은 후처리는 백그라운드 워커가 꺼내서 실행하므로
+후처리가 느리거나 실패해도 주문 응답 시간에는 영향이 없습니다.
+
+- enqueue(db, kind, payload): 호출한 쪽의 commit과 함께 저장 (주문이 롤백되면 작업도 사라짐)
+- 워커는 "대기 중 + 실행 시각 도래" 작업 중 가장 오래된 것을 조건부 UPDATE로 가져갑니다.
+  (PENDING -> RUNNING 이 성공한 워커만 실행하므로 프로세스가 여러 개여도 한 번만 실행)
+- 핸들러의 DB 변경과 완료 표시는 같은 트랜잭션으로 commit
+- 실패 시 지수 백오프(base * 2^(시도-1), 최대 max)로 다시 예약, 최대 시도 횟수를 넘으면 FAILED
+- 큐 깊이(상태별 개수)와 대기/실행 시간 분포는 stats()로 확인
+- 집계를 원본에서 다시 계산할 때는 pending_jobs()/mark_jobs_done()으로 이미 반영된 대기 작업을 함께 정리
+- 캐시 무효화처럼 commit된 뒤에 해야 하는 일은 핸들러에서 after_commit()으로 등록 (실패/롤백 시 실행 안 함)
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# 핸들러: (같은 트랜잭션의 세션, payload) -> None. 예외를 던지면 재시도
+Handler = Callable[[Session, Dict[str, Any]], None]
+
+
+# Session.info에 commit 후 실행할 함수 목록을 담아 두는 키 (after_commit)
+_AFTER_COMMIT = "job_after_commit"
+
+
+def utcnow() -> datetime:
+    """jobs 테이블에 기록하는 시각 (timezone 없는 UTC)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def enqueue(db: Session, kind: str, payload: Dict[str, Any]) -> Job:
+    """작업 추가 (commit은 호출한 쪽에서). commit 후 job_queue.notify()를 부르면 워커가 바로 깨어남"""
+    now = utcnow()
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload, separators=(",", ":")),
+        status=JobStatus.PENDING,
+        attempts=0,
+        run_at=now,
+        created_at=now,
+    )
+    db.add(job)
+    return job
+
+
+def pending_jobs(db: Session, kind: str) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    kind의 대기 중 작업 [(id, payload)]. 집계를 원본에서 다시 계산할 때,
+    재계산에 이미 포함된 주문의 작업을 골라 mark_jobs_done()으로 넘기기 위해 사용.
+    같은 종류의 작업이 실행 중이면(워커 동작 중) 결과가 어긋나므로 RuntimeError
+    """
+    running = db.query(func.count(Job.id)).filter(Job.kind == kind, Job.status == JobStatus.RUNNING).scalar()
+    if running:
+        raise RuntimeError(f"실행 중인 {kind} 작업이 있습니다. 작업 큐 워커를 멈춘 뒤 다시 실행하세요.")
+    rows = db.query(Job.id, Job.payload).filter(Job.kind == kind, Job.status == JobStatus.PENDING).order_by(Job.id)
+    return [(job_id, json.loads(payload)) for job_id, payload in rows]
+
+
+def mark_jobs_done(db: Session, job_ids: List[int]) -> None:
+    """대기 중 작업을 실행하지 않고 완료 처리 (commit은 호출한 쪽에서). 그 사이 워커가 가져갔으면 RuntimeError"""
+    now = utcnow()
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start:start + 500]
+        updated = db.execute(
+            update(Job)
+            .where(Job.id.in_(chunk), Job.status == JobStatus.PENDING)
+            .values(status=JobStatus.DONE, finished_at=now, last_error="집계 재계산에 포함되어 건너뜀")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if updated != len(chunk):
+            raise RuntimeError("재계산 도중 워커가 작업을 가져갔습니다. 작업 큐 워커를 멈춘 뒤 다시 실행하세요.")
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    핸들러의 트랜잭션이 commit된 뒤 실행할 함수 등록 (예: 메모리 캐시 무효화).
+    commit 전에 무효화하면 동시에 들어온 조회가 아직 commit 안 된(보이지 않는) 데이터로 캐시를 다시 채울 수 있음
+    """
+    db.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+def _percentiles(values: Deque[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "count": len(ordered),
+        "p50_ms": round(pick(0.5) * 1000, 2),
+        "p95_ms": round(pick(0.95) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+class JobQueue:
+    def __init__(self):
+        self._handlers: Dict[str, Handler] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._workers: List[threading.Thread] = []
+        # 최근 작업들의 대기 시간(생성 -> 시작)과 실행 시간(시작 -> 종료), 초 단위
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+        self._run_times: Deque[float] = deque(maxlen=1000)
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        # 마지막으로 RUNNING에 멈춘 작업을 되살린 시각 (time.monotonic)
+        self._last_recovery = 0.0
+
+    # ---------- 핸들러 등록 ----------
+
+    def handler(self, kind: str) -> Callable[[Handler], Handler]:
+        """@job_queue.handler("order.notify") 형태로 작업 종류별 핸들러 등록"""
+        def register(fn: Handler) -> Handler:
+            self._handlers[kind] = fn
+            return fn
+        return register
+
+    # ---------- 워커 풀 ----------
+
+    def start(self, workers: Optional[int] = None) -> None:
+        workers = settings.JOB_WORKERS if workers is None else workers
+        with self._lock:
+            if self._workers or workers <= 0:
+                return
+            self._stopping.clear()
+            self._recover_stale()
+            self._last_recovery = time.monotonic()
+            for n in range(workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{n}", daemon=True)
+                thread.start()
+                self._workers.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in workers:
+            thread.join(timeout)
+
+    def notify(self) -> None:
+        """새 작업이 commit되었음을 알림 (폴링 주기를 기다리지 않고 바로 실행)"""
+        self._wakeup.set()
+
+    def _worker_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._maybe_recover_stale()
+                if self.run_one():
+                    continue
+            except Exception:
+                # DB 연결 오류 등으로 워커가 죽지 않도록 기록만 하고 다음 주기에 재시도
+                logger.exception("작업 큐 워커 오류")
+            self._wakeup.wait(settings.JOB_POLL_INTERVAL_SECONDS)
+            self._wakeup.clear()
+
+    def _maybe_recover_stale(self) -> None:
+        # 시작할 때뿐 아니라 동작 중에도 주기적으로 확인 (다른 프로세스가 죽거나 워커 스레드가 멈춰서
+        # RUNNING으로 남은 작업이 이 프로세스가 살아 있는 동안 영영 실행되지 않는 일이 없도록)
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_recovery < settings.JOB_STALE_CHECK_SECONDS:
+                return
+            self._last_recovery = now
+        self._recover_stale()
+
+    def _recover_stale(self) -> None:
+        """실행 중에 프로세스/워커가 종료되어 JOB_STALE_SECONDS 넘게 RUNNING으로 남은 작업을 다시 대기 상태로"""
+        db = SessionLocal()
+        try:
+            cutoff = utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+            db.execute(
+                update(Job)
+                .where(Job.status == JobStatus.RUNNING, Job.started_at < cutoff)
+                .values(status=JobStatus.PENDING, run_at=utcnow())
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    # ---------- 실행 ----------
+
+    def run_pending(self, limit: int = 1000) -> int:
+        """지금 실행 가능한 작업을 현재 스레드에서 처리 (스크립트/테스트용). 처리한 개수 반환"""
+        processed = 0
+        while processed < limit and self.run_one():
+            processed += 1
+        return processed
+
+    def run_one(self) -> bool:
+        """작업 하나를 가져와 실행. 실행할 작업이 없으면 False"""
+        db = SessionLocal()
+        try:
+            job = self._claim(db)
+            if job is None:
+                return False
+            self._execute(db, job)
+            return True
+        finally:
+            db.close()
+
+    def _claim(self, db: Session) -> Optional[Job]:
+        # 다른 워커가 먼저 가져가면 조건부 UPDATE가 0행이므로 다음 후보로 재시도
+        while True:
+            now = utcnow()
+            job_id = db.query(Job.id)\
+                .filter(Job.status == JobStatus.PENDING, Job.run_at <= now)\
+                .order_by(Job.run_at, Job.id)\
+                .limit(1)\
+                .scalar()
+            if job_id is None:
+                db.rollback()
+                return None
+            claimed = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.PENDING)
+                .values(status=JobStatus.RUNNING, started_at=now, attempts=Job.attempts + 1)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            if claimed:
+                return db.get(Job, job_id)
+
+    def _execute(self, db: Session, job: Job) -> None:
+        started = time.monotonic()
+        kind, job_id, attempts = job.kind, job.id, job.attempts
+        with self._lock:
+            self._wait_times.append(max(0.0, (job.started_at - job.created_at).total_seconds()))
+        try:
+            handler = self._handlers.get(kind)
+            if handler is None:
+                raise LookupError(f"등록되지 않은 작업 종류입니다: {kind}")
+            handler(db, json.loads(job.payload))
+            job.status = JobStatus.DONE
+            job.finished_at = utcnow()
+            job.last_error = None
+            db.commit()
+            for callback in db.info.pop(_AFTER_COMMIT, []):
+                # 이미 commit 되었으므로 후처리가 실패해도 작업을 다시 실행하지 않음 (집계가 두 번 반영되지 않도록)
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"작업 후처리 실패 (id={job_id}, kind={kind}): {e}")
+            with self._lock:
+                self.succeeded += 1
+        except Exception as e:
+            db.rollback()
+            # 롤백된 변경에 대한 후처리는 버림
+            db.info.pop(_AFTER_COMMIT, None)
+            job = db.get(Job, job_id)
+            job.last_error = f"{type(e).__name__}: {e}"[:2000]
+            if attempts >= settings.JOB_MAX_ATTEMPTS:
+                job.status = JobStatus.FAILED
+                job.finished_at = utcnow()
+                logger.error(f"작업 실패 (id={job_id}, kind={kind}, attempts={attempts}): {e}")
+            else:
+                delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+                job.status = JobStatus.PENDING
+                job.run_at = utcnow() + timedelta(seconds=delay)
+                logger.warning(f"작업 재시도 예약 (id={job_id}, kind={kind}, {delay}초 후): {e}")
+            db.commit()
+            with self._lock:
+                if job.status == JobStatus.FAILED:
+                    self.failed += 1
+                else:
+                    self.retried += 1
+        finally:
+            with self._lock:
+                self._run_times.append(time.monotonic() - started)
+
+    # ---------- 지표 ----------
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        depth = {status.value: 0 for status in JobStatus}
+        for status, count in db.query(Job.status, func.count(Job.id)).group_by(Job.status):
+            depth[JobStatus(status).value] = count
+        oldest = db.query(func.min(Job.created_at)).filter(Job.status == JobStatus.PENDING).scalar()
+        with self._lock:
+            return {
+                "workers": len(self._workers),
+                "depth": depth,
+                "oldest_pending_seconds": round((utcnow() - oldest).total_seconds(), 3) if oldest else 0.0,
+                "succeeded": self.succeeded,
+                "retried": self.retried,
+                "failed": self.failed,
+                "wait_time": _percentiles(self._wait_times),
+                "run_time": _percentiles(self._run_times),
+            }
+
+
+# 앱 전체에서 공유하는 작업 큐 (워커는 main.py lifespan에서 시작/종료)
+job_queue = JobQueue()
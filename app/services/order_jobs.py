@@ -0,0 +1,60 @@
+# app/services/order_jobs.py
+"""
+주문 후처리 작업 핸들러 (app/services/jobs.py의 워커가 실행).
+
+주문 API는 enqueue()만 하고, 아래 핸들러가 응답과 별개로 실행됩니다.
+작업 종류마다 따로 실행/재시도되므로 알림이 실패해도 집계는 반영됩니다.
+핸들러의 DB 변경은 완료 표시와 같은 트랜잭션으로 commit되므로 (실패한 시도는 롤백)
+금액/건수를 더하고 빼는 집계도 작업당 한 번만 반영됩니다.
+"""
+import logging
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from app.models.order import Order
+from app.services.daily_sales import DAILY_SALES_JOB, apply_order
+from app.services.jobs import enqueue, job_queue
+from app.services.top_sellers import TOP_SELLERS_JOB, apply_order_items
+
+logger = logging.getLogger(__name__)
+
+ORDER_NOTIFY = "order.notify"
+DAILY_SALES = DAILY_SALES_JOB
+TOP_SELLERS = TOP_SELLERS_JOB
+
+# 주문 생성/취소 때마다 등록하는 작업 종류
+ORDER_EVENT_JOBS = [ORDER_NOTIFY, DAILY_SALES, TOP_SELLERS]
+
+# 이벤트별 집계 증감 방향
+EVENT_SIGNS = {"created": 1, "canceled": -1}
+
+
+def enqueue_order_event(db: Session, order_id: int, event: str) -> None:
+    """주문 생성/취소와 같은 트랜잭션에서 후처리 작업 등록 (event: "created" | "canceled")"""
+    for kind in ORDER_EVENT_JOBS:
+        enqueue(db, kind, {"order_id": order_id, "event": event})
+
+
+@job_queue.handler(ORDER_NOTIFY)
+def notify_order(db: Session, payload: Dict[str, Any]) -> None:
+    """주문 알림 (외부 알림 연동 전까지는 로그로 남김)"""
+    order = db.get(Order, payload["order_id"])
+    if order is None:
+        return
+    logger.info(
+        f"주문 알림: order_id={order.id} user_id={order.user_id} "
+        f"event={payload['event']} total_price={order.total_price}"
+    )
+
+
+@job_queue.handler(DAILY_SALES)
+def rollup_daily_sales(db: Session, payload: Dict[str, Any]) -> None:
+    """일별 매출 집계 증감"""
+    apply_order(db, payload["order_id"], EVENT_SIGNS[payload["event"]])
+
+
+@job_queue.handler(TOP_SELLERS)
+def rollup_top_sellers(db: Session, payload: Dict[str, Any]) -> None:
+    """도서별 판매 수량 집계 증감 (판매 순위용)"""
+    apply_order_items(db, payload["order_id"], EVENT_SIGNS[payload["event"]])
@@ -0,0 +1,73 @@
+# app/services/pagination.py
+"""
+커서(Keyset) 페이지네이션 도우미.
+
+OFFSET 방식은 깊은 페이지일수록 앞의 행을 모두 건너뛰어야 하므로 느려집니다.
+커서 방식은 "마지막으로 본 행의 (정렬 값, id)" 다음부터 읽기 때문에
+페이지 깊이와 상관없이 인덱스 탐색 한 번으로 다음 페이지를 가져옵니다.
+
+커서는 클라이언트에게 불투명한(opaque) 문자열로 전달되며,
+내부적으로는 JSON을 URL-safe Base64로 인코딩한 값입니다.
+"""
+import base64
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import String, and_, literal, or_
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """dict -> 커서 문자열 (datetime/Decimal은 문자열로 변환)"""
+    def _default(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        raise TypeError(f"커서에 담을 수 없는 타입입니다: {type(value)!r}")
+
+    raw = json.dumps(payload, default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """커서 문자열 -> dict (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("잘못된 커서입니다.") from e
+    if not isinstance(payload, dict):
+        raise ValueError("잘못된 커서입니다.")
+    return payload
+
+
+def bind_value(value, dialect_name: str):
+    """DATETIME 컬럼과 비교할 값을 DB 저장 형식에 맞춰 바인딩 (keyset 조건, 기간 필터에서 사용)"""
+    # SQLite는 DATETIME을 문자열로 비교하는데, DB 기본값(CURRENT_TIMESTAMP)은 마이크로초 없이 저장됩니다.
+    # datetime 그대로 바인딩하면 ".000000"이 붙어 같은 값이 다르게 비교되므로 저장 형식에 맞춰 바인딩
+    if dialect_name == "sqlite" and isinstance(value, datetime):
+        return literal(value.isoformat(sep=" "), String)
+    return value
+
+
+def keyset_filter(column, id_column, value, last_id: int, descending: bool, dialect_name: str = ""):
+    """
+    (column, id) 순서로 정렬된 목록에서 (value, last_id) 다음 행들을 고르는 WHERE 조건.
+    행 값 비교 (col, id) < (:v, :id) 는 DB마다 인덱스 사용 여부가 달라 OR 형태로 풀어서 작성합니다.
+    """
+    bound = bind_value(value, dialect_name)
+    if descending:
+        return or_(column < bound, and_(column == bound, id_column < last_id))
+    return or_(column > bound, and_(column == bound, id_column > last_id))
+
+
+def date_range_filter(column, from_date: Optional[date], to_date: Optional[date], dialect_name: str = "") -> List:
+    """DATETIME 컬럼이 [from_date 0시, to_date 다음날 0시) 안에 있는 조건 목록 (양 끝 날짜 포함)"""
+    conditions = []
+    if from_date:
+        conditions.append(column >= bind_value(datetime.combine(from_date, time.min), dialect_name))
+    if to_date:
+        conditions.append(column < bind_value(datetime.combine(to_date + timedelta(days=1), time.min), dialect_name))
+    return conditions
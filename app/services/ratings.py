@@ -0,0 +1,54 @@
+# app/services/ratings.py
+"""
+도서별 리뷰 평점 집계 (books.rating_sum / rating_count / rating_avg).
+
+목록에서 평균 평점을 보여주거나 평점순으로 정렬할 때마다 reviews를 조인해서 집계하지 않도록
+리뷰 작성/수정/삭제가 같은 트랜잭션에서 도서 행의 집계 값을 증감합니다.
+
+    UPDATE books
+       SET rating_avg = ROUND((rating_sum + :d_sum) * 1.0 / (rating_count + :d_count), 2),
+           rating_sum = rating_sum + :d_sum,
+           rating_count = rating_count + :d_count
+     WHERE id = :book_id
+
+- 읽고 -> 계산하고 -> 쓰지 않고 한 문장으로 증감하므로 동시에 리뷰가 달려도 값이 유실되지 않습니다.
+- MySQL은 SET 절을 왼쪽부터 적용하면서 앞에서 바꾼 값을 뒤에서 읽으므로,
+  rating_avg를 가장 먼저 적어서 모든 DB에서 "갱신 전" 합계/개수로 계산되게 합니다.
+- 기존 데이터나 집계가 어긋났을 때는 rebuild_book_ratings()로 reviews에서 다시 계산합니다.
+"""
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.models.review import Review
+
+
+def apply_rating(db: Session, book_id: int, rating_delta: int, count_delta: int) -> None:
+    """리뷰 작성 (+평점, +1) / 평점 수정 (새 평점 - 이전 평점, 0) / 삭제 (-평점, -1). commit은 호출한 쪽에서"""
+    new_sum = Book.rating_sum + rating_delta
+    new_count = Book.rating_count + count_delta
+    db.execute(
+        update(Book)
+        .where(Book.id == book_id)
+        .ordered_values(
+            (Book.rating_avg, case((new_count > 0, func.round(new_sum * 1.0 / new_count, 2)), else_=0)),
+            (Book.rating_sum, new_sum),
+            (Book.rating_count, new_count),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_book_ratings(db: Session) -> int:
+    """모든 도서의 평점 집계를 reviews에서 다시 계산 (이관/복구용). 갱신한 도서 수 반환"""
+    rating_sum = select(func.coalesce(func.sum(Review.rating), 0)).where(Review.book_id == Book.id).scalar_subquery()
+    rating_count = select(func.count(Review.id)).where(Review.book_id == Book.id).scalar_subquery()
+    rating_avg = select(func.coalesce(func.round(func.avg(Review.rating), 2), 0))\
+        .where(Review.book_id == Book.id).scalar_subquery()
+    updated = db.execute(
+        update(Book)
+        .values(rating_sum=rating_sum, rating_count=rating_count, rating_avg=rating_avg)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return updated
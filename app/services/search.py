@@ -0,0 +1,190 @@
+# app/services/search.py
+"""
+도서 검색용 인메모리 역색인(Inverted Index).
+
+- 제목/저자를 토큰 단위로 색인하고, 검색어 토큰은 접두어(prefix)로 매칭합니다.
+  (한국어 조사 "파이썬을", "파이썬으로" 등도 "파이썬"으로 찾을 수 있음)
+- 카테고리(정확히 일치)별 도서 id 집합도 함께 두어, 검색어 + 카테고리 필터를 DB 없이 처리합니다.
+  (검색 결과 전체를 IN 목록으로 DB에 넘기지 않도록)
+- 점수는 필드 가중치 * TF * IDF 의 합으로 계산합니다.
+
+색인은 첫 검색 시 DB에서 한 번 적재되고, 이후에는 도서 등록/수정/삭제 API가 직접 갱신합니다.
+프로세스마다 별도의 색인을 가지므로, 다른 프로세스(seed 스크립트 등)에서 쓴 변경은
+reload() 또는 재시작 전까지 반영되지 않습니다.
+"""
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.services.taxonomy import split_names
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# 필드별 가중치 (제목에서 매칭되면 저자보다 높은 점수)
+FIELD_WEIGHTS = {"title": 2.0, "authors": 1.0}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """문자열을 소문자 토큰 목록으로 분리"""
+    return [token.lower() for token in TOKEN_PATTERN.findall(text or "")]
+
+
+class BookSearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        # term -> {book_id: 가중치가 반영된 TF}
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        # 접두어 검색용 정렬된 term 목록
+        self._sorted_terms: List[str] = []
+        # 삭제/수정 시 기존 항목을 지우기 위한 역참조
+        self._doc_terms: Dict[int, Set[str]] = {}
+        # 카테고리 이름 -> 도서 id 집합 / 도서 id -> 카테고리 이름 목록
+        self._category_docs: Dict[str, Set[int]] = defaultdict(set)
+        self._doc_categories: Dict[int, List[str]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    # ---------- 적재 / 동기화 ----------
+
+    def ensure_loaded(self, db: Session) -> None:
+        """색인이 비어 있으면 DB에서 한 번 적재"""
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load(db)
+
+    def reload(self, db: Session) -> None:
+        with self._lock:
+            self._clear()
+            self._load(db)
+
+    def _load(self, db: Session) -> None:
+        rows = db.query(Book.id, Book.title, Book.authors, Book.categories).yield_per(1000)
+        for row in rows:
+            self._index(row.id, row.title, row.authors, row.categories)
+        self._loaded = True
+
+    def _clear(self) -> None:
+        self._postings.clear()
+        self._sorted_terms.clear()
+        self._doc_terms.clear()
+        self._category_docs.clear()
+        self._doc_categories.clear()
+        self._loaded = False
+
+    def add(self, book: Book) -> None:
+        """도서 등록/수정 시 호출 (id, title, authors, categories 속성 사용, 기존 항목은 교체)"""
+        with self._lock:
+            # 아직 적재 전이면 첫 검색 때 DB에서 함께 읽어오므로 건너뜀
+            if not self._loaded:
+                return
+            self._unindex(book.id)
+            self._index(book.id, book.title, book.authors, book.categories)
+
+    def remove(self, book_id: int) -> None:
+        """도서 삭제 시 호출"""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._unindex(book_id)
+
+    def _index(self, book_id: int, title: Optional[str], authors: Optional[str], categories: Optional[str]) -> None:
+        terms: Set[str] = set()
+        for field, text in (("title", title), ("authors", authors)):
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                posting = self._postings[token]
+                if not posting:
+                    insort(self._sorted_terms, token)
+                posting[book_id] = posting.get(book_id, 0.0) + weight
+                terms.add(token)
+        self._doc_terms[book_id] = terms
+        names = split_names(categories)
+        for name in names:
+            self._category_docs[name].add(book_id)
+        self._doc_categories[book_id] = names
+
+    def _unindex(self, book_id: int) -> None:
+        for name in self._doc_categories.pop(book_id, ()):
+            docs = self._category_docs.get(name)
+            if docs is not None:
+                docs.discard(book_id)
+                if not docs:
+                    del self._category_docs[name]
+        for term in self._doc_terms.pop(book_id, ()):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(book_id, None)
+            if not posting:
+                del self._postings[term]
+                pos = bisect_left(self._sorted_terms, term)
+                if pos < len(self._sorted_terms) and self._sorted_terms[pos] == term:
+                    del self._sorted_terms[pos]
+
+    # ---------- 검색 ----------
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """prefix로 시작하는 모든 term (정렬 목록에서 이진 탐색)"""
+        start = bisect_left(self._sorted_terms, prefix)
+        result = []
+        for term in self._sorted_terms[start:]:
+            if not term.startswith(prefix):
+                break
+            result.append(term)
+        return result
+
+    def search(self, keyword: Optional[str], category: Optional[str] = None) -> List[Tuple[int, float]]:
+        """
+        조건에 맞는 (book_id, score) 목록을 점수 내림차순으로 반환.
+        검색어의 모든 토큰이 매칭되어야 결과에 포함됩니다. (AND 검색)
+        category가 있으면 그 카테고리(정확히 일치)에 속한 도서만 남깁니다.
+        """
+        with self._lock:
+            in_category = self._category_docs.get(category, set()) if category else None
+            scores: Optional[Dict[int, float]] = None
+            total_docs = max(len(self._doc_terms), 1)
+
+            for token in set(tokenize(keyword)):
+                token_scores: Dict[int, float] = {}
+                for term in self._expand_prefix(token):
+                    posting = self._postings[term]
+                    idf = math.log(1 + total_docs / len(posting))
+                    for book_id, tf in posting.items():
+                        token_scores[book_id] = token_scores.get(book_id, 0.0) + tf * idf
+
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        book_id: score + token_scores[book_id]
+                        for book_id, score in scores.items()
+                        if book_id in token_scores
+                    }
+                if not scores:
+                    return []
+
+            if scores is None:
+                return []
+            items = scores.items()
+            if in_category is not None:
+                items = [(book_id, score) for book_id, score in items if book_id in in_category]
+            return sorted(items, key=lambda item: (-item[1], -item[0]))
+
+    def has_terms(self, keyword: Optional[str]) -> bool:
+        """검색어에 색인 가능한 토큰이 있는지 (특수문자만 있는 경우 등 제외)"""
+        return bool(tokenize(keyword))
+
+
+# 앱 전체에서 공유하는 색인 인스턴스
+search_index = BookSearchIndex()
@@ -0,0 +1,70 @@
+# app/services/stock.py
+"""
+주문 시 재고 예약 / 취소 시 재고 복구.
+
+읽고 -> 계산하고 -> 쓰는 방식(read-modify-write)은 인기 도서에 요청이 몰리면
+행 잠금을 오래 잡거나(SELECT ... FOR UPDATE) 재고가 음수가 될 수 있습니다.
+대신 주문 한 건의 모든 품목을 조건부 UPDATE 한 문장으로 처리합니다.
+
+    UPDATE books
+       SET stock_quantity = stock_quantity - CASE id WHEN :a THEN :qa WHEN :b THEN :qb END
+     WHERE id IN (:a, :b)
+       AND stock_quantity >= CASE id WHEN :a THEN :qa WHEN :b THEN :qb END
+
+- 재고 확인과 차감이 한 문장이라 동시에 주문해도 재고가 음수가 되지 않습니다.
+- 갱신된 행 수가 품목 수보다 적으면 부족한 품목이 있는 것이므로, 호출한 쪽이 롤백합니다.
+- 잠금은 주문 트랜잭션이 commit될 때까지의 짧은 시간만 유지됩니다.
+"""
+from typing import Dict, List
+
+from sqlalchemy import case, update
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+
+
+class StockShortage(Exception):
+    """재고가 부족한 품목 목록 [{"book_id", "requested", "available"}]"""
+
+    def __init__(self, shortages: List[Dict[str, int]]):
+        super().__init__("재고가 부족합니다.")
+        self.shortages = shortages
+
+
+def reserve_stock(db: Session, quantities: Dict[int, int]) -> None:
+    """
+    {book_id: 수량}만큼 재고를 차감 (commit은 호출한 쪽에서).
+    하나라도 부족하면 StockShortage - 이미 차감된 품목이 있으므로 호출한 쪽에서 반드시 rollback.
+    """
+    if not quantities:
+        return
+    requested = case(quantities, value=Book.id)
+    result = db.execute(
+        update(Book)
+        .where(Book.id.in_(quantities.keys()), Book.stock_quantity >= requested)
+        .values(stock_quantity=Book.stock_quantity - requested)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == len(quantities):
+        return
+
+    # 부족한 품목은 갱신되지 않았으므로 현재 값이 곧 남은 재고
+    available = dict(db.query(Book.id, Book.stock_quantity).filter(Book.id.in_(quantities.keys())).all())
+    shortages = [
+        {"book_id": book_id, "requested": qty, "available": available.get(book_id) or 0}
+        for book_id, qty in sorted(quantities.items())
+        if (available.get(book_id) or 0) < qty
+    ]
+    raise StockShortage(shortages)
+
+
+def release_stock(db: Session, quantities: Dict[int, int]) -> None:
+    """주문 취소 시 {book_id: 수량}만큼 재고를 되돌림 (commit은 호출한 쪽에서)"""
+    if not quantities:
+        return
+    db.execute(
+        update(Book)
+        .where(Book.id.in_(quantities.keys()))
+        .values(stock_quantity=Book.stock_quantity + case(quantities, value=Book.id))
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,107 @@
+# app/services/taxonomy.py
+"""
+도서의 저자/카테고리 정규화.
+
+Book.authors / Book.categories 쉼표 문자열은 응답 표시용으로 그대로 두고,
+같은 내용을 authors / categories 테이블과 연결 테이블(book_authors, book_categories)에도 저장합니다.
+카테고리 필터는 연결 테이블 인덱스를 타는 조인으로 처리됩니다.
+
+- 도서 등록/수정 API는 sync_book_taxonomy()로 연결을 갱신합니다.
+- 기존 데이터(쉼표 문자열만 있는 도서)는 backfill_book_taxonomy()로 옮깁니다.
+  (scripts/migrate_taxonomy.py)
+"""
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insert_ignore
+from app.models.book import Author, Book, Category, book_authors, book_categories
+
+# authors.name / categories.name 컬럼 길이
+NAME_MAX_LENGTH = 100
+
+
+def split_names(text: Optional[str]) -> List[str]:
+    """쉼표 문자열 -> 공백 제거, 중복 제거된 이름 목록 (입력 순서 유지)"""
+    names = []
+    for name in (text or "").split(","):
+        name = name.strip()[:NAME_MAX_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def _ensure_names(db: Session, model, names: Iterable[str]) -> Dict[str, object]:
+    """이름 목록을 (없으면 만들고) {이름: Author|Category}로 반환. INSERT 한 번 + SELECT 한 번"""
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    insert_ignore(db, model.__table__, [{"name": name} for name in names])
+    found = {obj.name: obj for obj in db.query(model).filter(model.name.in_(names)).all()}
+    # MySQL 기본 collation은 대소문자를 구분하지 않으므로 "it"가 기존 "IT" 행으로 합쳐질 수 있음
+    by_lower = {name.lower(): obj for name, obj in found.items()}
+    result = {}
+    for name in names:
+        obj = found.get(name) or by_lower.get(name.lower())
+        if obj is not None:
+            result[name] = obj
+    return result
+
+
+def sync_book_taxonomy(db: Session, book: Book) -> None:
+    """book.authors / book.categories 문자열에 맞게 연결 테이블을 갱신 (commit은 호출한 쪽에서)"""
+    authors = _ensure_names(db, Author, split_names(book.authors))
+    categories = _ensure_names(db, Category, split_names(book.categories))
+    book.author_list = list(dict.fromkeys(authors.values()))
+    book.category_list = list(dict.fromkeys(categories.values()))
+
+
+def link_books(db: Session, rows) -> None:
+    """
+    여러 도서(id, authors, categories 속성을 가진 행)의 연결을 한 번에 다시 씀 (commit은 호출한 쪽에서).
+    이름 INSERT 한 번 + SELECT 한 번 + 연결 DELETE 한 번 + 다중 행 INSERT 한 번 (저자/카테고리 각각)
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    book_ids = [row.id for row in rows]
+
+    for model, table, column, text_of in (
+        (Author, book_authors, "author_id", lambda row: row.authors),
+        (Category, book_categories, "category_id", lambda row: row.categories),
+    ):
+        objs = _ensure_names(db, model, (name for row in rows for name in split_names(text_of(row))))
+        db.execute(table.delete().where(table.c.book_id.in_(book_ids)))
+        # 대소문자만 다른 이름이 같은 행으로 합쳐질 수 있으므로 (book_id, id) 중복 제거
+        links = list({
+            (row.id, objs[name].id): {"book_id": row.id, column: objs[name].id}
+            for row in rows
+            for name in split_names(text_of(row))
+            if name in objs
+        }.values())
+        if links:
+            db.execute(table.insert(), links)
+
+
+def backfill_book_taxonomy(db: Session, batch_size: int = 1000) -> int:
+    """
+    모든 도서의 쉼표 문자열을 연결 테이블로 옮김 (여러 번 실행해도 결과가 같음).
+    batch_size 권씩 link_books() 후 commit 합니다.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(Book.id, Book.authors, Book.categories)
+            .filter(Book.id > last_id)
+            .order_by(Book.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        link_books(db, rows)
+        db.commit()
+        processed += len(rows)
+        last_id = rows[-1].id
+    return processed
@@ -0,0 +1,180 @@
+# app/services/top_sellers.py
+"""
+판매 순위 (전체 기간 / 최근 7일 / 최근 30일, 카테고리별).
+
+주문 품목(order_items) 전체를 매번 GROUP BY 하지 않도록 판매 수량을 미리 집계해 둡니다.
+- book_sales: 도서별 누적 판매 수량
+- book_sales_daily: 도서별 일별 판매 수량 (기간 순위용, 기간 안의 날짜만 합산)
+두 테이블은 주문 생성/취소 시 작업 큐 핸들러가 upsert로 증감합니다. (apply_order_items)
+rebuild_book_sales()로 다시 계산할 때는 대기 중 집계 작업을 같은 트랜잭션에서 완료 처리합니다.
+
+조회는 (기간, 카테고리)별 상위 TOP_SELLERS_SIZE개 목록을 메모리에 들고 있다가 앞에서 limit개만 잘라 줍니다.
+(요청당 O(K), 주문량과 무관)
+- 이 프로세스에서 판매량이 바뀌면 TOP_SELLERS_MIN_REFRESH_SECONDS 이후 첫 조회에서 다시 읽음
+- 다른 프로세스에서 바뀐 판매량은 TOP_SELLERS_REFRESH_SECONDS 안에 반영
+"""
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.db.upsert import upsert
+from app.models.book import Book, Category, book_categories
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.sales import BookSales, BookSalesDaily
+from app.services.jobs import after_commit, mark_jobs_done, pending_jobs
+
+# 주문 생성/취소 시 등록되는 집계 작업 종류 (app/services/order_jobs.py)
+TOP_SELLERS_JOB = "sales.top_sellers"
+
+# 재계산 결과를 나눠서 INSERT 할 행 수
+REBUILD_BATCH_SIZE = 1000
+
+# 기간 이름 -> 일 수 (None: 전체 기간)
+WINDOWS: Dict[str, Optional[int]] = {"7d": 7, "30d": 30, "all": None}
+
+
+def apply_order_items(db: Session, order_id: int, sign: int) -> None:
+    """주문 하나의 품목 수량을 판매 집계에 반영 (sign=1: 생성, sign=-1: 취소). commit은 호출한 쪽에서"""
+    order = db.query(Order.created_at).filter(Order.id == order_id).first()
+    if order is None:
+        return
+    quantities: Dict[int, int] = {}
+    for book_id, quantity in db.query(OrderItem.book_id, OrderItem.quantity).filter(OrderItem.order_id == order_id):
+        quantities[book_id] = quantities.get(book_id, 0) + quantity
+    if not quantities:
+        return
+    sales_date = order.created_at.date()
+    upsert(
+        db, BookSales.__table__,
+        [{"book_id": book_id, "total_sold": qty * sign} for book_id, qty in sorted(quantities.items())],
+        conflict_columns=["book_id"], update_columns=[], increment_columns=["total_sold"],
+    )
+    upsert(
+        db, BookSalesDaily.__table__,
+        [{"book_id": book_id, "sales_date": sales_date, "quantity": qty * sign} for book_id, qty in sorted(quantities.items())],
+        conflict_columns=["book_id", "sales_date"], update_columns=[], increment_columns=["quantity"],
+    )
+    # 증감이 commit된 뒤에 표시 (먼저 표시하면 동시 조회가 commit 전 값으로 순위를 다시 읽고 새 변경 번호를 붙임)
+    after_commit(db, top_sellers.mark_changed)
+
+
+def rebuild_book_sales(db: Session) -> int:
+    """
+    order_items에서 판매 집계를 처음부터 다시 계산 (취소 주문 제외). 누적 집계 행 수 반환.
+    집계 행을 먼저 지워 쓰기 잠금을 잡은 뒤, 대기 중 작업과 주문을 같은 시점 기준으로 읽고
+    그 작업들을 같은 트랜잭션에서 완료 처리합니다. (재계산에 포함된 주문이 두 번 더해지지 않도록)
+    """
+    db.query(BookSales).delete(synchronize_session=False)
+    db.query(BookSalesDaily).delete(synchronize_session=False)
+    jobs = pending_jobs(db, TOP_SELLERS_JOB)
+
+    not_canceled = Order.status != OrderStatus.CANCELED
+    totals = db.execute(
+        select(OrderItem.book_id, func.sum(OrderItem.quantity))
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(not_canceled)
+        .group_by(OrderItem.book_id)
+    ).all()
+    sales_date = func.date(Order.created_at)
+    daily = db.execute(
+        select(OrderItem.book_id, sales_date, func.sum(OrderItem.quantity))
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(not_canceled)
+        .group_by(OrderItem.book_id, sales_date)
+    ).all()
+
+    total_rows = [{"book_id": book_id, "total_sold": sold} for book_id, sold in totals]
+    daily_rows = [
+        {"book_id": book_id, "sales_date": date.fromisoformat(day) if isinstance(day, str) else day, "quantity": sold}
+        for book_id, day, sold in daily
+    ]
+    for table, rows in ((BookSales, total_rows), (BookSalesDaily, daily_rows)):
+        for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+            db.execute(insert(table), rows[start:start + REBUILD_BATCH_SIZE])
+
+    mark_jobs_done(db, [job_id for job_id, _ in jobs])
+    db.commit()
+    top_sellers.mark_changed()
+    return len(total_rows)
+
+
+def _current_date(db: Session) -> date:
+    # orders.created_at(DB 시각)과 같은 기준의 오늘 날짜
+    today = db.query(func.current_date()).scalar()
+    return date.fromisoformat(today) if isinstance(today, str) else today
+
+
+def load_top_sellers(db: Session, window: str, category: Optional[str], size: int) -> List[Dict[str, Any]]:
+    """집계 테이블에서 (기간, 카테고리) 상위 size개를 읽음"""
+    days = WINDOWS[window]
+    if days is None:
+        sold = BookSales.total_sold.label("total_sold")
+        query = db.query(BookSales.book_id.label("book_id"), sold).filter(BookSales.total_sold > 0)
+        book_id_column = BookSales.book_id
+    else:
+        since = _current_date(db) - timedelta(days=days - 1)
+        sold = func.sum(BookSalesDaily.quantity).label("total_sold")
+        query = db.query(BookSalesDaily.book_id.label("book_id"), sold)\
+            .filter(BookSalesDaily.sales_date >= since)\
+            .group_by(BookSalesDaily.book_id)\
+            .having(sold > 0)
+        book_id_column = BookSalesDaily.book_id
+    if category:
+        query = query.join(book_categories, book_categories.c.book_id == book_id_column)\
+            .join(Category, Category.id == book_categories.c.category_id)\
+            .filter(Category.name == category)
+    ranked = query.order_by(sold.desc(), book_id_column).limit(size).subquery()
+    rows = db.query(ranked.c.book_id, ranked.c.total_sold, Book.title)\
+        .join(Book, Book.id == ranked.c.book_id)\
+        .order_by(ranked.c.total_sold.desc(), ranked.c.book_id)\
+        .all()
+    return [{"book_id": row.book_id, "title": row.title, "total_sold": int(row.total_sold)} for row in rows]
+
+
+class TopSellersBoard:
+    def __init__(self, size: int, refresh_seconds: float, min_refresh_seconds: float):
+        self._size = size
+        self._min_refresh = min_refresh_seconds
+        # (기간, 카테고리) -> (상위 K개 목록, 읽은 시각, 읽을 때의 변경 번호). 카테고리 수만큼만 생기도록 개수 제한
+        self._boards = LRUCache(max_entries=512, ttl_seconds=refresh_seconds)
+        self._lock = threading.Lock()
+        self._changes = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def mark_changed(self) -> None:
+        """이 프로세스에서 판매 집계가 바뀌었음을 표시"""
+        with self._lock:
+            self._changes += 1
+
+    def top(self, db: Session, window: str, category: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        key = (window, category)
+        with self._lock:
+            changes = self._changes
+        entry = self._boards.get(key)
+        if entry is not None:
+            rows, loaded_at, loaded_changes = entry
+            if loaded_changes == changes or time.monotonic() - loaded_at < self._min_refresh:
+                return rows[:limit]
+        rows = load_top_sellers(db, window, category, self._size)
+        self._boards.set(key, (rows, time.monotonic(), changes))
+        return rows[:limit]
+
+    def clear(self) -> None:
+        self._boards.clear()
+
+
+# 앱 전체에서 공유하는 판매 순위
+top_sellers = TopSellersBoard(
+    settings.TOP_SELLERS_SIZE,
+    settings.TOP_SELLERS_REFRESH_SECONDS,
+    settings.TOP_SELLERS_MIN_REFRESH_SECONDS,
+)
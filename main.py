@@ -1,7 +1,9 @@
 import time
+import hashlib
 from datetime import datetime
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,6 +17,10 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app.db.session import engine, Base
+from app.services.jobs import job_queue
+from app.core.idempotency import (
+    MAX_KEY_LENGTH, StoredResponse, idempotency_store, is_idempotent_path, normalize_path, token_subject
+)
 # 새로 만든 라우터들까지 모두 포함
 from app.api.v1.endpoints import users, auth, books, cart, orders, reviews, favorites, stats
 
@@ -34,7 +40,10 @@ def create_tables():
 async def lifespan(app: FastAPI):
     # 앱 시작 시 테이블 생성 (실무에선 Alembic을 쓰지만 과제용으로 유지)
     create_tables()
+    # 주문 후처리 워커 시작 / 종료
+    job_queue.start()
     yield
+    job_queue.stop()
 
 # Rate Limiter 설정 (하루 1000회, 분당 100회 제한)
 limiter = Limiter(key_func=get_remote_address, default_limits=["1000/day", "100/minute"])
@@ -54,6 +63,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Idempotency-Key 미들웨어 (주문/장바구니/리뷰 POST 재시도 시 첫 응답 재사용)
+# 로깅 미들웨어보다 먼저 등록해서 안쪽에서 실행되도록 함 (재사용된 응답도 로그에 남음)
+@app.middleware("http")
+async def idempotent_requests(request: Request, call_next):
+    idempotency_key = request.headers.get("Idempotency-Key")
+    if request.method != "POST" or not idempotency_key or not is_idempotent_path(request.url.path):
+        return await call_next(request)
+    
+    # 사용자별로 키를 구분 (토큰이 없거나 잘못되면 그대로 넘겨서 엔드포인트가 401 처리)
+    subject = token_subject(request.headers.get("Authorization"))
+    if subject is None or not subject.isdigit():
+        return await call_next(request)
+    user_id = int(subject)
+    
+    path = request.url.path
+    if len(idempotency_key) > MAX_KEY_LENGTH:
+        return create_error_response(400, "BAD_REQUEST", f"Idempotency-Key는 {MAX_KEY_LENGTH}자 이하여야 합니다.", path)
+    
+    # 같은 키를 다른 경로에 쓰면 다른 요청으로 보고 거절되도록 경로도 해시에 포함
+    fingerprint = hashlib.sha256(normalize_path(path).encode() + b"\n" + await request.body()).hexdigest()
+    # 저장소는 동기 DB 호출이므로 이벤트 루프를 막지 않게 스레드풀에서 실행
+    state, stored = await run_in_threadpool(idempotency_store.begin, user_id, idempotency_key, fingerprint)
+    if state == idempotency_store.REPLAY:
+        replayed = Response(content=stored.body, status_code=stored.status_code)
+        # 첫 응답의 헤더를 그대로 복원 (같은 이름의 헤더가 여러 개여도 유지)
+        replayed.raw_headers = [
+            (name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.headers
+        ] + [(b"idempotent-replayed", b"true")]
+        return replayed
+    if state == idempotency_store.MISMATCH:
+        return create_error_response(422, "UNPROCESSABLE_ENTITY", "같은 Idempotency-Key로 다른 요청을 보냈습니다.", path)
+    if state == idempotency_store.IN_FLIGHT:
+        return create_error_response(409, "CONFLICT", "같은 Idempotency-Key 요청을 처리 중입니다. 잠시 후 다시 시도하세요.", path)
+    
+    try:
+        response = await call_next(request)
+    except Exception:
+        await run_in_threadpool(idempotency_store.abort, user_id, idempotency_key)
+        raise
+    
+    # 실패 응답은 저장하지 않음 (같은 키로 다시 시도 가능)
+    if not 200 <= response.status_code < 300:
+        await run_in_threadpool(idempotency_store.abort, user_id, idempotency_key)
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in response.raw_headers]
+    await run_in_threadpool(
+        idempotency_store.complete, user_id, idempotency_key,
+        StoredResponse(fingerprint, response.status_code, body, headers)
+    )
+    completed = Response(content=body, status_code=response.status_code)
+    completed.raw_headers = response.raw_headers
+    return completed
+
 # [과제 필수 1-9] 로깅 미들웨어 (요청 처리 시간 및 경로 로깅)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -116,10 +180,16 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 
     error_code = code_mapping.get(exc.status_code, "HTTP_ERROR")
 
+    # detail={"message": ..., "details": {...}} 형태면 상세 정보도 함께 전달 (예: 재고 부족 품목)
+    message, details = exc.detail, None
+    if isinstance(exc.detail, dict):
+        message, details = exc.detail.get("message"), exc.detail.get("details")
+
     return create_error_response(
         status_code=exc.status_code,
         code=error_code,
-        message=str(exc.detail),
+        message=str(message),
+        details=details,
         path=request.url.path
     )
     
@@ -0,0 +1,87 @@
+# scripts/bench_checkout.py
+# 주문 생성(POST /api/v1/orders/) 지연 시간 측정: 장바구니 품목 1 ~ 200개
+# 사용법: python scripts/bench_checkout.py [반복 횟수]
+# (.env의 DATABASE_URL에 연결하며, 측정용 회원/주문 데이터가 남습니다.
+#  측정용 도서 200권(ISBN BENCH-000001 ~)을 만들고 실행할 때마다 필요한 만큼 재고를 다시 채우므로
+#  반복 실행해도 재고 부족(409)으로 멈추지 않고, 시드 도서의 재고도 건드리지 않습니다.)
+import sys
+import os
+import time
+import uuid
+import statistics
+# 프로젝트 루트 경로를 잡아주기 위함
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import logging
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from main import app
+from app.db.session import SessionLocal, engine
+from app.models.book import Book
+from app.models.cart import CartItem
+from app.db.upsert import upsert
+from app.services.catalog import bump_book_stats_version
+
+CART_SIZES = [1, 10, 50, 100, 200]
+PAYLOAD = {"recipient_name": "벤치", "recipient_phone": "010-0000-0000", "shipping_address": "서울"}
+
+def signup_and_login(client):
+    email = f"bench_{uuid.uuid4()}@example.com"
+    client.post("/api/v1/users/signup", json={"email": email, "password": "bench1234", "name": "벤치"})
+    token = client.post("/api/v1/auth/login", data={"username": email, "password": "bench1234"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+    return headers, user_id
+
+def prepare_bench_books(repeat):
+    # 측정용 도서를 만들거나(처음 실행) 재고를 다시 채움 (이전 실행에서 줄어든 재고 복구)
+    # 1번째 도서는 모든 장바구니 크기에 들어가므로 반복 횟수 x 크기 종류 만큼 주문됨
+    stock = repeat * len(CART_SIZES)
+    rows = [
+        {"title": f"벤치 도서 {i:06d}", "isbn": f"BENCH-{i:06d}", "price": 10000, "stock_quantity": stock}
+        for i in range(1, max(CART_SIZES) + 1)
+    ]
+    db = SessionLocal()
+    try:
+        upsert(db, Book.__table__, rows, ["isbn"], ["stock_quantity"])
+        # 재고가 바뀌었으므로 목록 ETag도 갱신
+        bump_book_stats_version(db)
+        db.commit()
+        return [row.id for row in db.query(Book.id).filter(Book.isbn.in_([r["isbn"] for r in rows])).order_by(Book.id)]
+    finally:
+        db.close()
+
+def fill_cart(user_id, book_ids):
+    # 장바구니 채우기는 측정 대상이 아니므로 DB에 직접 한 번에 넣음
+    db = SessionLocal()
+    try:
+        db.execute(insert(CartItem), [{"user_id": user_id, "book_id": b, "quantity": 1} for b in book_ids])
+        db.commit()
+    finally:
+        db.close()
+
+def bench(repeat: int):
+    # SQL 로그 출력은 측정값을 왜곡하므로 끔
+    engine.echo = False
+    logging.disable(logging.INFO)
+
+    book_ids = prepare_bench_books(repeat)
+
+    with TestClient(app) as client:
+        headers, user_id = signup_and_login(client)
+        print(f"{'lines':>6} {'p50(ms)':>9} {'p95(ms)':>9} {'max(ms)':>9}")
+        for size in CART_SIZES:
+            samples = []
+            for _ in range(repeat):
+                fill_cart(user_id, book_ids[:size])
+                start = time.perf_counter()
+                response = client.post("/api/v1/orders/", json=PAYLOAD, headers=headers)
+                samples.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 201, response.text
+            samples.sort()
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            print(f"{size:>6} {statistics.median(samples):>9.2f} {p95:>9.2f} {samples[-1]:>9.2f}")
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
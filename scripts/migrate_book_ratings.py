@@ -0,0 +1,47 @@
+# scripts/migrate_book_ratings.py
+# 기존 DB의 books에 평점 집계 컬럼(rating_sum / rating_count / rating_avg)과 정렬 인덱스를 추가하고
+# reviews에서 값을 채우는 스크립트 (여러 번 실행해도 같은 결과)
+import sys
+import os
+# 프로젝트 루트 경로를 잡아주기 위함
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from sqlalchemy import inspect, text
+from app.db.session import SessionLocal, engine
+from app.models.user import User  # Review.user 관계 해석용
+from app.services.ratings import rebuild_book_ratings
+
+COLUMNS = {
+    "rating_sum": "INTEGER NOT NULL DEFAULT 0",
+    "rating_count": "INTEGER NOT NULL DEFAULT 0",
+    "rating_avg": "DECIMAL(3, 2) NOT NULL DEFAULT 0",
+}
+
+INDEXES = {
+    "ix_books_rating_avg_id": "rating_avg, id",
+    "ix_books_rating_count_id": "rating_count, id",
+}
+
+def migrate():
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("books")}
+    indexes = {ix["name"] for ix in inspector.get_indexes("books")}
+    with engine.begin() as conn:
+        for name, ddl in COLUMNS.items():
+            if name not in columns:
+                conn.execute(text(f"ALTER TABLE books ADD COLUMN {name} {ddl}"))
+        for name, cols in INDEXES.items():
+            if name not in indexes:
+                conn.execute(text(f"CREATE INDEX {name} ON books ({cols})"))
+    print("✅ 평점 집계 컬럼 / 인덱스 준비 완료")
+
+    db = SessionLocal()
+    try:
+        print("🔄 리뷰에서 평점 집계를 계산하는 중...")
+        count = rebuild_book_ratings(db)
+        print(f"✅ 도서 {count}권의 평점 집계 완료")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate()
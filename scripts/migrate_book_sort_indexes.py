@@ -0,0 +1,46 @@
+# scripts/migrate_book_sort_indexes.py
+# 기존 DB의 books에 목록 정렬용 (정렬 값, id) 인덱스를 추가하고 price를 NOT NULL로 바꾸는 스크립트
+# 가격이 비어 있는 도서가 있으면 목록만 출력하고 NOT NULL 변경은 하지 않습니다. (가격을 채운 뒤 다시 실행)
+# (여러 번 실행해도 같은 결과)
+import sys
+import os
+# 프로젝트 루트 경로를 잡아주기 위함
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from sqlalchemy import inspect, text
+from app.db.session import SessionLocal, engine
+from app.models.book import Book
+
+INDEXES = {
+    "ix_books_created_at_id": "created_at, id",
+    "ix_books_price_id": "price, id",
+}
+
+def migrate():
+    existing = {ix["name"] for ix in inspect(engine).get_indexes("books")}
+    with engine.begin() as conn:
+        for name, cols in INDEXES.items():
+            if name not in existing:
+                conn.execute(text(f"CREATE INDEX {name} ON books ({cols})"))
+    print("✅ 정렬 인덱스 준비 완료")
+
+    db = SessionLocal()
+    try:
+        unpriced = [book_id for (book_id,) in db.query(Book.id).filter(Book.price.is_(None)).order_by(Book.id)]
+    finally:
+        db.close()
+    if unpriced:
+        print(f"⚠️ 가격이 비어 있는 도서 {len(unpriced)}권: {unpriced[:50]}")
+        print("   가격을 채운 뒤 다시 실행하면 price를 NOT NULL로 변경합니다.")
+        sys.exit(1)
+
+    if engine.dialect.name == "mysql":
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE books MODIFY price DECIMAL(10, 2) NOT NULL"))
+        print("✅ price NOT NULL 적용 완료")
+    else:
+        # SQLite는 컬럼 제약을 바꿀 수 없으므로 API 검증(BookCreate/BookUpdate)으로만 보장
+        print("ℹ️ MySQL이 아니므로 price NOT NULL 변경은 건너뜁니다.")
+
+if __name__ == "__main__":
+    migrate()
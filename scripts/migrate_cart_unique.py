@@ -0,0 +1,42 @@
+# scripts/migrate_cart_unique.py
+# 기존 DB의 cart_items에 (user_id, book_id) 유니크 제약을 추가하는 스크립트
+# 같은 책이 여러 줄로 담겨 있으면 수량을 합쳐 한 줄로 만든 뒤 제약을 만듭니다. (여러 번 실행해도 같은 결과)
+import sys
+import os
+# 프로젝트 루트 경로를 잡아주기 위함
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from sqlalchemy import func, inspect, text
+from app.db.session import SessionLocal, engine
+from app.models.cart import CartItem
+
+def migrate():
+    existing = {ix["name"] for ix in inspect(engine).get_indexes("cart_items")}
+    existing |= {uq["name"] for uq in inspect(engine).get_unique_constraints("cart_items")}
+    if "uq_user_book_cart" in existing:
+        print("✅ 이미 적용되어 있습니다.")
+        return
+
+    db = SessionLocal()
+    try:
+        print("🔄 중복된 장바구니 항목을 합치는 중...")
+        duplicates = db.query(
+            CartItem.user_id, CartItem.book_id,
+            func.min(CartItem.id).label("keep_id"), func.sum(CartItem.quantity).label("quantity")
+        ).group_by(CartItem.user_id, CartItem.book_id).having(func.count(CartItem.id) > 1).all()
+        for row in duplicates:
+            db.query(CartItem).filter(CartItem.id == row.keep_id).update({"quantity": row.quantity})
+            db.query(CartItem).filter(
+                CartItem.user_id == row.user_id, CartItem.book_id == row.book_id, CartItem.id != row.keep_id
+            ).delete(synchronize_session=False)
+        db.commit()
+        print(f"✅ {len(duplicates)}건 정리 완료")
+    finally:
+        db.close()
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE UNIQUE INDEX uq_user_book_cart ON cart_items (user_id, book_id)"))
+    print("✅ (user_id, book_id) 유니크 제약 추가 완료")
+
+if __name__ == "__main__":
+    migrate()
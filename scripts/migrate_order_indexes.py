@@ -0,0 +1,25 @@
+# scripts/migrate_order_indexes.py
+# 기존 DB의 orders에 내 주문 내역 커서 조회용 (user_id, created_at, id) 인덱스를 추가하는 스크립트
+# (create_all은 이미 있는 테이블에 인덱스를 추가하지 않으므로 기존 DB는 이 스크립트로 적용, 여러 번 실행해도 같은 결과)
+import sys
+import os
+# 프로젝트 루트 경로를 잡아주기 위함
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from sqlalchemy import inspect, text
+from app.db.session import engine
+
+INDEXES = {
+    "ix_orders_user_created": "user_id, created_at, id",
+}
+
+def migrate():
+    existing = {ix["name"] for ix in inspect(engine).get_indexes("orders")}
+    with engine.begin() as conn:
+        for name, cols in INDEXES.items():
+            if name not in existing:
+                conn.execute(text(f"CREATE INDEX {name} ON orders ({cols})"))
+    print("✅ 주문 내역 인덱스 준비 완료")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,26 @@
+# scripts/migrate_review_indexes.py
+# 기존 DB의 reviews에 도서별 리뷰 커서 조회용 (book_id, created_at, id) / (book_id, rating, id) 인덱스를 추가하는 스크립트
+# (create_all은 이미 있는 테이블에 인덱스를 추가하지 않으므로 기존 DB는 이 스크립트로 적용, 여러 번 실행해도 같은 결과)
+import sys
+import os
+# 프로젝트 루트 경로를 잡아주기 위함
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from sqlalchemy import inspect, text
+from app.db.session import engine
+
+INDEXES = {
+    "ix_reviews_book_created": "book_id, created_at, id",
+    "ix_reviews_book_rating": "book_id, rating, id",
+}
+
+def migrate():
+    existing = {ix["name"] for ix in inspect(engine).get_indexes("reviews")}
+    with engine.begin() as conn:
+        for name, cols in INDEXES.items():
+            if name not in existing:
+                conn.execute(text(f"CREATE INDEX {name} ON reviews ({cols})"))
+    print("✅ 리뷰 목록 인덱스 준비 완료")
+
+if __name__ == "__main__":
+    migrate()
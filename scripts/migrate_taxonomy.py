@@ -0,0 +1,27 @@
+# scripts/migrate_taxonomy.py
+# 기존 도서의 저자/카테고리 쉼표 문자열을 authors / categories 및 연결 테이블로 옮기는 스크립트
+# (여러 번 실행해도 같은 결과. 새 테이블이 없으면 먼저 생성합니다)
+import sys
+import os
+# 프로젝트 루트 경로를 잡아주기 위함
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from app.db.session import SessionLocal, engine, Base
+from app.models.book import Author, Category, book_authors, book_categories
+from app.services.taxonomy import backfill_book_taxonomy
+
+def migrate():
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Author.__table__, Category.__table__, book_authors, book_categories]
+    )
+    db = SessionLocal()
+    try:
+        print("🔄 저자/카테고리 정규화를 시작합니다...")
+        count = backfill_book_taxonomy(db)
+        print(f"✅ 도서 {count}권의 저자/카테고리 연결 완료")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate()
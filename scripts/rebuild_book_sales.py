@@ -0,0 +1,25 @@
+# scripts/rebuild_book_sales.py
+# 판매 순위용 도서별 판매 수량 집계(book_sales, book_sales_daily)를 order_items에서 다시 계산하는 스크립트
+# (최초 적재 / 불일치 복구. 대기 중인 집계 작업은 함께 완료 처리되며, 실행 중인 작업이 있으면 중단하므로
+#  작업 큐 워커를 멈춘 상태에서 실행하세요)
+import sys
+import os
+# 프로젝트 루트 경로를 잡아주기 위함
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from app.db.session import SessionLocal, engine, Base
+from app.models.sales import BookSales, BookSalesDaily
+from app.services.top_sellers import rebuild_book_sales
+
+def main():
+    Base.metadata.create_all(bind=engine, tables=[BookSales.__table__, BookSalesDaily.__table__])
+    db = SessionLocal()
+    try:
+        print("🔄 도서별 판매 수량을 다시 계산합니다...")
+        count = rebuild_book_sales(db)
+        print(f"✅ 도서 {count}권의 판매 집계 완료")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
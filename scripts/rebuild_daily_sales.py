@@ -0,0 +1,33 @@
+# scripts/rebuild_daily_sales.py
+# daily_sales 집계를 orders에서 다시 계산하는 스크립트 (최초 적재 / 불일치 복구)
+# 사용법: python scripts/rebuild_daily_sales.py [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+# 재계산에 포함된 주문의 대기 중 집계 작업은 함께 완료 처리됩니다. 실행 중인 집계 작업이 있으면 중단하므로
+# 작업 큐 워커를 멈춘 상태(JOB_WORKERS=0)에서 실행하세요.
+import argparse
+import sys
+import os
+from datetime import date
+# 프로젝트 루트 경로를 잡아주기 위함
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from app.db.session import SessionLocal, engine, Base
+from app.models.sales import DailySales
+from app.services.daily_sales import rebuild_daily_sales
+
+def main():
+    parser = argparse.ArgumentParser(description="일별 매출 집계 재계산")
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat, help="시작일 (포함)")
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, help="종료일 (포함)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, tables=[DailySales.__table__])
+    db = SessionLocal()
+    try:
+        print("🔄 일별 매출 집계를 다시 계산합니다...")
+        count = rebuild_daily_sales(db, args.from_date, args.to_date)
+        print(f"✅ {count}일치 집계 완료")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ from app.models.user import User
 from app.models.book import Book
 from app.models.review import Review
 from app.core.security import get_password_hash
+from app.services.taxonomy import backfill_book_taxonomy
+from app.services.ratings import rebuild_book_ratings
 from faker import Faker
 import random
 
@@ -69,6 +71,8 @@ def seed_data():
     db.commit()
     # 생성된 책들의 ID를 알기 위해 refresh
     for b in books: db.refresh(b)
+    # 저자/카테고리 연결 테이블 채우기
+    backfill_book_taxonomy(db)
     print("✅ 책 150권 생성 완료")
 
     # 3. 리뷰 50개 생성 (랜덤 유저가 랜덤 책에 리뷰)
@@ -85,6 +89,8 @@ def seed_data():
         db.add(review)
     
     db.commit()
+    # 도서별 평점 집계 채우기
+    rebuild_book_ratings(db)
     print("✅ 리뷰 50개 생성 완료")
     
     db.close()
@@ -4,6 +4,7 @@ from main import app
 from faker import Faker
 import random
 import uuid
+import json
 
 client = TestClient(app)
 fake = Faker('ko_KR')
@@ -46,6 +47,64 @@ def get_auth_headers(role="ROLE_USER"):
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
 
+# === [Helper] 관리자 헤더 ===
+def get_admin_headers():
+    """
+    회원가입 API는 항상 ROLE_USER로 가입시키므로,
+    가입 후 DB에서 직접 ROLE_ADMIN으로 올린 뒤 로그인한다.
+    (토큰 발급 시점의 role이 아니라 요청마다 DB의 role을 확인하므로 기존 토큰도 그대로 사용 가능)
+    """
+    from app.db.session import SessionLocal
+    from app.models.user import User
+
+    headers = get_auth_headers()
+    me = client.get("/api/v1/users/me", headers=headers).json()
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id == me["id"]).update({"role": "ROLE_ADMIN"})
+        db.commit()
+    finally:
+        db.close()
+    return headers
+
+def create_test_book(headers, **overrides):
+    """관리자 권한으로 테스트용 도서를 등록하고 응답 JSON을 반환"""
+    payload = {
+        "title": f"테스트 도서 {uuid.uuid4().hex[:8]}",
+        "authors": fake.name(),
+        "categories": "IT",
+        "isbn": uuid.uuid4().hex[:13],
+        "price": 15000,
+        "stock_quantity": 10,
+    }
+    payload.update(overrides)
+    response = client.post("/api/v1/books/", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+def count_queries(fn):
+    """fn 실행 중 DB로 나간 SQL 문 개수"""
+    from sqlalchemy import event
+    from app.db.session import engine
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, len(statements)
+
+def listing_versions():
+    """(카탈로그 버전, 도서 통계 버전)"""
+    from app.db.session import SessionLocal
+    from app.services.catalog import get_listing_versions
+    db = SessionLocal()
+    try:
+        return get_listing_versions(db)
+    finally:
+        db.close()
+
 # ==========================================
 # 1. 공통 및 인증 (Auth) 테스트 (5개)
 # ==========================================
@@ -133,8 +192,8 @@ def test_update_user_me():
 def get_valid_book_id():
     response = client.get("/api/v1/books?page=1&size=1")
     data = response.json()
-    if data["books"]:
-        return data["books"][0]["id"]
+    if data["content"]:
+        return data["content"][0]["id"]
     return None
 
 def test_read_books_list():
@@ -142,8 +201,8 @@ def test_read_books_list():
     response = client.get("/api/v1/books?page=1&size=5")
     assert response.status_code == 200
     data = response.json()
-    assert "books" in data
-    assert isinstance(data["books"], list)
+    assert "content" in data
+    assert isinstance(data["content"], list)
 
 def test_read_book_detail_success():
     book_id = get_valid_book_id()
@@ -154,6 +213,159 @@ def test_read_book_detail_success():
     assert response.status_code == 200
     assert response.json()["id"] == book_id
 
+def test_read_book_detail_cache_invalidated_on_update():
+    """10-1. 상세 조회는 캐시에서 응답하고, 수정/삭제 시 바로 반영됨"""
+    admin = get_admin_headers()
+    book = create_test_book(admin, price=10000)
+    before = client.get("/api/v1/stats/cache", headers=admin).json()
+    client.get(f"/api/v1/books/{book['id']}")
+    client.get(f"/api/v1/books/{book['id']}")
+    after = client.get("/api/v1/stats/cache", headers=admin).json()
+    assert after["hits"] >= before["hits"] + 1
+
+    client.patch(f"/api/v1/books/{book['id']}", json={"price": 20000}, headers=admin)
+    assert client.get(f"/api/v1/books/{book['id']}").json()["price"] == 20000
+    client.delete(f"/api/v1/books/{book['id']}", headers=admin)
+    assert client.get(f"/api/v1/books/{book['id']}").status_code == 404
+
+def test_book_etag_not_modified():
+    """10-3. ETag가 같으면 304, 도서가 바뀌면 목록/상세 모두 새 ETag로 200"""
+    admin = get_admin_headers()
+    book = create_test_book(admin)
+
+    detail = client.get(f"/api/v1/books/{book['id']}")
+    listing = client.get("/api/v1/books?size=3&sort=id,desc")
+    assert detail.headers["ETag"] and listing.headers["ETag"]
+    assert client.get(f"/api/v1/books/{book['id']}", headers={"If-None-Match": detail.headers["ETag"]}).status_code == 304
+    response = client.get("/api/v1/books?size=3&sort=id,desc", headers={"If-None-Match": listing.headers["ETag"]})
+    assert response.status_code == 304 and response.content == b""
+    # 쿼리 파라미터가 다르면 다른 ETag
+    assert client.get("/api/v1/books?size=4&sort=id,desc").headers["ETag"] != listing.headers["ETag"]
+
+    client.patch(f"/api/v1/books/{book['id']}", json={"stock_quantity": 3}, headers=admin)
+    assert client.get(f"/api/v1/books/{book['id']}", headers={"If-None-Match": detail.headers["ETag"]}).status_code == 200
+    assert client.get("/api/v1/books?size=3&sort=id,desc", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 200
+
+def test_import_books_csv_and_ndjson_upsert():
+    """10-4. 대량 등록: 잘못된 행/파일 내 중복 ISBN은 오류 보고, upsert 모드는 기존 도서 수정"""
+    admin = get_admin_headers()
+    prefix = uuid.uuid4().hex[:8]
+    csv_body = (
+        "title,authors,categories,isbn,price,stock_quantity\n"
+        f"대량1,저자A,IT,{prefix}-1,10000,5\n"
+        f"대량2,\"저자B,저자C\",소설,{prefix}-2,12000,\n"
+        f"가격오류,저자D,IT,{prefix}-3,-5,1\n"
+        f"중복,저자E,IT,{prefix}-1,9000,1\n"
+    )
+    response = client.post(
+        "/api/v1/books/import", headers=admin,
+        files={"file": ("books.csv", csv_body.encode(), "text/csv")},
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["total"], report["inserted"], report["failed"]) == (4, 2, 2)
+    assert [e["row"] for e in report["errors"]] == [3, 4]
+
+    found = client.get(f"/api/v1/books?keyword=저자C").json()["content"]
+    assert any(b["title"] == "대량2" for b in found)
+
+    ndjson_body = "\n".join([
+        json.dumps({"title": "대량1-수정", "authors": "저자A", "categories": "IT", "isbn": f"{prefix}-1", "price": 11000}),
+        "",
+        json.dumps({"title": "대량4", "authors": "저자F", "categories": "IT", "isbn": f"{prefix}-4", "price": 8000}),
+        "not json",
+    ])
+    response = client.post(
+        "/api/v1/books/import?mode=upsert", headers=admin,
+        files={"file": ("books.ndjson", ndjson_body.encode(), "application/x-ndjson")},
+    )
+    report = response.json()
+    assert (report["total"], report["inserted"], report["updated"], report["failed"]) == (3, 1, 1, 1)
+    found = {b["title"]: b for b in client.get(f"/api/v1/books?keyword=대량1").json()["content"]}
+    assert "대량1-수정" in found
+    # 행에 없던 필드(stock_quantity)는 기본값으로 덮이지 않음
+    assert found["대량1-수정"]["stock"] == 5
+
+    # 확인 직후 다른 요청이 같은 ISBN을 넣은 경우: 그 행만 오류, 나머지는 등록 (건너뛴 행은 inserted에 포함 안 됨)
+    from app.db.session import SessionLocal
+    from app.services.book_import import BookImporter
+    db = SessionLocal()
+    try:
+        importer = BookImporter(db, upsert_existing=False)
+        taken = {"title": "선점", "authors": "저자", "categories": "IT", "isbn": f"{prefix}-9", "price": 1000}
+        client.post("/api/v1/books/", json=taken, headers=admin)
+        fresh = dict(taken, title="신규", isbn=f"{prefix}-10")
+        assert importer._insert_new([(1, dict(taken, title="덮어쓰기")), (2, fresh)]) == [(2, fresh)]
+        db.commit()
+        assert (importer.failed, importer.errors[0]["row"]) == (1, 1)
+    finally:
+        db.close()
+    assert client.get(f"/api/v1/books?keyword=선점").json()["content"][0]["title"] == "선점"
+
+    # 관리자가 아니면 403
+    files = {"file": ("books.csv", csv_body.encode(), "text/csv")}
+    assert client.post("/api/v1/books/import", headers=get_auth_headers(), files=files).status_code == 403
+
+def test_lru_cache_evicts_least_recently_used():
+    """10-2. 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 제거"""
+    from app.core.cache import LRUCache
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)          # 1을 최근 사용으로 갱신
+    cache.set(3, "c")     # 2가 제거됨
+    assert cache.get(2) is None
+    assert cache.get(1) == "a" and cache.get(3) == "c"
+    expired = LRUCache(max_entries=2, ttl_seconds=0)
+    expired.set(1, "a")
+    assert expired.get(1) is None
+
+def test_single_flight_cache_coalesces_concurrent_calls():
+    """10-3. 같은 키의 동시 요청은 한 번만 계산하고 나머지는 결과를 기다려서 받음"""
+    import threading
+    from app.core.cache import SingleFlightCache
+    cache = SingleFlightCache(max_entries=8, ttl_seconds=60)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ["결과"]
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    for _ in range(500):
+        if cache.stats()["coalesced"] == 3:
+            break
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [["결과"]] * 4
+    assert cache.get_or_compute("k", compute) == ["결과"]
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 3, 1)
+
+def test_read_books_batch():
+    """10-5. 여러 권 조회: 요청 순서 유지, 중복 제거, 없는 id는 missingIds로 보고"""
+    ids = [b["id"] for b in client.get("/api/v1/books?size=3&sort=id,asc").json()["content"]]
+    requested = [ids[2], 99999999, ids[0], ids[2], ids[1]]
+    response = client.get(f"/api/v1/books/batch?ids={','.join(map(str, requested))}")
+    assert response.status_code == 200
+    data = response.json()
+    assert [b["id"] for b in data["content"]] == [ids[2], ids[0], ids[1]]
+    assert data["missingIds"] == [99999999]
+    assert client.get("/api/v1/books/batch?ids=1,abc").status_code == 400
+
 def test_read_book_not_found():
     """11. 없는 도서 조회 시 404 에러"""
     response = client.get("/api/v1/books/99999999")
@@ -165,6 +377,189 @@ def test_search_books():
     response = client.get("/api/v1/books?keyword=파이썬")
     assert response.status_code == 200
 
+def test_search_books_relevance_sort():
+    """12-1. 관련도 정렬: 제목 여러 번 > 제목 한 번 > 저자에만 있는 순서, 카테고리 필터 후 개수"""
+    admin = get_admin_headers()
+    word = f"관련{uuid.uuid4().hex[:6]}"
+    author_only = create_test_book(admin, title="다른 제목", authors=f"{word} 저자", categories="소설")
+    title_once = create_test_book(admin, title=f"{word} 입문", categories="IT")
+    title_twice = create_test_book(admin, title=f"{word} {word} 실전", categories="IT")
+
+    data = client.get(f"/api/v1/books?keyword={word}&sort=relevance,desc&size=100").json()
+    assert [b["id"] for b in data["content"]] == [title_twice["id"], title_once["id"], author_only["id"]]
+    assert data["totalElements"] == 3
+
+    data = client.get(f"/api/v1/books?keyword={word}&category=IT&sort=relevance,desc&size=1").json()
+    assert [b["id"] for b in data["content"]] == [title_twice["id"]]
+    assert data["totalElements"] == 2
+    data = client.get(f"/api/v1/books?keyword={word}&category=IT&sort=relevance,desc&size=1&cursor={data['nextCursor']}").json()
+    assert [b["id"] for b in data["content"]] == [title_once["id"]]
+    assert data["nextCursor"] is None
+
+def test_search_books_batches_large_hit_sets(monkeypatch):
+    """12-1-1. 검색 결과가 IN 묶음 크기보다 많아도 정렬/커서/카테고리/패싯 결과가 같음"""
+    from app.core.config import settings
+    admin = get_admin_headers()
+    word = f"묶음{uuid.uuid4().hex[:6]}"
+    books = [
+        create_test_book(admin, title=f"{word} {n}", price=price, categories="IT" if n % 2 else "소설")
+        for n, price in enumerate([30000, 10000, 50000, 20000, 40000, 10000, 25000])
+    ]
+    expected = [b["id"] for b in sorted(books, key=lambda b: (b["price"], b["id"]))]
+    expected_it = [b["id"] for b in sorted(books, key=lambda b: (b["price"], b["id"])) if "IT" in b["categories"]]
+    unbatched_facets = client.get(f"/api/v1/books?keyword={word}&facets=true").json()["facets"]
+
+    monkeypatch.setattr(settings, "SEARCH_ID_BATCH_SIZE", 2)
+    from app.services.facets import facet_cache
+    facet_cache.clear()
+
+    def follow(url):
+        ids, data = [], client.get(url).json()
+        ids += [b["id"] for b in data["content"]]
+        while data["nextCursor"]:
+            data = client.get(f"{url}&cursor={data['nextCursor']}").json()
+            ids += [b["id"] for b in data["content"]]
+        return ids
+
+    assert follow(f"/api/v1/books?keyword={word}&sort=price,asc&size=3") == expected
+    assert follow(f"/api/v1/books?keyword={word}&category=IT&sort=price,asc&size=2") == expected_it
+    page2 = client.get(f"/api/v1/books?keyword={word}&sort=price,asc&size=3&page=2").json()
+    assert [b["id"] for b in page2["content"]] == expected[3:6]
+    assert page2["totalElements"] == 7
+    data = client.get(f"/api/v1/books?keyword={word}&facets=true").json()
+    assert data["facets"] == unbatched_facets
+
+def test_search_books_category_exact_match():
+    """12-2. 카테고리는 부분 문자열이 아닌 정확히 일치하는 값만 검색"""
+    response = client.get("/api/v1/books?category=I")
+    assert response.status_code == 200
+    for book in response.json()["content"]:
+        assert "I" in [c.strip() for c in book["categories"].split(",")]
+
+@pytest.mark.parametrize("sort", ["created_at,desc", "price,asc", "title,desc"])
+def test_read_books_cursor_matches_offset(sort):
+    """12-3. 커서를 따라간 결과가 page/size 방식 결과와 같고 중복이 없음"""
+    first = client.get(f"/api/v1/books?size=7&sort={sort}").json()
+    seen = [b["id"] for b in first["content"]]
+    cursor = first["nextCursor"]
+    page = 1
+    while cursor and page < 5:
+        page += 1
+        data = client.get(f"/api/v1/books?size=7&sort={sort}&cursor={cursor}").json()
+        offset_data = client.get(f"/api/v1/books?size=7&sort={sort}&page={page}").json()
+        assert [b["id"] for b in data["content"]] == [b["id"] for b in offset_data["content"]]
+        seen += [b["id"] for b in data["content"]]
+        cursor = data["nextCursor"]
+    assert len(seen) == len(set(seen))
+
+def test_read_books_invalid_cursor():
+    """12-4. 잘못된 커서나 정렬 조건이 다른 커서는 400"""
+    assert client.get("/api/v1/books?cursor=not-a-cursor").status_code == 400
+    cursor = client.get("/api/v1/books?size=1&sort=price,asc").json()["nextCursor"]
+    if cursor:
+        response = client.get(f"/api/v1/books?size=1&sort=title,asc&cursor={cursor}")
+        assert response.status_code == 400
+
+def test_read_books_count_modes():
+    """12-5. count=estimate|exact는 같은 개수, count=none은 개수를 생략"""
+    estimate = client.get("/api/v1/books?count=estimate").json()
+    exact = client.get("/api/v1/books?count=exact").json()
+    assert estimate["totalElements"] == exact["totalElements"]
+    none = client.get("/api/v1/books?count=none").json()
+    assert none["totalElements"] is None and none["totalPages"] is None
+    assert client.get("/api/v1/books?count=wrong").status_code == 400
+
+def test_count_cache_invalidate_drops_inflight_value():
+    """12-6. 계산 도중 무효화되면 오래된 개수를 캐시에 저장하지 않음"""
+    from app.services.count_cache import CountCache, make_count_key
+    cache = CountCache(ttl_seconds=60)
+    key = make_count_key("Python  django", None)
+    assert key == make_count_key("django python", None)
+
+    def stale_count():
+        cache.invalidate()  # 계산 중에 도서가 변경된 상황
+        return 1
+    assert cache.get_or_compute(key, stale_count) == 1
+    assert cache.get(key) is None
+    assert cache.get_or_compute(key, lambda: 2) == 2
+    assert cache.get(key) == 2
+
+def test_category_filter_uses_normalized_categories():
+    """12-7. 등록/수정한 카테고리가 연결 테이블로 동기화되어 필터에 바로 반영됨"""
+    admin = get_admin_headers()
+    category = f"카테고리{uuid.uuid4().hex[:6]}"
+    book = create_test_book(admin, categories=f"IT, {category}")
+
+    data = client.get(f"/api/v1/books?category={category}").json()
+    assert [b["id"] for b in data["content"]] == [book["id"]]
+    assert data["totalElements"] == 1
+    # 다른 단어의 일부분("IT" 안의 "I")은 매칭되지 않음
+    assert book["id"] not in [b["id"] for b in client.get("/api/v1/books?category=I&size=100").json()["content"]]
+
+    client.patch(f"/api/v1/books/{book['id']}", json={"categories": "소설"}, headers=admin)
+    data = client.get(f"/api/v1/books?category={category}").json()
+    assert data["content"] == [] and data["totalElements"] == 0
+
+def test_read_books_facets():
+    """12-9. facets=true: 카테고리별 개수와 가격 구간 개수가 검색 결과와 일치"""
+    admin = get_admin_headers()
+    word = f"패싯{uuid.uuid4().hex[:6]}"
+    create_test_book(admin, title=f"{word} 하나", categories="IT,과학", price=5000)
+    create_test_book(admin, title=f"{word} 둘", categories="IT", price=25000)
+
+    data = client.get(f"/api/v1/books?keyword={word}&facets=true").json()
+    assert data["totalElements"] == 2
+    assert {c["name"]: c["count"] for c in data["facets"]["categories"]} == {"IT": 2, "과학": 1}
+    buckets = data["facets"]["priceBuckets"]
+    assert sum(b["count"] for b in buckets) == 2
+    assert buckets[0]["count"] == 1 and buckets[0]["min"] == 0
+    assert buckets[-1]["max"] is None
+    # 기본값은 패싯 미포함
+    assert client.get(f"/api/v1/books?keyword={word}").json()["facets"] is None
+
+    # 도서가 추가되면 카탈로그 버전이 바뀌어 캐시된 패싯도 새로 계산됨
+    create_test_book(admin, title=f"{word} 셋", categories="소설", price=25000)
+    data = client.get(f"/api/v1/books?keyword={word}&facets=true").json()
+    assert {c["name"]: c["count"] for c in data["facets"]["categories"]} == {"IT": 2, "과학": 1, "소설": 1}
+
+def test_autocomplete_titles_and_authors():
+    """12-10. 자동완성: 제목 전체/단어 시작 접두어, 저자 이름, 수정/삭제 즉시 반영"""
+    admin = get_admin_headers()
+    word = f"자동{uuid.uuid4().hex[:6]}"
+    client.get("/api/v1/books/autocomplete?q=warmup")  # 색인 적재 후 등록해도 반영되는지 확인
+    book = create_test_book(admin, title=f"{word} 완성 입문", authors=f"{word}저자")
+
+    suggestions = client.get(f"/api/v1/books/autocomplete?q={word.upper()}").json()
+    assert {"text": f"{word} 완성 입문", "type": "title"} in suggestions
+    assert {"text": f"{word}저자", "type": "author"} in suggestions
+    # 전체 문자열 접두어 일치가 먼저
+    assert suggestions[0]["text"].startswith(word)
+
+    word_start = client.get(f"/api/v1/books/autocomplete?q={word} 완").json()
+    assert word_start == [{"text": f"{word} 완성 입문", "type": "title"}]
+
+    client.patch(f"/api/v1/books/{book['id']}", json={"title": f"{word} 바뀐 제목"}, headers=admin)
+    texts = [s["text"] for s in client.get(f"/api/v1/books/autocomplete?q={word}").json()]
+    assert f"{word} 바뀐 제목" in texts and f"{word} 완성 입문" not in texts
+
+    client.delete(f"/api/v1/books/{book['id']}", headers=admin)
+    assert client.get(f"/api/v1/books/autocomplete?q={word}").json() == []
+
+def test_backfill_book_taxonomy_is_idempotent():
+    """12-8. 쉼표 문자열 -> 연결 테이블 이관은 여러 번 실행해도 결과가 같음"""
+    from app.db.session import SessionLocal
+    from app.models.book import book_categories
+    from app.services.taxonomy import backfill_book_taxonomy
+
+    db = SessionLocal()
+    try:
+        backfill_book_taxonomy(db, batch_size=50)
+        first = db.query(book_categories).count()
+        backfill_book_taxonomy(db, batch_size=50)
+        assert db.query(book_categories).count() == first > 0
+    finally:
+        db.close()
+
 # ==========================================
 # 4. 장바구니 & 주문 (Cart/Order) 테스트 (4개)
 # ==========================================
@@ -192,6 +587,55 @@ def test_read_cart():
     assert response.status_code == 200
     assert len(response.json()["items"]) > 0
 
+def test_cart_upsert_and_single_query_read():
+    """14-1. 같은 책을 다시 담으면 수량 합산(한 줄 유지), 장바구니 조회는 품목 수와 상관없이 쿼리 1개"""
+    headers = get_auth_headers()
+    books = client.get("/api/v1/books?size=5&sort=id,asc").json()["content"]
+    first = client.post("/api/v1/cart/", json={"book_id": books[0]["id"], "quantity": 2}, headers=headers)
+    again = client.post("/api/v1/cart/", json={"book_id": books[0]["id"], "quantity": 3}, headers=headers)
+    assert again.json()["id"] == first.json()["id"]
+    assert again.json()["quantity"] == 5
+
+    _, one_line = count_queries(lambda: client.get("/api/v1/cart/", headers=headers))
+    for book in books[1:]:
+        client.post("/api/v1/cart/", json={"book_id": book["id"], "quantity": 1}, headers=headers)
+    response, many_lines = count_queries(lambda: client.get("/api/v1/cart/", headers=headers))
+    data = response.json()
+    assert [item["book"]["id"] for item in data["items"]] == [b["id"] for b in books]
+    assert data["total_price"] == books[0]["price"] * 5 + sum(b["price"] for b in books[1:])
+    assert one_line == many_lines
+
+def test_cart_bulk_operations():
+    """14-2. 장바구니 일괄 변경: add/set/remove를 한 번에 적용하고 결과 장바구니 반환"""
+    headers = get_auth_headers()
+    books = client.get("/api/v1/books?size=4&sort=id,asc").json()["content"]
+    ids = [b["id"] for b in books]
+    client.post("/api/v1/cart/", json={"book_id": ids[0], "quantity": 1}, headers=headers)
+    client.post("/api/v1/cart/", json={"book_id": ids[1], "quantity": 1}, headers=headers)
+
+    operations = [
+        {"op": "add", "book_id": ids[0], "quantity": 2},
+        {"op": "remove", "book_id": ids[1]},
+        {"op": "set", "book_id": ids[2], "quantity": 4},
+        {"op": "add", "book_id": ids[3]},
+        {"op": "add", "book_id": ids[3], "quantity": 2},
+    ]
+    response = client.post("/api/v1/cart/bulk", json={"operations": operations}, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert {i["book"]["id"]: i["quantity"] for i in data["items"]} == {ids[0]: 3, ids[2]: 4, ids[3]: 3}
+    assert data["total_price"] == books[0]["price"] * 3 + books[2]["price"] * 4 + books[3]["price"] * 3
+    assert client.get("/api/v1/cart/", headers=headers).json() == data
+
+    # 없는 책이 섞여 있으면 404 + 없는 id 목록, 장바구니는 그대로
+    bad = client.post("/api/v1/cart/bulk", json={"operations": [
+        {"op": "set", "book_id": ids[0], "quantity": 9},
+        {"op": "add", "book_id": 99999999},
+    ]}, headers=headers)
+    assert bad.status_code == 404
+    assert bad.json()["details"]["missingIds"] == [99999999]
+    assert client.get("/api/v1/cart/", headers=headers).json() == data
+
 def test_create_order_empty_cart():
     """15. 빈 장바구니로 주문 시 400 에러"""
     headers = get_auth_headers()
@@ -222,6 +666,481 @@ def test_create_order_success():
     assert response.status_code == 201
     assert response.json()["status"] == "CREATED"
 
+def test_create_order_query_count_independent_of_cart_size():
+    """16-1. 주문 생성: 품목 수와 상관없이 SQL 개수가 같고, 금액/품목이 정확함"""
+    payload = {"recipient_name": "테스터", "recipient_phone": "010-1234-5678", "shipping_address": "부산"}
+    # 시드 도서의 재고에 기대지 않도록 재고가 있는 도서를 직접 만듦
+    admin = get_admin_headers()
+    books = [create_test_book(admin) for _ in range(6)]
+    counts = []
+    for lines in (1, 6):
+        headers = get_auth_headers()
+        for book in books[:lines]:
+            client.post("/api/v1/cart/", json={"book_id": book["id"], "quantity": 2}, headers=headers)
+        response, queries = count_queries(lambda: client.post("/api/v1/orders/", json=payload, headers=headers))
+        assert response.status_code == 201
+        data = response.json()
+        assert [i["book_id"] for i in data["items"]] == [b["id"] for b in books[:lines]]
+        assert data["total_price"] == sum(b["price"] * 2 for b in books[:lines])
+        assert client.get("/api/v1/cart/", headers=headers).json()["items"] == []
+        counts.append(queries)
+    assert counts[0] == counts[1]
+
+def test_order_reserves_and_releases_stock():
+    """16-2. 주문 시 재고 차감, 부족하면 409 + 품목별 부족 수량, 취소 시 재고 복구"""
+    payload = {"recipient_name": "테스터", "recipient_phone": "010-1234-5678", "shipping_address": "부산"}
+    admin = get_admin_headers()
+    hot = create_test_book(admin, stock_quantity=3)
+    other = create_test_book(admin, stock_quantity=10)
+
+    listing = client.get("/api/v1/books?size=3&sort=id,desc")
+    versions_before = listing_versions()
+    first = get_auth_headers()
+    client.post("/api/v1/cart/", json={"book_id": hot["id"], "quantity": 2}, headers=first)
+    order = client.post("/api/v1/orders/", json=payload, headers=first)
+    assert order.status_code == 201
+    # 주문 응답의 도서 정보도 차감 후 재고
+    assert order.json()["items"][0]["book"]["stock"] == 1
+    # 재고 변경은 도서 통계 버전만 올림 (카탈로그 버전 = 패싯 캐시 키는 그대로)
+    versions_after = listing_versions()
+    assert versions_after[0] == versions_before[0] and versions_after[1] == versions_before[1] + 1
+    assert client.get(f"/api/v1/books/{hot['id']}").json()["stock"] == 1
+    # 목록 응답에도 재고가 있으므로 주문 후에는 이전 ETag로 304가 나오지 않음
+    refreshed = client.get("/api/v1/books?size=3&sort=id,desc", headers={"If-None-Match": listing.headers["ETag"]})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["content"][0]["stock"] == 10  # 가장 최근 도서(other)
+
+    second = get_auth_headers()
+    client.post("/api/v1/cart/", json={"book_id": hot["id"], "quantity": 2}, headers=second)
+    client.post("/api/v1/cart/", json={"book_id": other["id"], "quantity": 1}, headers=second)
+    response = client.post("/api/v1/orders/", json=payload, headers=second)
+    assert response.status_code == 409
+    assert response.json()["details"]["shortages"] == [{"book_id": hot["id"], "requested": 2, "available": 1}]
+    # 전체가 취소되므로 다른 품목 재고와 장바구니는 그대로
+    assert client.get(f"/api/v1/books/{other['id']}").json()["stock"] == 10
+    assert len(client.get("/api/v1/cart/", headers=second).json()["items"]) == 2
+
+    listing = client.get("/api/v1/books?size=3&sort=id,desc")
+    cancel = client.post(f"/api/v1/orders/{order.json()['id']}/cancel", headers=first)
+    assert cancel.status_code == 200
+    assert cancel.json()["status"] == "CANCELED"
+    assert client.get(f"/api/v1/books/{hot['id']}").json()["stock"] == 3
+    assert client.get(
+        "/api/v1/books?size=3&sort=id,desc", headers={"If-None-Match": listing.headers["ETag"]}
+    ).json()["content"][1]["stock"] == 3
+    # 두 번 취소해도 재고는 한 번만 복구
+    assert client.post(f"/api/v1/orders/{order.json()['id']}/cancel", headers=first).status_code == 400
+    assert client.get(f"/api/v1/books/{hot['id']}").json()["stock"] == 3
+
+def test_book_price_cannot_be_cleared():
+    """16-2-1. 가격은 null로 지울 수 없음 (가격 없는 도서는 주문 금액/가격 정렬 커서를 깨뜨림)"""
+    admin = get_admin_headers()
+    book = create_test_book(admin, stock_quantity=5)
+    assert client.patch(f"/api/v1/books/{book['id']}", json={"price": None}, headers=admin).status_code == 400
+    assert client.patch(f"/api/v1/books/{book['id']}", json={"stock_quantity": 4}, headers=admin).status_code == 200
+    assert client.get(f"/api/v1/books/{book['id']}").json()["price"] == book["price"]
+
+def test_read_my_orders_paginated():
+    """16-3. 내 주문 내역: 커서 페이지네이션 + 상태/기간 필터, 페이지당 쿼리 수 일정"""
+    payload = {"recipient_name": "테스터", "recipient_phone": "010-1234-5678", "shipping_address": "부산"}
+    admin = get_admin_headers()
+    books = [create_test_book(admin) for _ in range(3)]
+    headers = get_auth_headers()
+    order_ids = []
+    for lines in (1, 2, 3):
+        for book in books[:lines]:
+            client.post("/api/v1/cart/", json={"book_id": book["id"], "quantity": 1}, headers=headers)
+        order_ids.append(client.post("/api/v1/orders/", json=payload, headers=headers).json()["id"])
+    client.post(f"/api/v1/orders/{order_ids[0]}/cancel", headers=headers)
+
+    first, first_queries = count_queries(lambda: client.get("/api/v1/orders/?size=2", headers=headers))
+    assert first.status_code == 200
+    data = first.json()
+    assert [o["id"] for o in data["content"]] == order_ids[:0:-1]
+    assert [len(o["items"]) for o in data["content"]] == [3, 2]
+    second, second_queries = count_queries(
+        lambda: client.get(f"/api/v1/orders/?size=2&cursor={data['nextCursor']}", headers=headers)
+    )
+    assert [o["id"] for o in second.json()["content"]] == order_ids[:1]
+    assert second.json()["nextCursor"] is None
+    assert first_queries == second_queries
+
+    canceled = client.get("/api/v1/orders/?status=CANCELED", headers=headers).json()["content"]
+    assert [o["id"] for o in canceled] == order_ids[:1]
+    assert len(client.get("/api/v1/orders/?from=2000-01-01", headers=headers).json()["content"]) == 3
+    assert client.get("/api/v1/orders/?to=2000-01-01", headers=headers).json()["content"] == []
+    assert client.get("/api/v1/orders/?cursor=invalid", headers=headers).status_code == 400
+
+def test_idempotency_key_replays_first_response():
+    """16-4. 같은 Idempotency-Key로 재시도하면 첫 응답을 재사용 (중복 담기/중복 주문 방지)"""
+    payload = {"recipient_name": "테스터", "recipient_phone": "010-1234-5678", "shipping_address": "부산"}
+    headers = get_auth_headers()
+    book_id = get_valid_book_id()
+
+    cart_headers = dict(headers, **{"Idempotency-Key": str(uuid.uuid4())})
+    first = client.post("/api/v1/cart/", json={"book_id": book_id, "quantity": 2}, headers=cart_headers)
+    retry = client.post("/api/v1/cart/", json={"book_id": book_id, "quantity": 2}, headers=cart_headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert client.get("/api/v1/cart/", headers=headers).json()["items"][0]["quantity"] == 2
+    # 같은 키, 다른 본문은 거절
+    other = client.post("/api/v1/cart/", json={"book_id": book_id, "quantity": 5}, headers=cart_headers)
+    assert other.status_code == 422
+
+    order_headers = dict(headers, **{"Idempotency-Key": str(uuid.uuid4())})
+    first = client.post("/api/v1/orders/", json=payload, headers=order_headers)
+    retry = client.post("/api/v1/orders/", json=payload, headers=order_headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json()["id"] == first.json()["id"]
+    assert len(client.get("/api/v1/orders/", headers=headers).json()["content"]) == 1
+    # 다른 사용자의 같은 키는 별개 요청
+    other_user = dict(get_auth_headers(), **{"Idempotency-Key": order_headers["Idempotency-Key"]})
+    assert client.post("/api/v1/orders/", json=payload, headers=other_user).status_code == 400
+
+def test_idempotency_keys_are_shared_across_processes():
+    """16-4. 저장된 응답과 처리 중 선점은 DB에 있으므로 다른 워커/재시작 후에도 재사용"""
+    from app.core.config import settings
+    from app.core.idempotency import IdempotencyStore, StoredResponse
+    from app.db.session import SessionLocal
+
+    def new_store():
+        # 프로세스마다 따로 만들어지는 저장소를 흉내 (메모리 상태 공유 없음)
+        return IdempotencyStore(SessionLocal, settings.IDEMPOTENCY_TTL_SECONDS, 300, 3600)
+
+    headers = get_auth_headers()
+    user_id = int(client.get("/api/v1/users/me", headers=headers).json()["id"])
+    key = str(uuid.uuid4())
+    first, second = new_store(), new_store()
+    assert first.begin(user_id, key, "hash-a")[0] == first.NEW
+    # 다른 워커로 온 재시도는 처리 중(409) / 다른 본문은 422
+    assert second.begin(user_id, key, "hash-a")[0] == second.IN_FLIGHT
+    assert second.begin(user_id, key, "hash-b")[0] == second.MISMATCH
+    stored_headers = [("content-type", "application/json"), ("set-cookie", "a=1"), ("set-cookie", "b=2")]
+    first.complete(user_id, key, StoredResponse("hash-a", 201, b'{"id":1}', stored_headers))
+    state, stored = new_store().begin(user_id, key, "hash-a")
+    assert state == first.REPLAY
+    assert (stored.status_code, stored.body, stored.headers) == (201, b'{"id":1}', stored_headers)
+
+    # 실패한 요청의 선점은 풀려서 다시 처리 가능
+    failed_key = str(uuid.uuid4())
+    assert first.begin(user_id, failed_key, "hash-a")[0] == first.NEW
+    first.abort(user_id, failed_key)
+    assert second.begin(user_id, failed_key, "hash-a")[0] == second.NEW
+
+    # 처리 중인 채로 멈춘 선점(프로세스 중단)은 제한 시간이 지나면 다시 선점 가능
+    stale_key = str(uuid.uuid4())
+    assert first.begin(user_id, stale_key, "hash-a")[0] == first.NEW
+    expired = IdempotencyStore(SessionLocal, settings.IDEMPOTENCY_TTL_SECONDS, -1, 3600)
+    assert expired.begin(user_id, stale_key, "hash-a")[0] == expired.NEW
+
+    # 재사용된 응답은 첫 응답의 헤더를 그대로 돌려줌
+    cart_headers = dict(headers, **{"Idempotency-Key": str(uuid.uuid4())})
+    body = {"book_id": get_valid_book_id(), "quantity": 1}
+    original = client.post("/api/v1/cart/", json=body, headers=cart_headers)
+    retry = client.post("/api/v1/cart/", json=body, headers=cart_headers)
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.headers["content-type"] == original.headers["content-type"]
+    assert retry.headers["content-length"] == original.headers["content-length"]
+
+def test_order_post_processing_runs_on_job_queue():
+    """16-5. 주문 후처리는 작업 큐에 등록되고 워커가 처리, 실패하면 백오프 후 재시도"""
+    from app.db.session import SessionLocal
+    from app.models.job import Job, JobStatus
+    from app.services.jobs import after_commit, enqueue, job_queue
+
+    payload = {"recipient_name": "테스터", "recipient_phone": "010-1234-5678", "shipping_address": "부산"}
+    headers = get_auth_headers()
+    client.post("/api/v1/cart/", json={"book_id": get_valid_book_id(), "quantity": 1}, headers=headers)
+    order_id = client.post("/api/v1/orders/", json=payload, headers=headers).json()["id"]
+
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(
+            Job.kind == "order.notify", Job.payload.contains(f'"order_id":{order_id},')
+        ).one()
+        assert job.kind == "order.notify" and job.status == JobStatus.PENDING
+        job_queue.run_pending()
+        db.refresh(job)
+        assert job.status == JobStatus.DONE and job.attempts == 1
+
+        calls = []
+        @job_queue.handler("test.flaky")
+        def flaky(session, data):
+            calls.append(data)
+            after_commit(session, lambda: calls.append("after_commit"))
+            raise RuntimeError("일시적 오류")
+        failing = enqueue(db, "test.flaky", {"n": 1})
+        db.commit()
+        job_queue.run_pending()
+        db.refresh(failing)
+        # 재시도 시각이 뒤로 밀려 있어서 바로 다시 실행되지 않음
+        assert calls == [{"n": 1}]
+        assert failing.status == JobStatus.PENDING and failing.attempts == 1
+        assert "일시적 오류" in failing.last_error
+        assert job_queue.run_pending() == 0
+        db.delete(failing)
+        db.commit()
+
+        # after_commit으로 등록한 후처리는 핸들러의 변경이 commit된 뒤에 실행 (실패한 작업은 위처럼 실행 안 함)
+        seen = []
+        def job_status(job_id):
+            other = SessionLocal()
+            try:
+                return other.get(Job, job_id).status
+            finally:
+                other.close()
+        @job_queue.handler("test.after_commit")
+        def with_callback(session, data):
+            after_commit(session, lambda: seen.append(job_status(data["id"])))
+        marker = enqueue(db, "test.after_commit", {})
+        db.flush()
+        marker.payload = json.dumps({"id": marker.id})
+        db.commit()
+        job_queue.run_pending()
+        assert seen == [JobStatus.DONE]
+
+        # 다른 프로세스가 실행 중에 죽어 RUNNING으로 남은 작업은 동작 중인 워커 루프가 주기적으로 되살림
+        from datetime import timedelta
+        from app.services.jobs import utcnow
+        stuck = enqueue(db, "order.notify", {"order_id": order_id, "event": "created"})
+        stuck.status, stuck.started_at, stuck.attempts = JobStatus.RUNNING, utcnow() - timedelta(hours=1), 1
+        db.commit()
+        job_queue._last_recovery = 0.0  # 확인 주기가 지난 것으로
+        job_queue._maybe_recover_stale()
+        db.refresh(stuck)
+        assert stuck.status == JobStatus.PENDING
+        job_queue.run_pending()
+        db.refresh(stuck)
+        assert stuck.status == JobStatus.DONE
+    finally:
+        db.close()
+
+    stats = client.get("/api/v1/stats/jobs", headers=get_admin_headers())
+    assert stats.status_code == 200
+    assert stats.json()["depth"]["DONE"] >= 1
+    assert stats.json()["retried"] >= 1
+
+def test_daily_sales_rollup():
+    """16-6. 일별 매출: 작업 큐가 집계 테이블에 증감 반영 (취소 제외), 재계산 결과와 일치"""
+    from app.db.session import SessionLocal
+    from app.api.v1.endpoints.stats import stats_cache
+    from app.services.daily_sales import rebuild_daily_sales
+    from app.services.jobs import job_queue
+
+    admin = get_admin_headers()
+    payload = {"recipient_name": "테스터", "recipient_phone": "010-1234-5678", "shipping_address": "부산"}
+    job_queue.run_pending()
+    before = {r["date"]: r for r in client.get("/api/v1/stats/daily", headers=admin).json()}
+
+    headers = get_auth_headers()
+    book = create_test_book(admin, price=12000)
+    order_ids = []
+    for _ in range(2):
+        client.post("/api/v1/cart/", json={"book_id": book["id"], "quantity": 1}, headers=headers)
+        order_ids.append(client.post("/api/v1/orders/", json=payload, headers=headers).json()["id"])
+    client.post(f"/api/v1/orders/{order_ids[1]}/cancel", headers=headers)
+    job_queue.run_pending()
+    # 통계 결과 캐시는 TTL 동안 이전 결과를 주므로 비우고 확인
+    stats_cache.clear()
+
+    after = client.get("/api/v1/stats/daily", headers=admin).json()
+    changed = [r for r in after if before.get(r["date"]) != r]
+    assert len(changed) == 1
+    today = changed[0]
+    previous = before.get(today["date"], {"total_sales": 0, "order_count": 0})
+    assert today["order_count"] - previous["order_count"] == 1
+    assert today["total_sales"] - previous["total_sales"] == 12000
+
+    # 기간 필터
+    assert client.get(f"/api/v1/stats/daily?from={today['date']}&to={today['date']}", headers=admin).json() == [today]
+    assert client.get("/api/v1/stats/daily?to=2000-01-01", headers=admin).json() == []
+    assert client.get("/api/v1/stats/daily?from=2000-01-02&to=2000-01-01", headers=admin).status_code == 400
+
+    # orders에서 다시 계산해도 같은 결과
+    db = SessionLocal()
+    try:
+        rebuild_daily_sales(db)
+    finally:
+        db.close()
+    stats_cache.clear()
+    assert client.get("/api/v1/stats/daily", headers=admin).json() == after
+
+    # 집계 작업이 대기 중인 주문이 있을 때 재계산해도, 이후 워커가 돌면서 두 번 더하지 않음
+    client.post("/api/v1/cart/", json={"book_id": book["id"], "quantity": 1}, headers=headers)
+    client.post("/api/v1/orders/", json=payload, headers=headers)
+    db = SessionLocal()
+    try:
+        rebuild_daily_sales(db)
+    finally:
+        db.close()
+    job_queue.run_pending()
+    stats_cache.clear()
+    rebuilt = {r["date"]: r for r in client.get("/api/v1/stats/daily", headers=admin).json()}[today["date"]]
+    assert rebuilt["order_count"] == today["order_count"] + 1
+    assert rebuilt["total_sales"] == today["total_sales"] + 12000
+
+def test_top_sellers_leaderboard(monkeypatch):
+    """16-7. 판매 순위: 집계 테이블 기반, 취소 제외, 기간/카테고리별"""
+    from app.db.session import SessionLocal
+    from app.services.jobs import job_queue
+    from app.services.top_sellers import load_top_sellers, rebuild_book_sales, top_sellers
+
+    admin = get_admin_headers()
+    category = f"순위{uuid.uuid4().hex[:6]}"
+    best = create_test_book(admin, categories=category)
+    second = create_test_book(admin, categories=category)
+    payload = {"recipient_name": "테스터", "recipient_phone": "010-1234-5678", "shipping_address": "부산"}
+    headers = get_auth_headers()
+    for book_id, quantity, cancel in ((best["id"], 3, False), (second["id"], 1, False), (second["id"], 5, True)):
+        client.post("/api/v1/cart/", json={"book_id": book_id, "quantity": quantity}, headers=headers)
+        order_id = client.post("/api/v1/orders/", json=payload, headers=headers).json()["id"]
+        if cancel:
+            client.post(f"/api/v1/orders/{order_id}/cancel", headers=headers)
+    job_queue.run_pending()
+
+    expected = [
+        {"book_id": best["id"], "title": best["title"], "total_sold": 3},
+        {"book_id": second["id"], "title": second["title"], "total_sold": 1},
+    ]
+    for window in ("7d", "30d", "all"):
+        response = client.get(f"/api/v1/stats/top-sellers?window={window}&category={category}&limit=10", headers=admin)
+        assert response.status_code == 200
+        assert response.json() == expected
+    assert client.get(f"/api/v1/stats/top-sellers?category={category}&limit=1", headers=admin).json() == expected[:1]
+    assert client.get("/api/v1/stats/top-sellers?window=1y", headers=admin).status_code == 400
+
+    # order_items에서 다시 계산해도 같은 결과
+    db = SessionLocal()
+    try:
+        before = load_top_sellers(db, "all", None, 100)
+        rebuild_book_sales(db)
+        assert load_top_sellers(db, "all", None, 100) == before
+        assert load_top_sellers(db, "7d", category, 100) == expected
+    finally:
+        db.close()
+
+    # 집계 작업이 대기 중인 주문이 있을 때 재계산해도, 이후 워커가 돌면서 두 번 더하지 않음
+    client.post("/api/v1/cart/", json={"book_id": second["id"], "quantity": 4}, headers=headers)
+    client.post("/api/v1/orders/", json=payload, headers=headers)
+    db = SessionLocal()
+    try:
+        rebuild_book_sales(db)
+    finally:
+        db.close()
+    job_queue.run_pending()
+    db = SessionLocal()
+    try:
+        totals = {row["book_id"]: row["total_sold"] for row in load_top_sellers(db, "all", category, 100)}
+    finally:
+        db.close()
+    assert totals == {best["id"]: 3, second["id"]: 5}
+    # 판매량이 바뀌면 다음 조회에 바로 반영 (순위판 캐시 위에 결과 캐시를 두지 않음)
+    monkeypatch.setattr(top_sellers, "_min_refresh", 0)
+    response = client.get(f"/api/v1/stats/top-sellers?category={category}&limit=10", headers=admin).json()
+    assert {row["book_id"]: row["total_sold"] for row in response} == totals
+
+def test_export_orders_streaming():
+    """16-8. 내보내기: 주문/품목/일별 매출을 CSV, NDJSON으로 (기간 필터)"""
+    import csv
+    import io
+    from app.api.v1.endpoints.stats import stats_cache
+    from app.services.jobs import job_queue
+
+    admin = get_admin_headers()
+    payload = {"recipient_name": "테스터", "recipient_phone": "010-1234-5678", "shipping_address": "부산"}
+    headers = get_auth_headers()
+    book_id = get_valid_book_id()
+    client.post("/api/v1/cart/", json={"book_id": book_id, "quantity": 2}, headers=headers)
+    order = client.post("/api/v1/orders/", json=payload, headers=headers).json()
+    job_queue.run_pending()
+
+    response = client.get("/api/v1/stats/export/orders?format=csv", headers=admin)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="orders.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    mine = [r for r in rows if r["id"] == str(order["id"])]
+    assert len(mine) == 1 and mine[0]["status"] == "CREATED"
+    assert float(mine[0]["total_price"]) == order["total_price"]
+
+    response = client.get("/api/v1/stats/export/order-items?format=ndjson", headers=admin)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert [(i["book_id"], i["quantity"]) for i in items if i["order_id"] == order["id"]] == [(book_id, 2)]
+
+    stats_cache.clear()
+    daily = client.get("/api/v1/stats/daily", headers=admin).json()
+    exported = client.get("/api/v1/stats/export/daily-sales?format=ndjson", headers=admin).text.splitlines()
+    assert [json.loads(line)["date"] for line in exported] == [d["date"] for d in daily]
+
+    # 기간 필터 / 잘못된 형식
+    empty = client.get("/api/v1/stats/export/orders?to=2000-01-01", headers=admin).text
+    assert empty.strip() == "id,user_id,status,total_price,recipient_name,shipping_address,created_at"
+    assert client.get("/api/v1/stats/export/orders?format=xml", headers=admin).status_code == 400
+    assert client.get("/api/v1/stats/export/orders", headers=headers).status_code == 403
+
+def test_revenue_analytics():
+    """16-9. 매출 분석: 벡터 연산 결과가 주문 데이터와 일치 (취소 제외)"""
+    from datetime import date, datetime
+    from app.db.session import SessionLocal
+    from app.models.order import Order, OrderStatus
+    from app.services.analytics import compute_revenue_analytics
+
+    admin = get_admin_headers()
+    category = f"분석{uuid.uuid4().hex[:6]}"
+    book = create_test_book(admin, categories=f"{category},IT", price=10000)
+    payload = {"recipient_name": "테스터", "recipient_phone": "010-1234-5678", "shipping_address": "부산"}
+    headers = get_auth_headers()
+    for quantity, cancel in ((3, False), (4, True)):
+        client.post("/api/v1/cart/", json={"book_id": book["id"], "quantity": quantity}, headers=headers)
+        order_id = client.post("/api/v1/orders/", json=payload, headers=headers).json()["id"]
+        if cancel:
+            client.post(f"/api/v1/orders/{order_id}/cancel", headers=headers)
+
+    db = SessionLocal()
+    try:
+        report = compute_revenue_analytics(db, None, None)
+        totals = [float(t) for (t,) in db.query(Order.total_price).filter(Order.status != OrderStatus.CANCELED)]
+    finally:
+        db.close()
+
+    assert report["summary"]["order_count"] == len(totals)
+    assert report["summary"]["revenue"] == round(sum(totals), 2)
+    assert {"category": category, "revenue": 30000.0, "quantity": 3} in report["revenue_by_category"]
+    assert sum(b["count"] for b in report["order_value_distribution"]) == len(totals)
+    assert sum(w["order_count"] for w in report["weekly"]) == len(totals)
+    assert round(sum(w["revenue"] for w in report["weekly"]), 2) == round(sum(totals), 2)
+    assert report["weekly"][0]["growth"] is None
+    assert report["basket_size"]["p99"] >= report["basket_size"]["p50"] >= 1
+
+    # 주문이 없는 주도 0으로 채워서 성장률은 실제 전주와 비교 (전주 매출이 0이면 null)
+    weekly_headers = get_auth_headers()
+    weekly_ids = []
+    for quantity in (2, 3):
+        client.post("/api/v1/cart/", json={"book_id": book["id"], "quantity": quantity}, headers=weekly_headers)
+        weekly_ids.append(client.post("/api/v1/orders/", json=payload, headers=weekly_headers).json()["id"])
+    db = SessionLocal()
+    try:
+        # 2001-01-01, 2001-01-15 (둘 다 월요일, 사이에 주문 없는 한 주)
+        for order_id, created_at in zip(weekly_ids, (datetime(2001, 1, 1, 10), datetime(2001, 1, 17, 10))):
+            db.query(Order).filter(Order.id == order_id).update({Order.created_at: created_at})
+        db.commit()
+        weekly = compute_revenue_analytics(db, date(2001, 1, 1), date(2001, 1, 28))["weekly"]
+    finally:
+        db.close()
+    assert [(w["week_start"], w["revenue"], w["growth"]) for w in weekly] == [
+        ("2001-01-01", 20000.0, None),
+        ("2001-01-08", 0.0, -1.0),
+        ("2001-01-15", 30000.0, None),
+        ("2001-01-22", 0.0, -1.0),
+    ]
+
+    response = client.get("/api/v1/stats/analytics?to=2000-01-01", headers=admin)
+    assert response.status_code == 200
+    assert response.json()["summary"] == {"order_count": 0, "revenue": 0.0, "avg_order_value": 0.0}
+    assert client.get("/api/v1/stats/analytics", headers=admin).status_code == 200
+
 # ==========================================
 # 5. 리뷰 및 기타 기능 테스트 (4개)
 # ==========================================
@@ -241,7 +1160,75 @@ def test_read_reviews():
     book_id = get_valid_book_id()
     response = client.get(f"/api/v1/books/{book_id}/reviews")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["content"], list)
+
+# 18-0. 리뷰 목록 커서 페이지네이션 (최신순 / 평점순) + 작성자 이름 + 평점 분포
+def test_read_reviews_paginated():
+    admin = get_admin_headers()
+    headers = get_auth_headers()
+    me = client.get("/api/v1/users/me", headers=headers).json()
+    book = create_test_book(admin)
+    for rating in (3, 5, 1, 5, 4):
+        client.post(f"/api/v1/books/{book['id']}/reviews", json={"rating": rating, "content": "리뷰"}, headers=headers)
+
+    url = f"/api/v1/books/{book['id']}/reviews"
+    first = client.get(f"{url}?sort=rating&size=2").json()
+    assert [r["rating"] for r in first["content"]] == [5, 5]
+    assert first["content"][0]["user_name"] == me["name"]
+    assert [b["count"] for b in first["ratingHistogram"]] == [1, 0, 1, 1, 2]
+
+    ratings = [r["rating"] for r in first["content"]]
+    cursor = first["nextCursor"]
+    while cursor:
+        page = client.get(f"{url}?sort=rating&size=2&cursor={cursor}").json()
+        assert page["ratingHistogram"] is None
+        ratings += [r["rating"] for r in page["content"]]
+        cursor = page["nextCursor"]
+    assert ratings == [5, 5, 4, 3, 1]
+
+    newest = client.get(f"{url}?size=5").json()
+    ids = [r["id"] for r in newest["content"]]
+    assert ids == sorted(ids, reverse=True) and newest["nextCursor"] is None
+
+    # 작성자 이름을 리뷰마다 따로 조회하지 않음 (리뷰 목록 1 + 평점 분포 1)
+    _, statements = count_queries(lambda: client.get(f"{url}?size=5"))
+    assert statements <= 2
+    # 다른 정렬의 커서는 400
+    assert client.get(f"{url}?sort=newest&cursor={first['nextCursor']}").status_code == 400
+
+# 18-1. 리뷰 작성/수정/삭제 시 도서 평점 집계가 함께 갱신되고 평점순 정렬에 반영
+def test_review_rating_aggregates():
+    admin = get_admin_headers()
+    headers = get_auth_headers()
+    book = create_test_book(admin)
+    assert book["rating_avg"] == 0 and book["rating_count"] == 0
+
+    listing = client.get("/api/v1/books?sort=rating_avg,asc&size=3")
+    catalog_version = listing_versions()[0]
+    first = client.post(f"/api/v1/books/{book['id']}/reviews", json={"rating": 5, "content": "최고"}, headers=headers).json()
+    # 평점 집계 변경은 카탈로그 버전(패싯 캐시 키)을 올리지 않음
+    assert listing_versions()[0] == catalog_version
+    # 평점 집계가 바뀌면 목록 ETag도 바뀜
+    assert client.get(
+        "/api/v1/books?sort=rating_avg,asc&size=3", headers={"If-None-Match": listing.headers["ETag"]}
+    ).status_code == 200
+    client.post(f"/api/v1/books/{book['id']}/reviews", json={"rating": 2, "content": "별로"}, headers=headers)
+    detail = client.get(f"/api/v1/books/{book['id']}").json()
+    assert (detail["rating_avg"], detail["rating_count"]) == (3.5, 2)
+
+    client.patch(f"/api/v1/reviews/{first['id']}", json={"rating": 3}, headers=headers)
+    detail = client.get(f"/api/v1/books/{book['id']}").json()
+    assert (detail["rating_avg"], detail["rating_count"]) == (2.5, 2)
+
+    client.delete(f"/api/v1/reviews/{first['id']}", headers=headers)
+    detail = client.get(f"/api/v1/books/{book['id']}").json()
+    assert (detail["rating_avg"], detail["rating_count"]) == (2.0, 1)
+
+    # 평점순 정렬 + 커서로 이어 읽어도 정렬이 유지됨
+    page = client.get("/api/v1/books/?sort=rating_avg,desc&size=5&count=none").json()
+    second = client.get(f"/api/v1/books/?sort=rating_avg,desc&size=5&count=none&cursor={page['nextCursor']}").json()
+    ratings = [b["rating_avg"] for b in page["content"] + second["content"]]
+    assert ratings == sorted(ratings, reverse=True)
 
 # 19. 좋아요 토글 (수정됨)
 def test_toggle_favorite():
@@ -258,7 +1245,36 @@ def test_read_my_favorites():
     
     response = client.get("/api/v1/favorites", headers=headers)
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["content"], list)
+
+# 20-1. 좋아요 토글은 DELETE/INSERT 한두 문장, 찜 목록은 조인 한 번 + 최신순 커서
+def test_favorite_toggle_and_wishlist_pages():
+    admin = get_admin_headers()
+    headers = get_auth_headers()
+    books = [create_test_book(admin) for _ in range(3)]
+
+    for book in books:
+        response, statements = count_queries(
+            lambda: client.post(f"/api/v1/books/{book['id']}/favorites", headers=headers)
+        )
+        assert response.json()["liked"] is True
+        # 사용자 조회 + DELETE + INSERT ... SELECT (찜/도서 사전 조회 없음)
+        assert statements <= 3
+    unliked = client.post(f"/api/v1/books/{books[0]['id']}/favorites", headers=headers).json()
+    assert unliked["liked"] is False
+    client.post(f"/api/v1/books/{books[0]['id']}/favorites", headers=headers)
+    assert client.post("/api/v1/books/99999999/favorites", headers=headers).status_code == 404
+
+    # 다시 찜한 books[0]이 가장 최신
+    first = client.get("/api/v1/favorites?size=2", headers=headers).json()
+    assert [b["id"] for b in first["content"]] == [books[0]["id"], books[2]["id"]]
+    second = client.get(f"/api/v1/favorites?size=2&cursor={first['nextCursor']}", headers=headers).json()
+    assert [b["id"] for b in second["content"]] == [books[1]["id"]]
+    assert second["nextCursor"] is None
+
+    # 도서를 찜마다 따로 조회하지 않음 (사용자 조회 + 조인 목록 1)
+    _, statements = count_queries(lambda: client.get("/api/v1/favorites?size=3", headers=headers))
+    assert statements <= 2
 
 # ==========================================
 # 6. 관리자 권한 (Admin) 테스트 (2개)